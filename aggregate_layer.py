@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+
+from data_layer import DAYS_INDO
+from model_layer import CRITERIA, SAWModel, decision_matrix
+from metrics_layer import timed
+
+#==========================================================
+# KUBUS AGREGAT HARI x JAM
+#==========================================================
+N_DAYS, N_HOURS = len(DAYS_INDO), 24
+N_CELLS = N_DAYS * N_HOURS
+# Metrik mentah yang diringkas per sel
+CUBE_METRICS = ['view_count', 'like_count', 'comment_count', 'engagement_rate']
+DESCRIBE_ROWS = ['count', 'mean', 'std', 'min', 'max']
+
+
+class AggregateCube:
+    """
+    Ringkasan dataset video per sel (hari upload x jam upload), dibangun satu kali per dataset.
+    Per sel disimpan: jumlah video, jumlah & jumlah hasil kali tiap pasang metrik, min/max,
+    serta jumlah nilai kriteria SAW. Semua grafik dashboard dibaca dari kubus ini,
+    jadi biaya render tidak bergantung pada jumlah video.
+
+    Skor SAW tidak disimpan per video: V = Σ w_j · X_j / max_j linear, sehingga
+    Σ V per sel = Σ w_j · S_j / max_j (S_j = jumlah kriteria j di sel) -> tepat untuk bobot apa pun.
+
+    Kubus hanya bisa ditambah (min/max tidak bisa dikurangkan); dataset baru (mis. hasil
+    sinkronisasi) dibangun ulang lewat from_frame.
+    """
+    def __init__(self, criteria=CRITERIA, metrics=CUBE_METRICS):
+        self.criteria = list(criteria)
+        self.metrics = list(metrics)
+        k, m = len(self.metrics), len(self.criteria)
+        self.count = np.zeros(N_CELLS, dtype=np.int64)
+        self.sums = np.zeros((N_CELLS, k))
+        self.cross = np.zeros((N_CELLS, k, k))  # Σ x_i * x_j (diagonal = jumlah kuadrat)
+        self.mins = np.full((N_CELLS, k), np.inf)
+        self.maxs = np.full((N_CELLS, k), -np.inf)
+        self.crit_sums = np.zeros((N_CELLS, m))
+        self.crit_max = np.zeros(m)
+
+    @classmethod
+    @timed('cube.build')
+    def from_frame(cls, df, criteria=CRITERIA, metrics=CUBE_METRICS):
+        return cls(criteria, metrics).add(df)
+
+    @staticmethod
+    def cells(df):
+        """Indeks sel (hari * 24 + jam) per baris; -1 jika hari/jam tidak valid"""
+        day = df['day_name']
+        if isinstance(day.dtype, pd.CategoricalDtype) and list(day.cat.categories) == DAYS_INDO:
+            codes = day.cat.codes.to_numpy().astype(np.int64)
+        else:
+            codes = pd.Categorical(day, categories=DAYS_INDO).codes.astype(np.int64)
+        hour = df['hour'].to_numpy(dtype=np.int64)
+        valid = (codes >= 0) & (hour >= 0) & (hour < N_HOURS)
+        return np.where(valid, codes * N_HOURS + hour, -1)
+
+    #==========================================================
+    # TULIS (SATU PASS PER FRAME)
+    #==========================================================
+    def add(self, df):
+        """
+        Tambahkan baris df ke kubus.
+        Returns: self
+        """
+        cells = self.cells(df)
+        valid = cells >= 0
+        cells = cells[valid]
+        X = np.column_stack([df[c].to_numpy(dtype=np.float64) for c in self.metrics])[valid]
+        C = decision_matrix(df, self.criteria)[valid]
+        if not len(cells):
+            return self
+
+        k = len(self.metrics)
+        self.count += np.bincount(cells, minlength=N_CELLS)
+        for i in range(k):
+            self.sums[:, i] += np.bincount(cells, X[:, i], N_CELLS)
+            for j in range(i, k):
+                s = np.bincount(cells, X[:, i] * X[:, j], N_CELLS)
+                self.cross[:, i, j] += s
+                if i != j:
+                    self.cross[:, j, i] += s
+        for j in range(C.shape[1]):
+            self.crit_sums[:, j] += np.bincount(cells, C[:, j], N_CELLS)
+
+        # min/max per sel lewat reduceat atas baris yang diurutkan per sel
+        order = np.argsort(cells, kind='stable')
+        sorted_cells = cells[order]
+        starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+        present = sorted_cells[starts]
+        self.mins[present] = np.minimum(self.mins[present], np.minimum.reduceat(X[order], starts))
+        self.maxs[present] = np.maximum(self.maxs[present], np.maximum.reduceat(X[order], starts))
+        self.crit_max = np.maximum(self.crit_max, C.max(axis=0))
+        return self
+
+    #==========================================================
+    # BACA
+    #==========================================================
+    @property
+    def total(self):
+        return int(self.count.sum())
+
+    def score_sums(self, weights):
+        """Σ preference_score per sel untuk bobot tertentu"""
+        w = SAWModel(weights, self.criteria).weight_vector
+        scale = np.zeros_like(self.crit_max)
+        np.divide(w, self.crit_max, out=scale, where=self.crit_max > 0)
+        return self.crit_sums @ scale
+
+    def _cell_sums(self, metric, weights=None):
+        if metric == 'preference_score':
+            return self.score_sums(weights)
+        return self.sums[:, self.metrics.index(metric)]
+
+    def heatmap(self, metric='view_count', weights=None):
+        """Rata-rata metrik per hari x jam (7 x 24); sel tanpa video bernilai 0"""
+        sums = self._cell_sums(metric, weights).reshape(N_DAYS, N_HOURS)
+        counts = self.count.reshape(N_DAYS, N_HOURS)
+        means = np.zeros(sums.shape)
+        np.divide(sums, counts, out=means, where=counts > 0)
+        return pd.DataFrame(means, index=pd.Index(DAYS_INDO, name='day_name'),
+                            columns=pd.Index(range(N_HOURS), name='hour'))
+
+    def day_means(self, metric='view_count', weights=None):
+        """Rata-rata metrik per hari upload (NaN untuk hari tanpa video)"""
+        sums = self._cell_sums(metric, weights).reshape(N_DAYS, N_HOURS).sum(axis=1)
+        counts = self.count.reshape(N_DAYS, N_HOURS).sum(axis=1)
+        means = np.full(N_DAYS, np.nan)
+        np.divide(sums, counts, out=means, where=counts > 0)
+        return pd.Series(means, index=pd.Index(DAYS_INDO, name='day_name'), name=metric)
+
+    def cell_frame(self, weights=None):
+        """Satu baris per sel berisi video: day_name, hour, count, rata-rata metrik (+ skor)"""
+        present = np.flatnonzero(self.count)
+        counts = self.count[present]
+        frame = pd.DataFrame({
+            'day_name': pd.Categorical.from_codes(present // N_HOURS, categories=DAYS_INDO, ordered=True),
+            'hour': present % N_HOURS,
+            'count': counts,
+        })
+        for i, metric in enumerate(self.metrics):
+            frame[metric] = self.sums[present, i] / counts
+        if weights is not None:
+            frame['preference_score'] = self.score_sums(weights)[present] / counts
+        return frame
+
+    def corr(self, x='view_count', y='engagement_rate'):
+        """Korelasi Pearson dua metrik atas seluruh video (NaN jika varians 0)"""
+        i, j = self.metrics.index(x), self.metrics.index(y)
+        n = self.total
+        if n < 2:
+            return np.nan
+        sx, sy = self.sums[:, i].sum(), self.sums[:, j].sum()
+        cross = self.cross.sum(axis=0)
+        cov = cross[i, j] - sx * sy / n
+        var_x = cross[i, i] - sx * sx / n
+        var_y = cross[j, j] - sy * sy / n
+        if var_x <= 0 or var_y <= 0:
+            return np.nan
+        return float(np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0))
+
+    def describe(self, metrics=None):
+        """count, mean, std (ddof=1), min, max per metrik (tanpa kuartil: butuh data per video)"""
+        metrics = self.metrics if metrics is None else list(metrics)
+        idx = [self.metrics.index(m) for m in metrics]
+        n = self.total
+        sums = self.sums[:, idx].sum(axis=0)
+        sq = np.diagonal(self.cross.sum(axis=0))[idx]
+        mean = sums / n if n else np.full(len(idx), np.nan)
+        var = np.maximum(sq - sums * mean, 0) / (n - 1) if n > 1 else np.full(len(idx), np.nan)
+        mins = self.mins[:, idx].min(axis=0) if n else np.full(len(idx), np.nan)
+        maxs = self.maxs[:, idx].max(axis=0) if n else np.full(len(idx), np.nan)
+        return pd.DataFrame([np.full(len(idx), n, dtype=np.float64), mean, np.sqrt(var), mins, maxs],
+                            index=DESCRIBE_ROWS, columns=metrics)
@@ -1,6 +1,10 @@
 import streamlit as st
 from data_layer import DataManager
-from model_layer import SAWModel
+from sync_layer import ChannelStore
+from model_layer import ScoringSession, PooledSession, CRITERIA, GROWTH_CRITERION, engagement_rate
+from snapshot_layer import SnapshotStore
+from keyword_layer import KeywordIndex
+from aggregate_layer import AggregateCube
 from ui_layer import UserInterface
 
 #===============================================
@@ -13,13 +17,21 @@ def main():
     # INISIALISASI KOMPONEN
     #===============================================
     ui = UserInterface()
-    
+    try:
+        run(ui)
+    finally:
+        # Dirender paling akhir agar mencakup semua tahap pada run ini
+        ui.render_performance()
+
+def run(ui):
     st.title("🎥 SPK Evaluasi Performa Konten YouTube (Metode SAW)")
     st.markdown("Sistem Pendukung Keputusan berbasis Web untuk Konten Kreator")
     
     # Inisialisasi Data Manager di Session State
     if 'dm' not in st.session_state:
-        st.session_state['dm'] = DataManager(None)
+        # Dataset per channel disimpan -> analisis ulang hanya mengambil upload baru
+        # Snapshot statistik per fetch -> kriteria pertumbuhan (views/hari) tanpa request tambahan
+        st.session_state['dm'] = DataManager(None, store=ChannelStore(), snapshots=SnapshotStore())
     
     dm = st.session_state['dm']
     
@@ -27,6 +39,7 @@ def main():
     # RENDER SIDEBAR
     #===============================================
     api_key, channel_id, competitors, weights = ui.render_sidebar(dm)
+    max_videos = st.session_state.get('max_videos', 50)
     
     #===============================================
     # EKSEKUSI UTAMA (SAAT TOMBOL DIKLIK)
@@ -40,68 +53,112 @@ def main():
             st.error("⚠️ Mohon Cari dan Pilih Channel Utama terlebih dahulu.")
             return
 
-        # 2. AMBIL DATA CHANNEL UTAMA
-        with st.spinner("Mengambil data Channel Utama..."):
-            main_info = dm.get_channel_info(channel_id)
-            if not main_info:
-                st.error("Gagal mengambil data channel utama. Periksa API Key atau Koneksi.")
-                return 
-                
-            uploads_id = main_info['contentDetails']['relatedPlaylists']['uploads']
-            df_videos = dm.fetch_videos(uploads_id)
+        # 2. AMBIL DATA CHANNEL UTAMA + KOMPETITOR (PARALEL)
+        comp_ids = [c for c in competitors if c]
+
+        # Pastikan rencana analisis muat di sisa kuota harian
+        plan_counts = st.session_state.get('plan_video_counts', [])
+        if plan_counts:
+            fitted = dm.quota.fit_max_videos(plan_counts, max_videos)
+            if fitted == 0:
+                st.error(f"⚠️ Sisa kuota hari ini ({dm.quota.remaining:,} unit) tidak cukup untuk menganalisis "
+                         f"{len(plan_counts)} channel. Kurangi kompetitor atau coba lagi setelah kuota reset.")
+                return
+            if fitted != max_videos:
+                st.warning(f"⚠️ Sisa kuota tidak cukup, analisis dibatasi {fitted} video terbaru per channel.")
+                max_videos = fitted
+        with st.spinner(f"Mengambil data {1 + len(comp_ids)} channel secara paralel..."):
+            fetched = dm.fetch_channels([channel_id] + comp_ids, limit=max_videos)
+
+        if not fetched[0]:
+            st.error("Gagal mengambil data channel utama. Periksa API Key atau Koneksi.")
+            return 
+        main_info, df_videos = fetched[0]
 
         if df_videos.empty:
             st.warning("Tidak ada video publik ditemukan pada channel ini.")
             return
 
-        # 3. AMBIL DATA KOMPETITOR
+        # 3. DATA KOMPETITOR (urutan sama dengan input sidebar)
         comp_data_list = []
-        if any(competitors):
-            with st.status("Sedang menganalisis kompetitor...", expanded=True):
-                for i, comp_id in enumerate(competitors):
-                    if comp_id: 
-                        st.write(f"Mengambil data Kompetitor {i+1}...")
-                        c_info = dm.get_channel_info(comp_id)
-                        if c_info:
-                            c_up_id = c_info['contentDetails']['relatedPlaylists']['uploads']
-                            c_df = dm.fetch_videos(c_up_id)
-                            if not c_df.empty:
-                                # Hitung ER manual untuk kompetitor
-                                c_df['engagement_rate'] = ((c_df['like_count'] + c_df['comment_count']) / c_df['view_count'] * 100).fillna(0)
-                                comp_data_list.append((c_info, c_df))
-                        else:
-                            st.warning(f"Gagal mengambil data kompetitor ID: {comp_id}")
+        for comp_id, result in zip(comp_ids, fetched[1:]):
+            if not result:
+                st.warning(f"Gagal mengambil data kompetitor ID: {comp_id}")
+                continue
+            c_info, c_df = result
+            if not c_df.empty:
+                # ER & pertumbuhan dengan rumus yang sama seperti channel utama
+                c_df['engagement_rate'] = engagement_rate(c_df['view_count'], c_df['like_count'], c_df['comment_count'])
+                c_df['views_per_day'] = dm.snapshots.views_per_day(comp_id, c_df, window_days=7)
+                comp_data_list.append((c_info, c_df))
+
+        # 4. KRITERIA PERTUMBUHAN dari snapshot 7 hari terakhir (0 jika riwayat belum cukup)
+        df_videos['views_per_day'] = dm.snapshots.views_per_day(channel_id, df_videos, window_days=7)
+
+        # 5. PROSES SAW (ER + NORMALISASI SEKALI PER DATASET)
+        # Sesi disimpan agar perubahan bobot tidak memicu fetch/normalisasi ulang
+        session = ScoringSession(df_videos, CRITERIA + [GROWTH_CRITERION])
+        st.session_state['analysis'] = {
+            'main_info': main_info,
+            'session': session,
+            'keywords': KeywordIndex.from_frame(df_videos),
+            # Agregat hari x jam untuk dashboard (skor dihitung dari cube untuk bobot apa pun)
+            'cube': AggregateCube.from_frame(session.df, session.criteria),
+            # SAW gabungan semua channel dalam satu matriks keputusan (hanya jika ada kompetitor)
+            'pooled': PooledSession(
+                [(channel_id, session.df)] + [(c_info['id'], c_df) for c_info, c_df in comp_data_list],
+                session.criteria,
+                labels={info['id']: info['snippet']['title'] for info in [main_info] + [c for c, _ in comp_data_list]},
+            ) if comp_data_list else None,
+            'comp_data_list': comp_data_list,
+            # Kategori ikut dibekukan saat analisis; pilihan sidebar bisa berubah tanpa klik Analisis
+            'main_category': dm.categorize_channel(main_info),
+            'competitor_categories': list(st.session_state.get('competitor_categories', [])),
+        }
 
-        # 4. PROSES SAW (HITUNG SKOR)
-        # Menghitung ER untuk Channel Utama
-        model = SAWModel(weights)
-        df_processed = model.calculate_engagement_rate(df_videos)
-        
-        # Normalisasi & Preferensi
-        df_normalized = model.normalize_data(df_processed)
-        df_final = model.calculate_preference(df_normalized)
-        df_final['Rank'] = df_final.index + 1
+    #===============================================
+    # RENDER HASIL (JUGA SAAT HANYA BOBOT YANG BERUBAH)
+    #===============================================
+    analysis = st.session_state.get('analysis')
+    if not analysis:
+        return
+    main_info = analysis['main_info']
+    session = analysis['session']
+    comp_data_list = analysis['comp_data_list']
+
+    # 6. PREFERENSI & RANKING (hanya V = R . w)
+    df_final = session.rank(weights)
 
-        # 5. RENDER OUTPUT (TAMPILKAN HASIL)
-        # A. Overview Statistik
-        ui.render_overview(main_info, df_final)
-        
-        # B. Analisis Strategi & Positioning (Fitur Baru)
-        if 'main_category' in st.session_state:
-            comp_cats = st.session_state.get('competitor_categories', [])
-            # Selalu tampilkan analisis meskipun tidak ada kompetitor (untuk melihat benchmark diri sendiri)
-            ui.render_category_comparison(
-                st.session_state['main_category'], 
-                comp_cats
-            )
-        
-        # C. Grafik Perbandingan (Jika ada kompetitor)
-        if comp_data_list:
-            ui.render_comparison(main_info, df_processed, comp_data_list)
-        
-        # D. Tabel Peringkat & Analisis Detail
-        ui.render_ranking_table(df_final)
-        ui.render_analytics(df_final)
+    # 7. RENDER OUTPUT (TAMPILKAN HASIL)
+    # A. Overview Statistik
+    ui.render_overview(main_info, session.df)
+    
+    # B. Analisis Strategi & Positioning (Fitur Baru)
+    if analysis.get('main_category') is not None:
+        # Selalu tampilkan analisis meskipun tidak ada kompetitor (untuk melihat benchmark diri sendiri)
+        ui.render_category_comparison(
+            analysis['main_category'],
+            analysis['competitor_categories']
+        )
+    
+    # C. Grafik Perbandingan (Jika ada kompetitor)
+    if comp_data_list:
+        ui.render_comparison(main_info, session.df, comp_data_list)
+        # Ranking gabungan lintas channel (analisis lama di session_state bisa belum punya 'pooled')
+        if analysis.get('pooled') is not None:
+            ui.render_pooled_ranking(analysis['pooled'], weights)
+    
+    # D. Tabel Peringkat & Analisis Detail
+    ui.render_ranking_table(df_final, export_key=session.cache_key(weights))
+    keyword_values = {
+        'view_count': session.df['view_count'],
+        'engagement_rate': session.df['engagement_rate'],
+        'preference_score': session.scores(weights),
+    }
+    ui.render_analytics(df_final, top_df=session.top(weights, 5),
+                        keyword_index=analysis['keywords'], keyword_values=keyword_values,
+                        cube=analysis['cube'], weights=weights)
+    ui.render_sensitivity(session, weights)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,278 @@
+"""
+Mode batch tanpa UI: skoring SAW untuk ratusan channel (mis. dijadwalkan tiap malam).
+
+Input:
+    --channels  file teks berisi channel ID (satu per baris, '#' = komentar)
+    --weights   file JSON bobot, mis. {"views": 0.3, "likes": 0.25, "comments": 0.2, "er": 0.25}
+                (opsional "growth": laju views/hari dari snapshot sebelumnya)
+
+Fetch berjalan paralel terbatas (thread, --workers), skoring di process pool (--processes).
+Hasil per channel disimpan sebagai checkpoint di --checkpoint-dir; menjalankan ulang
+perintah yang sama melanjutkan dari channel yang belum selesai (mis. setelah crash
+atau kuota harian habis).
+
+Contoh:
+    python batch_score.py --channels channels.txt --weights weights.json --output hasil.parquet
+    YT_API_BASE_URL=http://127.0.0.1:8765/ python batch_score.py --api-key stub ... --output hasil.csv.gz
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from data_layer import DataManager
+from export_layer import write_export
+from metrics_layer import METRICS
+from model_layer import CRITERIA, GROWTH_CRITERION, WEIGHT_KEYS, ScoringSession
+from quota_layer import DAILY_LIMIT, QuotaManager
+from snapshot_layer import SnapshotStore
+from sync_layer import ChannelStore
+
+OUTPUT_COLS = ['channel_id', 'channel_title', 'niche', 'Rank', 'video_id', 'title', 'published_at',
+               'view_count', 'like_count', 'comment_count', 'engagement_rate', 'preference_score']
+# Exit code jika batch berhenti karena kuota habis (jalankan ulang setelah reset kuota)
+EXIT_QUOTA = 2
+
+
+#==========================================================
+# INPUT
+#==========================================================
+def read_channel_ids(path):
+    with open(path) as f:
+        ids = [line.split('#', 1)[0].strip() for line in f]
+    return list(dict.fromkeys(cid for cid in ids if cid))
+
+
+def read_weights(path):
+    with open(path) as f:
+        weights = {k: float(v) for k, v in json.load(f).items()}
+    missing = [k for k in WEIGHT_KEYS if k not in weights]
+    if missing:
+        raise ValueError(f"Bobot tidak lengkap, kurang: {', '.join(missing)}")
+    if round(sum(weights.values()), 2) != 1.0:
+        raise ValueError("Total bobot harus 1.0")
+    return weights
+
+
+#==========================================================
+# CHECKPOINT
+#==========================================================
+class Checkpoint:
+    """
+    Folder checkpoint: satu file Parquet per channel selesai + manifest run.
+    File ditulis atomik (tmp + rename), jadi file yang ada = channel selesai.
+    """
+    def __init__(self, directory, manifest):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, 'manifest.json')
+        if os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            # Hasil dengan bobot/cakupan berbeda tidak boleh tercampur
+            if saved != manifest:
+                raise SystemExit(f"Checkpoint {directory} dibuat dengan pengaturan berbeda: {saved}")
+        else:
+            with open(path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+    def _path(self, channel_id):
+        return os.path.join(self.directory, f"{channel_id}.parquet")
+
+    def done(self):
+        return {name[:-len('.parquet')] for name in os.listdir(self.directory) if name.endswith('.parquet')}
+
+    def save(self, channel_id, df):
+        path = self._path(channel_id)
+        df.to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+
+    def record_failure(self, channel_id, reason):
+        with open(os.path.join(self.directory, 'failed.jsonl'), 'a') as f:
+            f.write(json.dumps({'channel_id': channel_id, 'reason': reason, 'time': time.time()}) + '\n')
+
+    def merge(self, channel_ids):
+        """Gabungkan checkpoint sesuai urutan input"""
+        frames = [pd.read_parquet(self._path(cid)) for cid in channel_ids if os.path.exists(self._path(cid))]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=OUTPUT_COLS)
+
+
+#==========================================================
+# SKORING (DIJALANKAN DI PROCESS POOL)
+#==========================================================
+def score_channel(channel_id, channel_title, niche, df, weights):
+    """SAW per channel; fungsi top-level agar bisa di-pickle ke proses worker"""
+    criteria = CRITERIA + [GROWTH_CRITERION] if 'views_per_day' in df.columns else CRITERIA
+    ranked = ScoringSession(df, criteria).rank(weights)
+    ranked.insert(0, 'niche', niche)
+    ranked.insert(0, 'channel_title', channel_title)
+    ranked.insert(0, 'channel_id', channel_id)
+    cols = OUTPUT_COLS + (['views_per_day'] if 'views_per_day' in ranked.columns else [])
+    return ranked[cols]
+
+
+def write_output(df, path):
+    """Format mengikuti ekstensi: .parquet, .csv.gz (ditulis per potongan), .xlsx, atau CSV"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    write_export(df, path)
+
+
+#==========================================================
+# RUNNER
+#==========================================================
+def batch_timeout(video_counts, limit, workers, request_timeout):
+    """
+    Batas waktu fetch satu batch (detik): jumlah request terburuk per worker x request_timeout.
+    Satu channel tidak dibagi antar worker -> minimal sebanyak request channel terbesar.
+    """
+    requests = [QuotaManager.estimate_plan([n], limit)['total'] for n in video_counts] or [1]
+    return max(math.ceil(sum(requests) / workers), max(requests)) * request_timeout
+
+
+def run(dm, channel_ids, weights, checkpoint, limit=50, batch_size=20, processes=None, log=print):
+    """
+    Proses channel yang belum ada di checkpoint, batch demi batch.
+    Returns: (jumlah channel selesai di run ini, berhenti_karena_kuota)
+    """
+    use_growth = weights.get('growth', 0) > 0 and dm.snapshots is not None
+    done = checkpoint.done()
+    pending = [cid for cid in channel_ids if cid not in done]
+    log(f"{len(channel_ids)} channel, {len(done & set(channel_ids))} sudah selesai, {len(pending)} diproses")
+
+    completed = 0
+    quota_stop = False
+    pool = ProcessPoolExecutor(max_workers=processes) if processes != 0 else None
+    futures = []
+
+    def collect(block):
+        nonlocal completed
+        while futures and (block or futures[0][1].done()):
+            channel_id, future = futures.pop(0)
+            try:
+                checkpoint.save(channel_id, future.result())
+                completed += 1
+            except Exception as e:
+                METRICS.record_error('batch.score', e)
+                checkpoint.record_failure(channel_id, f"skoring gagal: {e}")
+
+    try:
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+
+            # Pre-flight kuota: berhenti rapi sebelum batch yang tidak muat
+            infos = dm.get_channels_info(batch)
+            counts = [int(infos[cid]['statistics'].get('videoCount', 0)) for cid in batch if cid in infos]
+            plan = dm.quota.estimate_plan(counts, limit)
+            if plan['total'] > dm.quota.remaining:
+                log(f"Kuota tidak cukup untuk batch berikutnya ({plan['total']} > {dm.quota.remaining} unit). "
+                    "Jalankan ulang perintah yang sama setelah kuota reset.")
+                quota_stop = True
+                break
+
+            # strict: channel yang terpotong error (kuota/HTTP) tidak di-checkpoint sebagai selesai,
+            # jadi dilanjutkan saat run berikutnya
+            timeout = batch_timeout(counts, limit, dm.max_workers, dm.request_timeout)
+            fetched = dm.fetch_channels(batch, limit=limit, timeout=timeout, strict=True)
+            for channel_id, result in zip(batch, fetched):
+                if not result or result[1].empty:
+                    checkpoint.record_failure(channel_id, "tidak ada data lengkap (ID salah, fetch terpotong, "
+                                                          "timeout, atau tanpa video)")
+                    continue
+                info, df = result
+                if use_growth:
+                    df['views_per_day'] = dm.snapshots.views_per_day(channel_id, df)
+                args = (channel_id, info['snippet']['title'], info.get('niche_detected', 'Umum'), df, weights)
+                future = pool.submit(score_channel, *args) if pool is not None else _Immediate(score_channel, *args)
+                futures.append((channel_id, future))
+
+            # Skoring batch ini berjalan di pool sementara batch berikutnya di-fetch
+            collect(block=False)
+            log(f"[{min(start + batch_size, len(pending))}/{len(pending)}] selesai: {completed}, "
+                f"kuota terpakai hari ini: {dm.quota.used_today}")
+        collect(block=True)
+    finally:
+        # Hasil yang sudah jadi tetap disimpan walau run dihentikan (Ctrl+C / error)
+        collect(block=False)
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    return completed, quota_stop
+
+
+class _Immediate:
+    """Pengganti Future untuk --processes 0 (skoring langsung di proses utama)"""
+    def __init__(self, fn, *args):
+        try:
+            self._result, self._error = fn(*args), None
+        except Exception as e:
+            self._result, self._error = None, e
+
+    def done(self):
+        return True
+
+    def result(self):
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--channels', required=True, help="file daftar channel ID")
+    parser.add_argument('--weights', required=True, help="file JSON bobot SAW")
+    parser.add_argument('--output', required=True, help="file hasil (.parquet, .csv, .csv.gz)")
+    parser.add_argument('--api-key', default=os.environ.get('YT_API_KEY'), help="default: env YT_API_KEY")
+    parser.add_argument('--base-url', default=os.environ.get('YT_API_BASE_URL'),
+                        help="endpoint API alternatif (mis. youtube_stub); default: env YT_API_BASE_URL")
+    parser.add_argument('--limit', type=int, default=50, help="maks. video per channel (0 = semua)")
+    parser.add_argument('--workers', type=int, default=4, help="fetch paralel (thread)")
+    parser.add_argument('--processes', type=int, default=None,
+                        help="proses skoring (default: jumlah CPU, 0 = tanpa process pool)")
+    parser.add_argument('--rate', type=float, default=10, help="maks. request API per detik (0 = tanpa batas)")
+    parser.add_argument('--daily-budget', type=int, default=DAILY_LIMIT, help="anggaran kuota harian (unit)")
+    parser.add_argument('--batch-size', type=int, default=20, help="channel per batch fetch")
+    parser.add_argument('--checkpoint-dir', help="default: .cache/batch/<hash input>")
+    parser.add_argument('--metrics', help="simpan metrik (JSON) ke file ini")
+    args = parser.parse_args()
+
+    if not args.api_key:
+        parser.error("API key wajib (--api-key atau env YT_API_KEY)")
+    channel_ids = read_channel_ids(args.channels)
+    weights = read_weights(args.weights)
+    limit = args.limit or None
+
+    # Endpoint ikut manifest: checkpoint dari stub tidak boleh dilanjutkan dengan API asli (dan sebaliknya)
+    manifest = {'channels_file': os.path.abspath(args.channels), 'weights': weights, 'limit': limit,
+                'base_url': args.base_url}
+    run_id = hashlib.sha256(json.dumps(manifest, sort_keys=True).encode()).hexdigest()[:12]
+    checkpoint = Checkpoint(args.checkpoint_dir or os.path.join('.cache', 'batch', run_id), manifest)
+
+    quota = QuotaManager(args.api_key, daily_budget=args.daily_budget, rate_per_sec=args.rate or None)
+    dm = DataManager(args.api_key, quota=quota, max_workers=args.workers, base_url=args.base_url,
+                     store=ChannelStore(), snapshots=SnapshotStore())
+    if dm.youtube is None:
+        sys.exit("Gagal membuat klien YouTube API")
+
+    start = time.perf_counter()
+    completed, quota_stop = run(dm, channel_ids, weights, checkpoint, limit=limit,
+                                batch_size=args.batch_size, processes=args.processes)
+    print(f"{completed} channel diproses dalam {time.perf_counter() - start:.1f} s")
+
+    result = checkpoint.merge(channel_ids)
+    write_output(result, args.output)
+    print(f"{result['channel_id'].nunique() if len(result) else 0}/{len(channel_ids)} channel -> {args.output}")
+
+    if args.metrics:
+        with open(args.metrics, 'w') as f:
+            f.write(METRICS.to_json())
+    if quota_stop:
+        sys.exit(EXIT_QUOTA)
+
+
+if __name__ == '__main__':
+    main()
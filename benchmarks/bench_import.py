@@ -0,0 +1,88 @@
+"""
+Benchmark waktu import saat cold start (proses Python baru per percobaan).
+
+Mengukur waktu `import <modul>` untuk modul aplikasi dan memeriksa:
+    1. waktu import (median dari --repeat percobaan) tidak melebihi --budget detik
+    2. dependensi berat yang seharusnya lazy (plotly.express, googleapiclient.discovery,
+       requests, xlsxwriter, openpyxl, wordcloud, matplotlib) belum ter-load
+
+Keluar dengan kode 1 jika salah satu pemeriksaan gagal, sehingga bisa dipakai di CI:
+    python benchmarks/bench_import.py --budget 1.5
+    python benchmarks/bench_import.py --modules app5 --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modul yang hanya boleh di-load saat fiturnya dipakai
+LAZY_MODULES = ['plotly.express', 'googleapiclient.discovery', 'requests', 'xlsxwriter', 'openpyxl',
+                'wordcloud', 'matplotlib']
+
+PROBE = r"""
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'loaded': [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, repeat):
+    """Import di proses baru (tanpa cache modul); returns (list detik, modul lazy yang ter-load)"""
+    times, loaded = [], set()
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', PROBE.format(module=module, lazy=LAZY_MODULES)],
+                             cwd=ROOT, capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(result['seconds'])
+        loaded.update(result['loaded'])
+    return times, sorted(loaded)
+
+
+def heaviest_imports(module, top):
+    """Modul dengan waktu import kumulatif terbesar (python -X importtime)"""
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        # Indentasi nama = kedalaman import; ambil modul target & import langsungnya saja
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:
+            rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modules', nargs='+', default=['app5', 'data_layer', 'model_layer', 'ui_layer'])
+    parser.add_argument('--budget', type=float, default=1.5, help="batas waktu import per modul (detik)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=0, help="tampilkan N import terberat (python -X importtime)")
+    args = parser.parse_args()
+
+    failures = 0
+    for module in args.modules:
+        times, loaded = measure(module, args.repeat)
+        median = statistics.median(times)
+        over = median > args.budget
+        failures += over + bool(loaded)
+        status = 'MELEBIHI BUDGET' if over else 'ok'
+        print(f"{module:<14} median {median:.3f} s (min {min(times):.3f}, budget {args.budget:.2f}) {status}")
+        if loaded:
+            print(f"{'':<14} modul lazy ter-load saat import: {', '.join(loaded)}")
+        if args.top:
+            for cumulative_us, name in heaviest_imports(module, args.top):
+                print(f"{'':<14} {cumulative_us / 1e6:>7.3f} s  {name}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark klasifikasi niche: implementasi lama (banyak pass `any(x in text)`)
+vs NicheClassifier (aturan disiapkan sekali, cek substring `in` berhenti di grup pertama
+yang cocok, label URL topicCategories di-cache).
+
+Jalankan dari root repo:
+    python benchmarks/bench_niche.py --channels 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from niche_layer import NICHE_CLASSIFIER  # noqa: E402
+
+WORDS = ['official', 'channel', 'game', 'gameplay', 'tech', 'review', 'gadget', 'music', 'cover', 'song',
+         'vlog', 'daily', 'travel', 'resep', 'masak', 'kuliner', 'food', 'japan', 'anime', 'j-pop', 'kpop',
+         'korea', 'drakor', 'indonesia', 'jakarta', 'window', 'esport', 'subscribe', 'terbaru', 'lucu', 'keluarga']
+TOPICS = ['https://en.wikipedia.org/wiki/Video_game_culture', 'https://en.wikipedia.org/wiki/Technology',
+          'https://en.wikipedia.org/wiki/Lifestyle_(sociology)', 'https://en.wikipedia.org/wiki/Entertainment',
+          'https://en.wikipedia.org/wiki/Pop_music', 'https://en.wikipedia.org/wiki/Sport',
+          'https://en.wikipedia.org/wiki/Food', 'https://en.wikipedia.org/wiki/Knowledge']
+
+
+def make_channels(n, seed=0):
+    rnd = random.Random(seed)
+    items = []
+    for _ in range(n):
+        items.append({
+            'snippet': {
+                'title': ' '.join(rnd.choices(WORDS, k=rnd.randint(1, 4))).title(),
+                'description': ' '.join(rnd.choices(WORDS, k=rnd.randint(0, 60))),
+            },
+            'topicDetails': {'topicCategories': rnd.sample(TOPICS, rnd.randint(0, 2))},
+        })
+    return items
+
+
+#==========================================================
+# IMPLEMENTASI LAMA (referensi pembanding)
+#==========================================================
+def legacy_detect_niche(channel_item):
+    topics = channel_item.get('topicDetails', {}).get('topicCategories', [])
+    text = (channel_item['snippet']['title'] + " " + channel_item['snippet']['description']).lower()
+    base_niche = "Umum"
+    geo_tag = ""
+    if any(x in text for x in ['j-pop', 'jpop', 'japanese', 'japan', 'anime']): geo_tag = "(Jepang)"
+    elif any(x in text for x in ['k-pop', 'kpop', 'korea', 'drakor']): geo_tag = "(Korea)"
+    elif any(x in text for x in ['indonesia', 'indo', 'jakarta']): geo_tag = "(Indonesia)"
+    niche_map = {
+        'Technology': 'Teknologi', 'Gaming': 'Gaming',
+        'Lifestyle': 'Vlog & Lifestyle', 'Entertainment': 'Hiburan',
+        'Music': 'Musik', 'Sport': 'Olahraga', 'Food': 'Kuliner'
+    }
+    found = False
+    for url in topics:
+        for key, label in niche_map.items():
+            if key in url:
+                base_niche = label; found = True; break
+        if found: break
+    if not found:
+        if any(x in text for x in ['game', 'play', 'esport']): base_niche = "Gaming"
+        elif any(x in text for x in ['gadget', 'review', 'tech']): base_niche = "Teknologi"
+        elif any(x in text for x in ['song', 'music', 'cover']): base_niche = "Musik"
+        elif any(x in text for x in ['vlog', 'daily', 'travel']): base_niche = "Vlog & Lifestyle"
+        elif any(x in text for x in ['resep', 'masak', 'kuliner', 'food']): base_niche = "Kuliner"
+    return f"{base_niche} {geo_tag}".strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--channels', type=int, default=20_000)
+    args = parser.parse_args()
+
+    items = make_channels(args.channels)
+
+    start = time.perf_counter()
+    old = [legacy_detect_niche(item) for item in items]
+    t_old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = NICHE_CLASSIFIER.classify_many(items)
+    t_new = time.perf_counter() - start
+
+    mismatch = sum(a != b for a, b in zip(old, new))
+    print(f"channels      : {len(items):,}")
+    print(f"legacy        : {t_old:.3f}s ({len(items) / t_old:,.0f} channel/s)")
+    print(f"compiled      : {t_new:.3f}s ({len(items) / t_new:,.0f} channel/s)")
+    print(f"speedup       : {t_old / t_new:.1f}x")
+    print(f"label berbeda : {mismatch}")
+    if mismatch:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+Benchmark end-to-end pipeline fetch -> skor -> render (tanpa jaringan & tanpa Streamlit).
+
+Tahap yang diukur (waktu + puncak memori per tahap):
+    fetch_frame  : DataManager._build_video_frame dari respons videos().list sintetis (per 50 item)
+    er           : engagement_rate (vektor, sekali per dataset)
+    normalize    : normalize_matrix(decision_matrix(...)) -> matriks R (sekali per dataset)
+    preference   : ScoringSession.rank (V = R . w + urutan ranking, tiap perubahan bobot;
+                   sesi disiapkan di luar pengukuran)
+    keywords     : KeywordIndex + statistik Power Keywords
+    cube         : AggregateCube.from_frame (sekali per dataset)
+    heatmap      : heatmap hari x jam dari kubus (views + skor SAW, tab Peta Strategi)
+    excel_export : file Excel via ExportCache.read (write_xlsx, cache kosong) seperti tombol download
+
+Hasil ditulis ke JSON agar bisa dibandingkan antar commit:
+    python benchmarks/bench_pipeline.py --sizes 50 1000 100000
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/pipeline-<commit>.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from cache_layer import MemoryCache  # noqa: E402
+from aggregate_layer import AggregateCube  # noqa: E402
+from data_layer import COUNT_DTYPES, DAY_DTYPE, DataManager  # noqa: E402
+from export_layer import ExportCache  # noqa: E402
+from keyword_layer import KeywordIndex  # noqa: E402
+from model_layer import CRITERIA, ScoringSession, decision_matrix, engagement_rate, normalize_matrix  # noqa: E402
+from quota_layer import QuotaManager  # noqa: E402
+from youtube_stub import SyntheticCatalog, TITLE_WORDS  # noqa: E402
+
+WEIGHTS = {'views': 0.30, 'likes': 0.25, 'comments': 0.20, 'er': 0.25}
+
+
+#==========================================================
+# DATASET SINTETIS
+#==========================================================
+def make_raw_pages(n, seed=0):
+    """Respons videos().list sintetis, dipotong per 50 item seperti iter_videos"""
+    catalog = SyntheticCatalog(n_channels=1, videos_per_channel=n, seed=seed)
+    items = [catalog.video_item(0, j) for j in range(n)]
+    return [items[i:i + 50] for i in range(0, n, 50)]
+
+
+def make_videos(n, seed=0):
+    """DataFrame hasil fetch_videos (dtype sama), dibangkitkan langsung (vektor) untuk ukuran besar"""
+    rng = np.random.default_rng(seed)
+    views = rng.lognormal(9, 2, n).astype(np.int64)
+    published = (pd.Timestamp('2026-01-01', tz='UTC') - pd.to_timedelta(rng.integers(0, 5 * 365 * 24, n), unit='h'))
+    published = published.tz_convert('Asia/Jakarta')
+    words = np.array(TITLE_WORDS, dtype=object)
+    title_words = words[rng.integers(0, len(words), (n, 6))]
+    titles = [' '.join(row) for row in title_words]
+    return pd.DataFrame({
+        'video_id': pd.array([f"v{i:010d}" for i in range(n)], dtype='string[pyarrow]'),
+        'title': titles,
+        'published_at': published,
+        'view_count': views.astype(COUNT_DTYPES['view_count']),
+        'like_count': (views * rng.uniform(0, 0.08, n)).astype(COUNT_DTYPES['like_count']),
+        'comment_count': (views * rng.uniform(0, 0.01, n)).astype(COUNT_DTYPES['comment_count']),
+        'duration': 'PT10M',
+        'day_name': pd.Categorical.from_codes(published.dayofweek, dtype=DAY_DTYPE),
+        'hour': published.hour.to_numpy().astype(np.int8),
+    })
+
+
+#==========================================================
+# TAHAP PIPELINE
+#==========================================================
+def stage_fetch_frame(ctx):
+    # Ledger kuota di direktori sementara: benchmark tidak menyentuh .cache/quota.sqlite
+    # (QuotaLedger membuka koneksi baru per panggilan, jadi ':memory:' tidak menyimpan tabelnya)
+    with tempfile.TemporaryDirectory() as root:
+        dm = DataManager(None, cache=MemoryCache(), quota=QuotaManager(None, path=os.path.join(root, 'quota.sqlite')))
+        frames = [dm._build_video_frame(page) for page in ctx['raw_pages']]
+    return pd.concat(frames, ignore_index=True)
+
+
+def stage_er(ctx):
+    df = ctx['df']
+    return df.assign(engagement_rate=engagement_rate(df['view_count'], df['like_count'], df['comment_count']))
+
+
+def stage_normalize(ctx):
+    return normalize_matrix(decision_matrix(ctx['df_er'], CRITERIA))
+
+
+def setup_preference(ctx):
+    # ER + normalisasi sudah diukur di tahapnya sendiri; sesi hanya wadah untuk rank()
+    ctx['session'] = ScoringSession(ctx['df'], CRITERIA)
+
+
+def stage_preference(ctx):
+    # Bobot sedikit berbeda tiap panggilan (seperti slider digeser) agar hasil rank terakhir tidak dipakai ulang
+    ctx['weight_step'] = ctx.get('weight_step', 0) + 1
+    weights = dict(WEIGHTS, views=WEIGHTS['views'] + ctx['weight_step'] * 1e-6)
+    return ctx['session'].rank(weights)
+
+
+def stage_keywords(ctx):
+    df = ctx['df_final']
+    index = KeywordIndex.from_frame(df)
+    stats = index.stats({
+        'Avg Views': df['view_count'], 'Avg ER (%)': df['engagement_rate'], 'Avg Skor': df['preference_score'],
+    }, min_freq=2)
+    return stats.nlargest(10, 'Avg Views')
+
+
+def stage_cube(ctx):
+    return AggregateCube.from_frame(ctx['df_final'], CRITERIA)
+
+
+def stage_heatmap(ctx):
+    cube = ctx['cube']
+    return cube.heatmap('view_count'), cube.heatmap('preference_score', WEIGHTS)
+
+
+def stage_excel_export(ctx):
+    # Direktori baru per run -> selalu cache miss (mengukur pembuatan file, bukan cache hit)
+    df = ctx['df_final']
+    with tempfile.TemporaryDirectory() as root:
+        return len(ExportCache(root).read(('bench', len(df)), 'xlsx', lambda: df))
+
+
+# (nama, fungsi, key output di ctx, opsi batas ukuran, persiapan di luar pengukuran)
+STAGES = [
+    ('fetch_frame', stage_fetch_frame, None, 'max_fetch_rows', None),
+    ('er', stage_er, 'df_er', None, None),
+    ('normalize', stage_normalize, 'R', None, None),
+    ('preference', stage_preference, 'df_final', None, setup_preference),
+    ('keywords', stage_keywords, None, None, None),
+    ('cube', stage_cube, 'cube', None, None),
+    ('heatmap', stage_heatmap, None, None, None),
+    ('excel_export', stage_excel_export, None, 'max_export_rows', None),
+]
+
+
+def measure(fn, ctx, memory):
+    start = time.perf_counter()
+    out = fn(ctx)
+    seconds = time.perf_counter() - start
+    peak_mb = None
+    if memory:
+        # Run kedua dengan tracemalloc agar overhead tracing tidak mengotori waktu
+        tracemalloc.start()
+        fn(ctx)
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return out, seconds, peak_mb
+
+
+def run(sizes, limits, memory=True):
+    results = []
+    for n in sizes:
+        ctx = {'df': make_videos(n)}
+        if n <= limits['max_fetch_rows']:
+            ctx['raw_pages'] = make_raw_pages(n)
+        for name, fn, key, limit, setup in STAGES:
+            if limit and n > limits[limit]:
+                results.append({'rows': n, 'stage': name, 'seconds': None, 'peak_mb': None, 'skipped': True})
+                print(f"{n:>10,} {name:<14} {'skipped':>10}")
+                continue
+            if setup:
+                setup(ctx)
+            out, seconds, peak_mb = measure(fn, ctx, memory)
+            if key:
+                ctx[key] = out
+            results.append({'rows': n, 'stage': name, 'seconds': seconds, 'peak_mb': peak_mb, 'skipped': False})
+            mem = f"{peak_mb:>10.1f} MB" if peak_mb is not None else ''
+            print(f"{n:>10,} {name:<14} {seconds:>10.4f} s {mem}")
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return 'unknown'
+
+
+def compare(results, baseline, baseline_path, threshold):
+    """Bandingkan dengan hasil commit lain; returns jumlah tahap yang melambat > threshold"""
+    baseline = {(r['rows'], r['stage']): r for r in baseline['results']}
+    regressions = 0
+    print(f"\nPerbandingan dengan {baseline_path} (ambang {threshold:.2f}x):")
+    for r in results:
+        base = baseline.get((r['rows'], r['stage']))
+        if not base or r['skipped'] or base['skipped'] or not base['seconds']:
+            continue
+        ratio = r['seconds'] / base['seconds']
+        flag = 'REGRESI' if ratio > threshold else ''
+        regressions += bool(flag)
+        print(f"{r['rows']:>10,} {r['stage']:<14} {ratio:>6.2f}x {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--max-fetch-rows', type=int, default=100_000,
+                        help="batas ukuran tahap fetch_frame (membangkitkan JSON mentah mahal)")
+    parser.add_argument('--max-export-rows', type=int, default=100_000, help="batas ukuran tahap excel_export")
+    parser.add_argument('--no-memory', action='store_true', help="lewati pengukuran puncak memori")
+    parser.add_argument('--output', help="file JSON hasil (default: benchmarks/results/pipeline-<commit>.json)")
+    parser.add_argument('--compare', help="file JSON hasil commit lain untuk deteksi regresi")
+    parser.add_argument('--threshold', type=float, default=1.25, help="rasio waktu yang dianggap regresi")
+    args = parser.parse_args()
+
+    # Baca baseline lebih dulu (file output bisa sama jika commit belum berubah)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    limits = {'max_fetch_rows': args.max_fetch_rows, 'max_export_rows': args.max_export_rows}
+    results = run(args.sizes, limits, memory=not args.no_memory)
+
+    commit = git_commit()
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f"pipeline-{commit}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'results': results,
+        }, f, indent=2)
+    print(f"\nHasil disimpan ke {output}")
+
+    if baseline and compare(results, baseline, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark engine SAW: implementasi lama (apply per baris) vs engine NumPy.
+
+Jalankan dari root repo:
+    python benchmarks/bench_saw.py
+    python benchmarks/bench_saw.py --sizes 1000 1000000 --legacy-max 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model_layer import SAWModel  # noqa: E402
+
+WEIGHTS = {'views': 0.30, 'likes': 0.25, 'comments': 0.20, 'er': 0.25}
+
+
+def make_videos(n, seed=0):
+    rng = np.random.default_rng(seed)
+    views = rng.lognormal(9, 2, n).astype(np.int64)
+    return pd.DataFrame({
+        'view_count': views,
+        'like_count': (views * rng.uniform(0, 0.08, n)).astype(np.int64),
+        'comment_count': (views * rng.uniform(0, 0.01, n)).astype(np.int64),
+    })
+
+
+#==========================================================
+# IMPLEMENTASI LAMA (referensi pembanding)
+#==========================================================
+def legacy_pipeline(df, weights):
+    df['engagement_rate'] = df.apply(
+        lambda x: ((x['like_count'] + x['comment_count']) / x['view_count'] * 100)
+        if x['view_count'] > 0 else 0, axis=1
+    )
+    df_norm = df.copy()
+    for col, norm in [('view_count', 'norm_views'), ('like_count', 'norm_likes'),
+                      ('comment_count', 'norm_comments'), ('engagement_rate', 'norm_er')]:
+        mx = df[col].max()
+        df_norm[norm] = df[col] / mx if mx > 0 else 0
+    df_norm['preference_score'] = (
+        weights['views'] * df_norm['norm_views'] + weights['likes'] * df_norm['norm_likes'] +
+        weights['comments'] * df_norm['norm_comments'] + weights['er'] * df_norm['norm_er']
+    )
+    return df_norm.sort_values(by='preference_score', ascending=False).reset_index(drop=True)
+
+
+def vectorized_pipeline(df, weights):
+    model = SAWModel(weights)
+    df = model.calculate_engagement_rate(df)
+    return model.calculate_preference(model.normalize_data(df))
+
+
+def timeit(fn, df, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        data = df.copy()
+        start = time.perf_counter()
+        fn(data, WEIGHTS)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--legacy-max', type=int, default=100_000,
+                        help="ukuran terbesar untuk implementasi lama (apply sangat lambat)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'legacy (s)':>12} {'numpy (s)':>12} {'speedup':>9}")
+    for n in args.sizes:
+        df = make_videos(n)
+        new = timeit(vectorized_pipeline, df, args.repeat)
+        if n <= args.legacy_max:
+            old = timeit(legacy_pipeline, df, 1)
+            # Hasil harus identik
+            a = legacy_pipeline(df.copy(), WEIGHTS)['preference_score'].to_numpy()
+            b = vectorized_pipeline(df.copy(), WEIGHTS)['preference_score'].to_numpy()
+            assert np.allclose(a, b), "skor berbeda dari implementasi lama"
+            print(f"{n:>10,} {old:>12.4f} {new:>12.4f} {old / new:>8.1f}x")
+        else:
+            print(f"{n:>10,} {'-':>12} {new:>12.4f} {'-':>9}")
+
+
+if __name__ == '__main__':
+    main()
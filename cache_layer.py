@@ -0,0 +1,111 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+#==========================================================
+# TTL DEFAULT PER ENDPOINT (detik)
+#==========================================================
+# search   : hasil pencarian jarang berubah & mahal (100 unit)
+# channels : statistik channel cukup di-refresh tiap jam
+# playlistItems : daftar upload bisa bertambah kapan saja
+# videos   : statistik video (views, likes) berubah cepat
+DEFAULT_TTLS = {
+    'search': 24 * 3600,
+    'channels': 3600,
+    'playlistItems': 900,
+    'videos': 900,
+}
+
+
+class ResponseCache:
+    """
+    Cache respons YouTube API berbasis SQLite.
+    Key = endpoint + parameter request, nilai = JSON respons mentah.
+    """
+    def __init__(self, path=".cache/yt_cache.sqlite", ttls=None, max_entries=5000):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Satu koneksi dipakai bersama antar thread (dijaga lock)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, endpoint TEXT, body TEXT,"
+            " created REAL, accessed REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses(accessed)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(endpoint, params, namespace=None):
+        """
+        Key deterministik: urutan parameter tidak berpengaruh.
+        namespace: endpoint API alternatif (mis. youtube_stub) agar datanya tidak tercampur
+        dengan respons API asli; None = API asli (key sama seperti sebelumnya).
+        """
+        key = endpoint + ":" + json.dumps(params, sort_keys=True, default=str)
+        return key if namespace is None else f"{namespace}|{key}"
+
+    def get(self, endpoint, params, allow_stale=False, namespace=None):
+        """allow_stale=True: kembalikan entri walau TTL sudah lewat (mode hemat kuota)"""
+        key = self.make_key(endpoint, params, namespace)
+        now = time.time()
+        ttl = self.ttls.get(endpoint, 0)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (now - row[1] > ttl and not allow_stale):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, endpoint, params, response, namespace=None):
+        key = self.make_key(endpoint, params, namespace)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, body, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, endpoint, json.dumps(response), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Buang entri yang paling lama tidak diakses (LRU) jika melebihi batas"""
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed ASC LIMIT ?)",
+                (excess,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class MemoryCache(ResponseCache):
+    """Varian non-persisten (hilang saat proses berhenti), cocok untuk testing"""
+    def __init__(self, ttls=None, max_entries=1000):
+        super().__init__(":memory:", ttls=ttls, max_entries=max_entries)
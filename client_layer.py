@@ -0,0 +1,107 @@
+import socket
+import threading
+from collections import OrderedDict
+
+from metrics_layer import METRICS, timed
+
+# requests, httplib2 & googleapiclient.discovery di-import saat klien pertama dibangun
+# (bukan saat app start) agar halaman pertama tampil lebih cepat
+
+
+class PooledHttp:
+    """
+    Transport HTTP kompatibel httplib2 (method `request`) di atas requests.Session.
+    - Connection pool urllib3 dengan keep-alive: koneksi TCP/TLS dipakai ulang antar request
+    - Aman dipakai banyak thread sekaligus (berbeda dengan httplib2.Http)
+    - Mencatat bytes diterima per endpoint ke METRICS
+    """
+    def __init__(self, timeout=30, pool_size=16):
+        import requests
+        from requests.adapters import HTTPAdapter
+        self._requests = requests
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, uri, method='GET', body=None, headers=None, redirections=5, connection_type=None):
+        import httplib2
+        requests = self._requests
+        try:
+            r = self.session.request(method, uri, data=body, headers=headers, timeout=self.timeout,
+                                     allow_redirects=redirections > 0)
+        except requests.Timeout as e:
+            # Tipe exception bawaan agar retry googleapiclient tetap bekerja
+            raise socket.timeout(str(e)) from e
+        except requests.ConnectionError as e:
+            raise ConnectionError(str(e)) from e
+
+        content = r.content
+        endpoint = uri.split('?', 1)[0].rstrip('/').rsplit('/', 1)[-1]
+        METRICS.inc('api_bytes_received_total', len(content), endpoint=endpoint)
+
+        info = {k: v for k, v in r.headers.items() if k.lower() not in ('content-encoding', 'content-length')}
+        info['status'] = str(r.status_code)
+        # Body sudah didekompresi oleh requests (sama seperti httplib2)
+        info['content-length'] = str(len(content))
+        return httplib2.Response(info), content
+
+    def close(self):
+        self.session.close()
+
+
+class ClientFactory:
+    """
+    Klien YouTube API dibangun sekali per (API key, endpoint) lalu dipakai ulang.
+    Discovery document statis (ikut paket google-api-python-client) -> tanpa request discovery.
+    Satu PooledHttp per timeout dipakai bersama semua klien, thread, dan sesi Streamlit.
+    """
+    def __init__(self, max_clients=16):
+        self.max_clients = max_clients
+        self._clients = OrderedDict()
+        self._http = {}
+        self._lock = threading.Lock()
+
+    def http(self, timeout=30):
+        with self._lock:
+            http = self._http.get(timeout)
+            if http is None:
+                http = self._http[timeout] = PooledHttp(timeout=timeout)
+            return http
+
+    def get(self, api_key, base_url=None, timeout=30):
+        key = (api_key, base_url, timeout)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                METRICS.inc('client_cache_total', result='hit')
+                return client
+        METRICS.inc('client_cache_total', result='miss')
+        client = self._build(api_key, base_url, self.http(timeout))
+        with self._lock:
+            self._clients[key] = client
+            # Batasi jumlah klien (key lama/salah ketik dibuang lebih dulu)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        return client
+
+    @staticmethod
+    @timed('client.build')
+    def _build(api_key, base_url, http):
+        from googleapiclient.discovery import build
+        client_options = {'api_endpoint': base_url} if base_url else None
+        return build('youtube', 'v3', developerKey=api_key, client_options=client_options,
+                     http=http, static_discovery=True)
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+            for http in self._http.values():
+                http.close()
+            self._http.clear()
+
+
+# Factory bersama untuk seluruh proses (semua sesi Streamlit)
+CLIENT_FACTORY = ClientFactory()
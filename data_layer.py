@@ -1,28 +1,160 @@
+import numpy as np
 import pandas as pd
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 import datetime
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from cache_layer import ResponseCache
+from client_layer import CLIENT_FACTORY
+from quota_layer import QuotaManager, QuotaExceeded, QUOTA_COSTS
+from niche_layer import NICHE_CLASSIFIER
+from metrics_layer import METRICS, timed
+
+#==========================================================
+# DTYPE RINGKAS DATAFRAME VIDEO
+#==========================================================
+# Lokalisasi nama hari, urutan = dayofweek (Senin = 0)
+DAYS_INDO = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+DAY_DTYPE = pd.CategoricalDtype(DAYS_INDO, ordered=True)
+COUNT_DTYPES = {'view_count': np.uint64, 'like_count': np.uint32, 'comment_count': np.uint32}
+STAT_KEYS = {'view_count': 'viewCount', 'like_count': 'likeCount', 'comment_count': 'commentCount'}
+
+#==========================================================
+# PENEMUAN KOMPETITOR OTOMATIS
+#==========================================================
+# Urutan level categorize_channel (kecil -> besar)
+CATEGORY_LEVELS = ['pemula', 'menengah', 'mapan', 'profesional']
+# Anggaran default satu kali penemuan: 2 search (100 unit/search) + hydrate, maks. 10 detik
+DISCOVERY_QUOTA_BUDGET = 2 * QUOTA_COSTS['search'] + 10
+DISCOVERY_TIME_BUDGET = 10.0
+
+
+class FetchCancelled(Exception):
+    """Fetch channel dihentikan karena pemanggil sudah menyerah (timeout fetch_channels)"""
+    pass
+
+
+class IncompleteFetch(Exception):
+    """
+    Pagination uploads berhenti di tengah karena error (HttpError, QuotaExceeded, FetchCancelled).
+    partial: DataFrame halaman yang sempat diambil; error asli ada di __cause__.
+    """
+    def __init__(self, partial):
+        super().__init__(f"fetch terpotong setelah {len(partial)} video")
+        self.partial = partial
+
 
 class DataManager:
     #==========================================================
     # Fungsi Inisialisasi & Setup
     #==========================================================
-    def __init__(self, api_key):
+    def __init__(self, api_key, cache=None, quota=None, max_workers=4, request_timeout=30, base_url=None,
+                 store=None, recent_days=7, snapshots=None):
         self.api_key = api_key
         self.youtube = None
+        # Override endpoint API (mis. youtube_stub lokal); default dari env YT_API_BASE_URL
+        self.base_url = base_url or os.environ.get('YT_API_BASE_URL')
         self.used_quota = 0 
+        # Cache respons (default: SQLite di .cache/); bisa diganti implementasi lain
+        self.cache = cache if cache is not None else ResponseCache()
+        # Budget kuota harian (persisten, dibagi per API key) + rate limiter opsional
+        # (env YT_API_RATE = maks. request/detik; default tanpa batas per detik)
+        if quota is None:
+            rate = os.environ.get('YT_API_RATE')
+            quota = QuotaManager(api_key, rate_per_sec=float(rate) if rate else None)
+        self.quota = quota
+        # Dataset per channel untuk sinkronisasi inkremental (None = selalu fetch penuh)
+        self.store = store
+        # Statistik video lebih muda dari ini di-request ulang saat sinkronisasi
+        self.recent_days = recent_days
+        # Time-series statistik video (SnapshotStore); setiap fetch dari API (bukan cache) menambah satu snapshot
+        self.snapshots = snapshots
+
+        # Pengaturan fetch paralel
+        self.max_workers = max_workers
+        self.request_timeout = request_timeout
+        self._lock = threading.Lock()
+        # Sinyal batal per thread worker (diisi _fetch_channel)
+        self._local = threading.local()
         
         if self.api_key:
             try:
-                self.youtube = build('youtube', 'v3', developerKey=api_key)
-            except:
-                pass
+                self.youtube = self._build_client(api_key)
+            except Exception as e:
+                METRICS.record_error('data.build_client', e)
+
+    def _build_client(self, api_key):
+        # Klien & koneksi HTTP dipakai ulang antar rerun dan sesi (lihat client_layer)
+        return CLIENT_FACTORY.get(api_key, self.base_url, self.request_timeout)
 
     def update_key(self, new_api_key):
+        # Dipanggil setiap rerun Streamlit -> tidak ada kerja jika key tidak berubah
+        if new_api_key == self.api_key and self.youtube is not None:
+            return
         self.api_key = new_api_key
+        self.quota.set_key(new_api_key)
         try:
-            self.youtube = build('youtube', 'v3', developerKey=new_api_key)
-        except:
-            pass
+            self.youtube = self._build_client(new_api_key)
+        except Exception as e:
+            METRICS.record_error('data.update_key', e)
+
+    @property
+    def cache_hits(self):
+        return self.cache.hits if self.cache is not None else 0
+
+    @property
+    def cache_misses(self):
+        return self.cache.misses if self.cache is not None else 0
+
+    def _call(self, endpoint, **params):
+        """
+        Eksekusi <endpoint>().list(**params) lewat cache.
+        Kuota hanya dihitung jika request benar-benar dikirim ke API.
+        Raises QuotaExceeded jika budget harian tidak cukup.
+        """
+        if self._cancelled():
+            raise FetchCancelled(f"{endpoint} dibatalkan")
+        cost = QUOTA_COSTS.get(endpoint, 1)
+        if self.cache is not None:
+            # Respons dari endpoint alternatif (base_url) disimpan terpisah dari API asli
+            cached = self.cache.get(endpoint, params, namespace=self.base_url)
+            # Kuota menipis -> data cache lama lebih baik daripada request baru
+            if cached is None and self.quota.is_short(cost):
+                cached = self.cache.get(endpoint, params, allow_stale=True, namespace=self.base_url)
+            if cached is not None:
+                METRICS.inc('cache_requests_total', endpoint=endpoint, result='hit')
+                return cached
+            METRICS.inc('cache_requests_total', endpoint=endpoint, result='miss')
+
+        # Endpoint mahal (search) ditolak saat kuota menipis, sisakan untuk analisis
+        if cost >= QUOTA_COSTS['search'] and self.quota.is_short(cost):
+            raise QuotaExceeded(f"Kuota hampir habis, {endpoint} ditunda")
+        self.quota.acquire(endpoint)
+
+        with self._lock:
+            self.used_quota += cost
+        try:
+            # Transport bersama (connection pool) aman dipakai banyak thread
+            with METRICS.span('api.request', endpoint=endpoint):
+                response = getattr(self.youtube, endpoint)().list(**params).execute()
+        except HttpError as e:
+            METRICS.inc('api_errors_total', endpoint=endpoint, status=e.resp.status)
+            if e.resp.status == 403 and b'quotaExceeded' in (e.content or b''):
+                self.quota.ledger.mark_exhausted(self.quota.daily_budget)
+            raise
+
+        live_ids = getattr(self._local, 'live_ids', None)
+        if endpoint == 'videos' and live_ids is not None:
+            # Statistik segar dari API (bukan cache) -> boleh masuk time-series snapshot
+            live_ids.update(item['id'] for item in response.get('items', []))
+        if self.cache is not None:
+            self.cache.set(endpoint, params, response, namespace=self.base_url)
+        return response
 
     #==========================================================
     # Fungsi Pencarian Channel
@@ -31,11 +163,9 @@ class DataManager:
         """Mencari channel berdasarkan nama"""
         if not self.youtube: return []
         try:
-            self.used_quota += 100 
-            request = self.youtube.search().list(
-                part="snippet", q=query, type="channel", maxResults=limit
+            response = self._call(
+                'search', part="snippet", q=query, type="channel", maxResults=limit
             )
-            response = request.execute()
             results = []
             for item in response['items']:
                 thumb = item['snippet']['thumbnails'].get('high', {}).get('url') or "https://via.placeholder.com/150"
@@ -47,85 +177,79 @@ class DataManager:
                     'publish_time': item['snippet']['publishedAt']
                 })
             return results
-        except:
+        except Exception as e:
+            METRICS.record_error('data.search_channels', e)
             return []
 
     #==========================================================
     # DETEKSI NICHE
     #==========================================================
     def _detect_niche(self, channel_item):
-        """Deteksi Niche + Geografi"""
-        topics = channel_item.get('topicDetails', {}).get('topicCategories', [])
-        text = (channel_item['snippet']['title'] + " " + channel_item['snippet']['description']).lower()
-        
-        base_niche = "Umum"
-        geo_tag = ""
-
-        # 1. Geografi
-        if any(x in text for x in ['j-pop', 'jpop', 'japanese', 'japan', 'anime']): geo_tag = "(Jepang)"
-        elif any(x in text for x in ['k-pop', 'kpop', 'korea', 'drakor']): geo_tag = "(Korea)"
-        elif any(x in text for x in ['indonesia', 'indo', 'jakarta']): geo_tag = "(Indonesia)"
-
-        # 2. Topik
-        niche_map = {
-            'Technology': 'Teknologi', 'Gaming': 'Gaming',
-            'Lifestyle': 'Vlog & Lifestyle', 'Entertainment': 'Hiburan',
-            'Music': 'Musik', 'Sport': 'Olahraga', 'Food': 'Kuliner'
-        }
-        
-        found = False
-        for url in topics:
-            for key, label in niche_map.items():
-                if key in url: 
-                    base_niche = label; found = True; break
-            if found: break
-        
-        if not found:
-            if any(x in text for x in ['game', 'play', 'esport']): base_niche = "Gaming"
-            elif any(x in text for x in ['gadget', 'review', 'tech']): base_niche = "Teknologi"
-            elif any(x in text for x in ['song', 'music', 'cover']): base_niche = "Musik"
-            elif any(x in text for x in ['vlog', 'daily', 'travel']): base_niche = "Vlog & Lifestyle"
-            elif any(x in text for x in ['resep', 'masak', 'kuliner', 'food']): base_niche = "Kuliner"
-
-        return f"{base_niche} {geo_tag}".strip()
+        """Deteksi Niche + Geografi (aturan disiapkan sekali, lihat niche_layer)"""
+        return NICHE_CLASSIFIER.classify(channel_item)
 
     def get_channel_info(self, channel_id):
         if not self.youtube: return None
-        try:
-            self.used_quota += 1
-            request = self.youtube.channels().list(
-                part="snippet,contentDetails,statistics,topicDetails",
-                id=channel_id
-            )
-            response = request.execute()
-            if response['items']:
-                item = response['items'][0]
-                item['niche_detected'] = self._detect_niche(item)
-                return item
-            return None
-        except:
-            return None
+        return self.get_channels_info([channel_id]).get(channel_id)
+
+    def get_channels_info(self, channel_ids):
+        """
+        Ambil info banyak channel sekaligus (maks. 50 ID per request, 1 unit kuota).
+        Returns: dict {channel_id: item} mengikuti urutan input; ID yang gagal dilewati.
+        """
+        if not self.youtube: return {}
+        unique_ids = list(dict.fromkeys(cid for cid in channel_ids if cid))
+        found = {}
+
+        for start in range(0, len(unique_ids), 50):
+            # ID diurutkan agar batch yang sama selalu kena cache
+            batch = sorted(unique_ids[start:start + 50])
+            try:
+                response = self._call(
+                    'channels',
+                    part="snippet,contentDetails,statistics,topicDetails",
+                    id=','.join(batch)
+                )
+            except Exception as e:
+                METRICS.record_error('data.get_channels_info', e)
+                continue
+            items = response.get('items', [])
+            for item, niche in zip(items, NICHE_CLASSIFIER.classify_many(items)):
+                item['niche_detected'] = niche
+                found[item['id']] = item
+
+        return {cid: found[cid] for cid in unique_ids if cid in found}
             
     #==========================================================
     # CARI KOMPETITOR BERDASARKAN NICHE
     #==========================================================
-    def search_competitors_by_niche(self, niche_keyword, exclude_channel_id, limit=5):
-        """Mencari 5 channel lain berdasarkan niche/topik"""
+    @staticmethod
+    def normalize_query(text):
+        """
+        Query kanonik: huruf kecil, tanpa tanda baca, spasi tunggal.
+        "Gaming (Indonesia)" dan "gaming  indonesia" -> satu entri cache search (100 unit).
+        """
+        return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+    def search_competitors_by_niche(self, niche_keyword, exclude_channel_id, limit=5, hydrate=False, order="viewCount"):
+        """
+        Mencari 5 channel lain berdasarkan niche/topik.
+        hydrate=True: lengkapi tiap hasil dengan key 'info' (1 request channels().list untuk semua)
+        """
         if not self.youtube: return []
         
-        # Bersihkan keyword (misal: "Gaming (Indonesia)" -> "Gaming Indonesia")
-        clean_query = niche_keyword.replace("(", "").replace(")", "")
+        # Bersihkan keyword (misal: "Gaming (Indonesia)" -> "gaming indonesia")
+        clean_query = self.normalize_query(niche_keyword)
         
         try:
-            self.used_quota += 100
-            request = self.youtube.search().list(
+            response = self._call(
+                'search',
                 part="snippet",
                 q=clean_query, # Cari berdasarkan topik
                 type="channel",
-                order="viewCount", # Cari yang populer
-                maxResults=limit + 1 # Ambil lebih 1 untuk jaga-jaga kalau ada channel utama
+                order=order, # Default: cari yang populer
+                maxResults=min(limit + 1, 50) # Ambil lebih 1 untuk jaga-jaga kalau ada channel utama
             )
-            response = request.execute()
             
             results = []
             for item in response['items']:
@@ -138,10 +262,88 @@ class DataManager:
                         'title': item['snippet']['title'],
                         'thumbnail': thumb
                     })
-            return results[:limit] # Kembalikan maksimal 5
-        except:
+            results = results[:limit] # Kembalikan maksimal 5
+
+            if hydrate and results:
+                infos = self.get_channels_info([r['channel_id'] for r in results])
+                for r in results:
+                    r['info'] = infos.get(r['channel_id'])
+            return results
+        except Exception as e:
+            METRICS.record_error('data.search_competitors_by_niche', e)
             return []
 
+    def _niche_queries(self, channel_info):
+        """Query dari niche_detected: niche lengkap lalu niche dasar ("Gaming (Indonesia)" -> "gaming")"""
+        niche = channel_info.get('niche_detected', 'Umum')
+        base = niche.split(' (')[0]
+        if base == 'Umum':
+            # Niche tidak terdeteksi -> pakai judul channel sebagai topik
+            queries = [channel_info['snippet']['title']]
+        else:
+            queries = [niche, base]
+        return list(dict.fromkeys(q for q in map(self.normalize_query, queries) if q))
+
+    @timed('data.discover_competitors')
+    def discover_competitors(self, main_info, size=5, max_level_gap=1, quota_budget=DISCOVERY_QUOTA_BUDGET,
+                             time_budget=DISCOVERY_TIME_BUDGET, pool=50):
+        """
+        Shortlist kompetitor otomatis dari niche_detected channel utama:
+        1. search per query niche (hasil di-cache per query ternormalisasi, 24 jam)
+        2. kandidat baru dilengkapi sekaligus lewat get_channels_info (1 unit per 50 channel)
+        3. hanya kandidat dengan level categorize_channel dalam +-max_level_gap dari channel utama
+        4. diurutkan: selisih level, niche sama, jarak log subscribers + log rata-rata views
+        Query berikutnya hanya dijalankan jika shortlist belum penuh dan anggaran kuota (unit)
+        serta waktu (detik) masih cukup; anggaran dicek sebelum tiap search.
+        Returns: (list dict channel_id/title/thumbnail/info/category/distance, dict ringkasan biaya)
+        """
+        start = time.perf_counter()
+        used_before = self.used_quota
+        main_id = main_info['id']
+        main_cat = self.categorize_channel(main_info)
+        main_level = CATEGORY_LEVELS.index(main_cat['level'])
+        main_niche = main_info.get('niche_detected', 'Umum')
+
+        report = {'queries': [], 'candidates': 0, 'matched': 0, 'quota_used': 0, 'elapsed': 0.0, 'stopped': None}
+        seen = {main_id}
+        matched = []
+        for query in self._niche_queries(main_info):
+            if len(matched) >= size:
+                break
+            if self.used_quota - used_before + QUOTA_COSTS['search'] > quota_budget:
+                report['stopped'] = 'quota'
+                break
+            if time.perf_counter() - start > time_budget:
+                report['stopped'] = 'time'
+                break
+
+            # Urutan relevansi: ukuran channel dibatasi oleh filter level, bukan oleh popularitas
+            found = self.search_competitors_by_niche(query, main_id, limit=pool, order="relevance")
+            report['queries'].append(query)
+            found = [r for r in found if r['channel_id'] not in seen]
+            seen.update(r['channel_id'] for r in found)
+            report['candidates'] += len(found)
+            infos = self.get_channels_info([r['channel_id'] for r in found])
+
+            for r in found:
+                info = infos.get(r['channel_id'])
+                if info is None:
+                    continue
+                cat = self.categorize_channel(info)
+                gap = abs(CATEGORY_LEVELS.index(cat['level']) - main_level)
+                if gap > max_level_gap:
+                    continue
+                distance = (abs(math.log10(1 + cat['subs']) - math.log10(1 + main_cat['subs']))
+                            + abs(math.log10(1 + cat['avg_views']) - math.log10(1 + main_cat['avg_views'])))
+                matched.append(dict(r, info=info, category=cat, level_gap=gap,
+                                    same_niche=info.get('niche_detected') == main_niche, distance=distance))
+
+        matched.sort(key=lambda c: (c['level_gap'], not c['same_niche'], c['distance']))
+        report.update(matched=len(matched), quota_used=self.used_quota - used_before,
+                      elapsed=time.perf_counter() - start)
+        METRICS.inc('competitor_discovery_total', result='ok' if matched else 'empty')
+        return matched[:size], report
+
     #==========================================================
     # KATEGORISASI CHANNEL
     #==========================================================
@@ -213,63 +415,338 @@ class DataManager:
     #==========================================================
     # Fungsi Analisis Video
     #==========================================================
-    def fetch_videos(self, uploads_playlist_id, limit=50):
-        if not self.youtube: return pd.DataFrame()
-        videos = []
+    @timed('data.build_frame')
+    def _build_video_frame(self, items):
+        """
+        Ubah item mentah videos().list menjadi DataFrame, per kolom sekaligus (tanpa loop per baris).
+        dtype ringkas: hitungan unsigned, day_name kategori berurutan, hour int8, video_id string Arrow.
+        """
+        if not items:
+            return pd.DataFrame()
+        n = len(items)
+        snippets = [item['snippet'] for item in items]
+        stats = [item['statistics'] for item in items]
+
         #==========================================================
-        # lokalisasi
-        #==========================================================  
-        day_map = {
-            'Monday': 'Senin', 'Tuesday': 'Selasa', 'Wednesday': 'Rabu',
-            'Thursday': 'Kamis', 'Friday': 'Jumat', 'Saturday': 'Sabtu', 'Sunday': 'Minggu'
+        # timezone handling (semua publishedAt di-parse sekali, lalu ke WIB)
+        #==========================================================
+        published = pd.to_datetime([sn['publishedAt'] for sn in snippets], utc=True, format='ISO8601')
+        published = published.tz_convert('Asia/Jakarta')
+
+        frame = {
+            'video_id': pd.array([item['id'] for item in items], dtype='string[pyarrow]'),
+            'title': [sn['title'] for sn in snippets],
+            'published_at': published,
         }
+        for col, key in STAT_KEYS.items():
+            frame[col] = np.fromiter((int(st.get(key, 0)) for st in stats), COUNT_DTYPES[col], n)
+        frame['duration'] = [item['contentDetails']['duration'] for item in items]
+        frame['day_name'] = pd.Categorical.from_codes(published.dayofweek, dtype=DAY_DTYPE)
+        frame['hour'] = published.hour.to_numpy().astype(np.int8)
+        return pd.DataFrame(frame)
 
-        try:
-            self.used_quota += 1
-            pl_req = self.youtube.playlistItems().list(
-                part="snippet,contentDetails", playlistId=uploads_playlist_id, maxResults=limit
-            )
-            pl_res = pl_req.execute()
-            video_ids = [item['contentDetails']['videoId'] for item in pl_res['items']]
-            
-            if not video_ids: return pd.DataFrame()
-            
-            #==========================================================
-            # treking kuota
-            #==========================================================  
-            self.used_quota += 1
-            vid_req = self.youtube.videos().list(
-                part="snippet,statistics,contentDetails", id=','.join(video_ids)
+    def _iter_upload_ids(self, uploads_playlist_id, max_videos=None, published_after=None, known_ids=None, page_size=50):
+        """
+        Generator: ikuti nextPageToken di playlist uploads (terbaru lebih dulu)
+        dan yield list ID video per halaman.
+        known_ids : berhenti saat mencapai video yang sudah tersimpan (sinkronisasi inkremental)
+        """
+        if published_after is not None:
+            published_after = pd.Timestamp(published_after)
+            if published_after.tzinfo is None:
+                published_after = published_after.tz_localize('UTC')
+
+        page_size = min(page_size, max_videos or page_size, 50)
+        page_token = None
+        fetched = 0
+
+        while True:
+            params = dict(part="snippet,contentDetails", playlistId=uploads_playlist_id, maxResults=page_size)
+            if page_token:
+                params['pageToken'] = page_token
+            pl_res = self._call('playlistItems', **params)
+
+            # Playlist uploads terurut dari yang terbaru -> stop di batas tanggal / video yang sudah dikenal
+            reached_cutoff = False
+            video_ids = []
+            for item in pl_res.get('items', []):
+                if published_after is not None:
+                    pub = item['contentDetails'].get('videoPublishedAt') or item['snippet'].get('publishedAt')
+                    if pub and pd.Timestamp(pub) < published_after:
+                        reached_cutoff = True
+                        break
+                video_id = item['contentDetails']['videoId']
+                if known_ids is not None and video_id in known_ids:
+                    reached_cutoff = True
+                    break
+                video_ids.append(video_id)
+
+            if max_videos is not None:
+                video_ids = video_ids[:max_videos - fetched]
+            if video_ids:
+                yield video_ids
+            fetched += len(video_ids)
+
+            page_token = pl_res.get('nextPageToken')
+            if reached_cutoff or not page_token:
+                break
+            if max_videos is not None and fetched >= max_videos:
+                break
+
+    def _iter_video_frames(self, video_ids):
+        """videos().list per 50 ID -> DataFrame; respons mentah dibuang setelah diubah"""
+        for start in range(0, len(video_ids), 50):
+            vid_res = self._call(
+                'videos',
+                part="snippet,statistics,contentDetails", id=','.join(video_ids[start:start + 50])
             )
-            vid_res = vid_req.execute()
-            
-            for item in vid_res['items']:
-                stats = item['statistics']
-                snippet = item['snippet']
-                
-                view = int(stats.get('viewCount', 0))
-                like = int(stats.get('likeCount', 0))
-                comm = int(stats.get('commentCount', 0))
-
-                #==========================================================
-                # timezone handling
-                #==========================================================                
-                pub_utc = pd.to_datetime(snippet['publishedAt'])
-                pub_wib = pub_utc + pd.Timedelta(hours=7) if pub_utc.tzinfo is None else pub_utc.tz_convert('Asia/Jakarta')
-                
-                day_en = pub_wib.day_name()
-                
-                videos.append({
-                    'video_id': item['id'],
-                    'title': snippet['title'],
-                    'published_at': pub_wib,
-                    'view_count': view,
-                    'like_count': like,
-                    'comment_count': comm,
-                    'duration': item['contentDetails']['duration'],
-                    'day_name': day_map.get(day_en, day_en),
-                    'hour': pub_wib.hour
-                })
-            return pd.DataFrame(videos)
-        except:
-            return pd.DataFrame()
+            chunk = self._build_video_frame(vid_res['items'])
+            if not chunk.empty:
+                yield chunk
+
+    def iter_videos(self, uploads_playlist_id, max_videos=None, published_after=None, page_size=50, strict=False):
+        """
+        Generator: yield satu DataFrame per halaman playlist uploads (maks. 50 video per videos().list).
+        max_videos      : batas jumlah video (None = seluruh katalog)
+        published_after : berhenti saat mencapai video yang lebih lama dari tanggal ini
+        strict          : True = error di tengah pagination dicatat lalu di-raise ulang;
+                          False (default) = generator berhenti diam-diam (best-effort untuk UI)
+        """
+        if not self.youtube: return
+        try:
+            for video_ids in self._iter_upload_ids(uploads_playlist_id, max_videos, published_after, page_size=page_size):
+                yield from self._iter_video_frames(video_ids)
+        except Exception as e:
+            METRICS.record_error('data.iter_videos', e)
+            if strict:
+                raise
+            return
+
+    def fetch_videos(self, uploads_playlist_id, limit=50, published_after=None, strict=False):
+        """
+        Ambil video dari playlist uploads.
+        limit=50 (default) = 1 halaman; limit=None = seluruh riwayat upload.
+        strict=True: fetch yang terpotong error -> IncompleteFetch (berisi halaman yang sempat diambil),
+        agar pemanggil yang menyimpan hasil bisa membedakan katalog lengkap dari yang terpotong.
+        strict=False (default): hasil terpotong dikembalikan apa adanya.
+        """
+        if not self.youtube: return pd.DataFrame()
+        chunks = []
+        try:
+            for chunk in self.iter_videos(uploads_playlist_id, max_videos=limit, published_after=published_after,
+                                          strict=True):
+                chunks.append(chunk)
+        except Exception as e:
+            if strict:
+                raise IncompleteFetch(pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()) from e
+        if not chunks: return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True)
+
+    #==========================================================
+    # SINKRONISASI INKREMENTAL
+    #==========================================================
+    def _poll_stats(self, video_ids):
+        """Statistik terbaru (views, likes, komentar) untuk ID tertentu; part=statistics saja"""
+        items = []
+        for start in range(0, len(video_ids), 50):
+            res = self._call('videos', part="statistics", id=','.join(video_ids[start:start + 50]))
+            items.extend(res.get('items', []))
+        frame = {col: np.fromiter((int(item['statistics'].get(key, 0)) for item in items), COUNT_DTYPES[col], len(items))
+                 for col, key in STAT_KEYS.items()}
+        return pd.DataFrame(frame, index=pd.Index([item['id'] for item in items], name='video_id'))
+
+    @timed('data.sync_videos')
+    def sync_videos(self, uploads_playlist_id, limit=50, recent_days=None, channel_id=None, strict=False):
+        """
+        Seperti fetch_videos, tetapi memakai dataset tersimpan (self.store):
+        1. playlistItems hanya dipaginasi sampai video yang sudah tersimpan
+        2. statistik hanya di-request ulang untuk video lebih muda dari recent_days
+        3. hasil digabung ke dataset tersimpan
+        Biaya refresh sebanding dengan aktivitas baru, bukan ukuran katalog.
+        Fetch penuh jika belum ada dataset atau limit melebihi cakupan dataset tersimpan.
+        Dataset hanya disimpan jika pagination selesai (halaman terakhir / limit tercapai);
+        fetch yang terpotong error dikembalikan apa adanya tanpa menyentuh store.
+        channel_id: jika diisi, statistik yang baru diambil dari API dicatat ke self.snapshots
+        strict: True = fetch/refresh yang gagal di tengah -> IncompleteFetch (bukan hasil parsial
+                atau dataset tersimpan yang belum diperbarui)
+        """
+        with self._tracking_live_stats():
+            return self._sync_videos(uploads_playlist_id, limit, recent_days, channel_id, strict)
+
+    def _sync_videos(self, uploads_playlist_id, limit, recent_days, channel_id, strict=False):
+        if not self.youtube: return pd.DataFrame()
+        if self.store is None:
+            return self.fetch_videos(uploads_playlist_id, limit=limit, strict=strict)
+        recent_days = self.recent_days if recent_days is None else recent_days
+        now = pd.Timestamp.now(tz='UTC')
+
+        df_old, meta = self.store.load(uploads_playlist_id)
+        depth = meta.get('depth') if meta else None
+        covered = df_old is not None and not df_old.empty and (
+            depth is None or (limit is not None and limit <= depth)
+        )
+        if not covered:
+            try:
+                df = self.fetch_videos(uploads_playlist_id, limit=limit, strict=True)
+            except IncompleteFetch as e:
+                # Disimpan sebagai lengkap -> sinkronisasi berikutnya berhenti di video terbaru
+                # yang tersimpan dan ekor katalog tidak pernah diambil
+                self._record_snapshot(channel_id, e.partial, now)
+                if strict:
+                    raise
+                return e.partial
+            if not df.empty:
+                self._save_synced(uploads_playlist_id, df, limit, now)
+                self._record_snapshot(channel_id, df, now)
+            return df
+
+        try:
+            # 1. Upload baru: dipaginasi sampai video yang sudah dikenal (bukan sampai limit),
+            #    jika tidak, dataset tersimpan punya celah antara upload baru dan video lama.
+            #    Batas depth cukup: video di luar cakupan dataset dibuang saat digabung.
+            known = set(df_old['video_id'])
+            new_ids = [vid for page in self._iter_upload_ids(uploads_playlist_id, max_videos=depth, known_ids=known)
+                       for vid in page]
+            chunks = list(self._iter_video_frames(new_ids))
+
+            # 2. Re-poll statistik video muda; yang lama dianggap stabil
+            young = df_old['published_at'] >= now - pd.Timedelta(days=recent_days)
+            young_ids = df_old.loc[young, 'video_id'].tolist()
+            if young_ids:
+                fresh = self._poll_stats(young_ids)
+                # Video muda yang tidak dikembalikan API (dihapus/private) ikut dibuang
+                df_old = df_old[~young | df_old['video_id'].isin(fresh.index)].copy()
+                idx = df_old['video_id'].isin(fresh.index).to_numpy()
+                for col in fresh.columns:
+                    df_old.loc[idx, col] = fresh.loc[df_old.loc[idx, 'video_id'], col].to_numpy()
+        except Exception as e:
+            METRICS.record_error('data.sync_videos', e)
+            df_old = df_old.head(limit) if limit is not None else df_old
+            if strict:
+                raise IncompleteFetch(df_old) from e
+            return df_old
+
+        METRICS.inc('sync_new_videos_total', len(new_ids))
+        METRICS.inc('sync_repolled_videos_total', len(young_ids))
+        # Hanya statistik yang benar-benar baru diambil yang masuk time-series
+        if chunks or young_ids:
+            fresh_ids = set(new_ids) | set(young_ids)
+            df_fresh = pd.concat(chunks + [df_old], ignore_index=True) if chunks else df_old
+            self._record_snapshot(channel_id, df_fresh[df_fresh['video_id'].isin(fresh_ids)], now)
+
+        # 3. Gabung: video baru di depan, urutan terbaru lebih dulu (seperti playlist uploads)
+        df = pd.concat(chunks + [df_old], ignore_index=True) if chunks else df_old.reset_index(drop=True)
+        df = df.drop_duplicates('video_id').sort_values('published_at', ascending=False, kind='stable')
+        # Dataset tersimpan dibatasi cakupan awalnya agar tidak tumbuh tanpa batas
+        df = (df.head(depth) if depth is not None else df).reset_index(drop=True)
+        self._save_synced(uploads_playlist_id, df, depth, now)
+        return df.head(limit).reset_index(drop=True) if limit is not None else df
+
+    def _cancelled(self):
+        cancel = getattr(self._local, 'cancel', None)
+        return cancel is not None and cancel.is_set()
+
+    @contextmanager
+    def _tracking_live_stats(self):
+        """
+        Lacak video_id yang statistiknya diambil langsung dari API di thread ini (lihat _call).
+        Respons cache bisa berumur hingga TTL videos, jadi tidak dicatat sebagai snapshot baru.
+        """
+        if getattr(self._local, 'live_ids', None) is not None:
+            yield  # sudah dilacak pemanggil
+            return
+        self._local.live_ids = set()
+        try:
+            yield
+        finally:
+            self._local.live_ids = None
+
+    def _record_snapshot(self, channel_id, df, now=None):
+        if self.snapshots is None or channel_id is None or df.empty or self._cancelled():
+            return
+        live_ids = getattr(self._local, 'live_ids', None)
+        if live_ids is not None:
+            df = df[df['video_id'].isin(live_ids)]
+            if df.empty:
+                return
+        try:
+            self.snapshots.append(channel_id, df, now)
+        except Exception as e:
+            METRICS.record_error('data.record_snapshot', e)
+
+    def _save_synced(self, uploads_playlist_id, df, depth, now):
+        # Hasil parsial dari fetch yang dibatalkan tidak boleh menimpa dataset tersimpan
+        if self._cancelled():
+            return
+        self.store.save(uploads_playlist_id, df, {
+            'last_video_id': df['video_id'].iloc[0],
+            'synced_at': now.isoformat(),
+            'depth': depth,
+        })
+
+    #==========================================================
+    # FETCH PARALEL (CHANNEL UTAMA + KOMPETITOR)
+    #==========================================================
+    def _fetch_channel(self, info, limit, cancel=None, strict=False):
+        """
+        cancel: threading.Event; setelah di-set, request API berikutnya (tiap halaman)
+        dibatalkan dan tidak ada yang ditulis ke store / snapshot
+        strict: fetch yang terpotong -> IncompleteFetch (lihat fetch_videos)
+        """
+        self._local.cancel = cancel
+        try:
+            uploads_id = info['contentDetails']['relatedPlaylists']['uploads']
+            if self.store is not None:
+                return info, self.sync_videos(uploads_id, limit=limit, channel_id=info['id'], strict=strict)
+            with self._tracking_live_stats():
+                try:
+                    df = self.fetch_videos(uploads_id, limit=limit, strict=strict)
+                except IncompleteFetch as e:
+                    self._record_snapshot(info['id'], e.partial)
+                    raise
+                self._record_snapshot(info['id'], df)
+            return info, df
+        finally:
+            self._local.cancel = None
+
+    @timed('data.fetch_channels')
+    def fetch_channels(self, channel_ids, limit=50, max_workers=None, timeout=None, strict=False):
+        """
+        Ambil info + video beberapa channel secara paralel.
+        Setiap request dibatasi request_timeout (PooledHttp), jadi channel besar tetap selesai
+        selama tiap halaman merespons.
+        timeout: batas waktu seluruh tahap (detik); None (default) = tanpa batas tahap.
+                 Pemanggil yang memakainya sebaiknya menyesuaikan dengan jumlah halaman yang direncanakan.
+        strict: True = channel yang fetch-nya terpotong error ikut bernilai None (untuk pemanggil
+                yang menyimpan hasil, mis. checkpoint batch); False = hasil parsial dikembalikan.
+        Returns: list (info, df) dengan urutan sama seperti channel_ids;
+        None untuk channel yang gagal atau melewati batas waktu.
+        """
+        if not self.youtube or not channel_ids: return [None] * len(channel_ids)
+        max_workers = max_workers or self.max_workers
+
+        # Info semua channel cukup ceil(N/50) request
+        infos = self.get_channels_info(channel_ids)
+
+        results = [None] * len(channel_ids)
+        cancel = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {
+                executor.submit(self._fetch_channel, infos[cid], limit, cancel, strict): i
+                for i, cid in enumerate(channel_ids) if cid in infos
+            }
+            done, not_done = wait(futures, timeout=timeout)
+            if not_done:
+                METRICS.inc('fetch_timeouts_total', len(not_done))
+                # Thread yang sedang berjalan berhenti di request berikutnya (tanpa memakai kuota lagi)
+                cancel.set()
+            for fut in done:
+                try:
+                    results[futures[fut]] = fut.result()
+                except Exception as e:
+                    METRICS.record_error('data.fetch_channels', e)
+        finally:
+            # Jangan tunggu thread yang melewati timeout
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
@@ -0,0 +1,166 @@
+import gzip
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+from metrics_layer import timed
+
+#==========================================================
+# FORMAT EKSPOR
+#==========================================================
+# key -> (label UI, ekstensi file, MIME)
+EXPORT_FORMATS = {
+    'xlsx': ("Excel (.xlsx)", 'xlsx', "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    'csv.gz': ("CSV terkompresi (.csv.gz)", 'csv.gz', "application/gzip"),
+    'parquet': ("Parquet (.parquet)", 'parquet', "application/vnd.apache.parquet"),
+}
+# Baris per potongan saat menulis (membatasi memori sementara per chunk)
+CHUNK_ROWS = 20_000
+# Batas baris lembar Excel
+XLSX_MAX_ROWS = 1_048_576
+
+
+def _plain_chunk(df):
+    """Potongan siap tulis: datetime tanpa timezone (waktu lokal tetap), kategori -> teks"""
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if isinstance(s.dtype, pd.DatetimeTZDtype):
+            s = s.dt.tz_localize(None)
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            s = s.astype(object)
+        out[col] = s
+    return pd.DataFrame(out, copy=False)
+
+
+@timed('export.xlsx')
+def write_xlsx(df, path, chunk_rows=CHUNK_ROWS):
+    """
+    Excel via xlsxwriter mode constant_memory: baris ditulis berurutan dan langsung
+    di-flush ke file sementara, jadi memori tidak tumbuh dengan jumlah baris.
+    """
+    import xlsxwriter  # lazy: hanya saat file Excel diminta
+
+    if len(df) + 1 > XLSX_MAX_ROWS:
+        raise ValueError(f"Excel maksimal {XLSX_MAX_ROWS - 1:,} baris; gunakan CSV atau Parquet")
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True, 'nan_inf_to_errors': True,
+                                          'default_date_format': 'yyyy-mm-dd hh:mm:ss'})
+    try:
+        sheet = workbook.add_worksheet()
+        sheet.write_row(0, 0, [str(c) for c in df.columns])
+        row = 1
+        for start in range(0, len(df), chunk_rows):
+            chunk = _plain_chunk(df.iloc[start:start + chunk_rows])
+            # Nilai Python per kolom (NaN/NaT -> sel kosong), lalu ditulis baris demi baris
+            columns = [chunk[col].astype(object).where(chunk[col].notna(), None).tolist() for col in chunk.columns]
+            for values in zip(*columns):
+                sheet.write_row(row, 0, values)
+                row += 1
+    finally:
+        workbook.close()
+
+
+@timed('export.csv_gz')
+def write_csv_gz(df, path, chunk_rows=CHUNK_ROWS):
+    """CSV gzip ditulis per potongan (header hanya di potongan pertama)"""
+    with gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=6) as f:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            df.iloc[start:start + chunk_rows].to_csv(f, index=False, header=start == 0)
+
+
+@timed('export.parquet')
+def write_parquet(df, path):
+    """Parquet (pyarrow): tipe data & timezone tetap utuh, cocok untuk hasil sangat besar"""
+    df.to_parquet(path, index=False, compression='zstd')
+
+
+WRITERS = {'xlsx': write_xlsx, 'csv.gz': write_csv_gz, 'parquet': write_parquet}
+
+
+def write_export(df, path, fmt=None):
+    """Tulis df ke path; format dari argumen atau ekstensi file (.xlsx, .csv.gz, .parquet, .csv)"""
+    if fmt is None:
+        fmt = next((key for key in WRITERS if path.endswith('.' + key)), None)
+    if fmt is None:
+        df.to_csv(path, index=False)
+        return
+    WRITERS[fmt](df, path)
+
+
+class ExportCache:
+    """
+    File ekspor di disk, dibuat hanya saat diminta dan dipakai ulang untuk
+    kombinasi (versi dataset + bobot + filter, format) yang sama.
+    File paling lama tidak dipakai dihapus jika melebihi max_files.
+    """
+    def __init__(self, root=".cache/exports", max_files=20):
+        self.root = root
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._building = {}
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, key, fmt):
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()[:24]
+        return os.path.join(self.root, f"{digest}.{EXPORT_FORMATS[fmt][1]}")
+
+    def _path_lock(self, path):
+        with self._lock:
+            return self._building.setdefault(path, threading.Lock())
+
+    def _ensure(self, path, fmt, frame_fn):
+        """Buat file jika belum ada (pemanggil memegang lock path). Returns: True jika file baru"""
+        if os.path.exists(path):
+            os.utime(path)  # tandai baru dipakai (LRU)
+            return False
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            WRITERS[fmt](frame_fn(), tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return True
+
+    def get(self, key, fmt, frame_fn):
+        """
+        Path file ekspor; frame_fn() dipanggil hanya jika file belum ada di cache.
+        Permintaan paralel untuk file yang sama menunggu satu proses pembuatan.
+        File bisa terhapus oleh _prune setelah path dikembalikan; gunakan read() untuk isinya.
+        """
+        path = self.path_for(key, fmt)
+        with self._path_lock(path):
+            created = self._ensure(path, fmt, frame_fn)
+        if created:
+            self._prune()
+        return path
+
+    def read(self, key, fmt, frame_fn):
+        """Isi file ekspor (bytes) untuk st.download_button, dibaca selagi lock path dipegang"""
+        path = self.path_for(key, fmt)
+        with self._path_lock(path):
+            created = self._ensure(path, fmt, frame_fn)
+            with open(path, 'rb') as f:
+                data = f.read()
+        if created:
+            self._prune()
+        return data
+
+    def _prune(self):
+        """Hapus file LRU di atas max_files; file yang sedang dibuat/dibaca (lock path dipegang) dilewati"""
+        with self._lock:
+            files = [os.path.join(self.root, n) for n in os.listdir(self.root) if not n.endswith('.tmp')]
+            files.sort(key=lambda p: os.path.getmtime(p))
+            for path in files[:max(len(files) - self.max_files, 0)]:
+                lock = self._building.setdefault(path, threading.Lock())
+                if not lock.acquire(blocking=False):
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                finally:
+                    lock.release()
+                    del self._building[path]
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+#==========================================================
+# STOPWORDS (kata hubung yang tidak bermakna)
+#==========================================================
+STOPWORDS = frozenset([
+    'di', 'dan', 'ke', 'dari', 'yang', 'ini', 'itu', 'aku', 'saya', 'kamu', 'kita', 'video', 'vlog',
+    'hari', 'bikin', 'cara', 'with', 'the', 'in', 'on', 'of', 'for', 'to', 'a', 'is', 'eps', 'part',
+    'full', 'review', 'indonesia', '2024', '2025', '2026', 'episode'
+])
+
+
+class KeywordIndex:
+    """
+    Inverted index term -> posisi video, dibangun sekali per dataset.
+    Tokenisasi semua judul dalam satu pass (operasi string pandas, tanpa iterrows).
+    Statistik per term (rata-rata views, ER, skor SAW) dihitung dari index ini
+    dengan np.bincount, sehingga perubahan bobot tidak perlu tokenisasi ulang.
+    """
+    def __init__(self, titles, min_len=3):
+        # Bersihkan judul: hapus simbol, huruf kecil
+        clean = pd.Series(np.asarray(titles, dtype=object)).astype(str)
+        clean = clean.str.replace(r"[^a-zA-Z0-9\s]", "", regex=True).str.lower()
+        # explode mempertahankan index = posisi video asal
+        tokens = clean.str.split().explode().dropna()
+
+        # Filter stopword & kata pendek
+        keep = ((tokens.str.len() >= min_len) & ~tokens.isin(STOPWORDS)).to_numpy(dtype=bool)
+        all_words = tokens.to_numpy(dtype=object)
+        all_rows = tokens.index.to_numpy(dtype=np.int64)
+        words, word_rows = all_words[keep], all_rows[keep]
+
+        # Bigram = dua token yang benar-benar bersebelahan di judul yang sama (urutan sebelum filter),
+        # keduanya lolos filter: "nasi goreng di rumah" -> "nasi goreng", bukan "goreng rumah"
+        pair = (all_rows[1:] == all_rows[:-1]) & keep[1:] & keep[:-1]
+        bigrams = all_words[:-1][pair] + ' ' + all_words[1:][pair]
+        bigram_rows = all_rows[:-1][pair]
+
+        terms = np.concatenate([words, bigrams])
+        self.rows = np.concatenate([word_rows, bigram_rows]).astype(np.int64)
+        self.codes, self.terms = pd.factorize(terms)
+        self.terms = np.asarray(self.terms, dtype=object)
+        self.is_bigram = pd.Series(self.terms, dtype=object).str.contains(' ', regex=False).to_numpy(dtype=bool)
+        self.freq = np.bincount(self.codes, minlength=len(self.terms))
+        self.n_videos = len(clean)
+        self._postings = None
+
+    @classmethod
+    def from_frame(cls, df, title_col='title'):
+        return cls(df[title_col].to_numpy())
+
+    def lookup(self, term):
+        """Posisi video yang judulnya mengandung term"""
+        if self._postings is None:
+            order = np.argsort(self.codes, kind='stable')
+            bounds = np.searchsorted(self.codes[order], np.arange(len(self.terms) + 1))
+            self._postings = {t: self.rows[order[bounds[i]:bounds[i + 1]]] for i, t in enumerate(self.terms)}
+        return self._postings.get(term, np.empty(0, dtype=np.int64))
+
+    def stats(self, metrics, min_freq=2, bigrams=False):
+        """
+        Rata-rata metrik per term.
+        metrics: dict {nama_kolom: array per video (urutan sama dengan judul)}
+        Returns: DataFrame ['Keyword', 'Freq', <metrik>...]
+        """
+        result = {'Keyword': self.terms, 'Freq': self.freq}
+        freq = np.maximum(self.freq, 1)
+        for name, values in metrics.items():
+            values = np.asarray(values, dtype=np.float64)
+            result[name] = np.bincount(self.codes, weights=values[self.rows], minlength=len(self.terms)) / freq
+
+        df_kw = pd.DataFrame(result)
+        mask = self.freq >= min_freq
+        if not bigrams:
+            mask &= ~self.is_bigram
+        return df_kw[mask].reset_index(drop=True)
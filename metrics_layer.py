@@ -0,0 +1,159 @@
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Batas bucket histogram latensi (detik), gaya Prometheus
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # slot terakhir = +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Perkiraan kuantil = batas atas bucket tempat kuantil jatuh"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for i, c in enumerate(self.counts):
+            cumulative += c
+            if cumulative >= target:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+
+class Metrics:
+    """
+    Registry metrik proses: span waktu (histogram), counter, dan error terakhir.
+    Aman dipakai banyak thread (fetch paralel) dan banyak sesi Streamlit.
+    """
+    def __init__(self, max_errors=200):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.errors = deque(maxlen=max_errors)
+
+    @staticmethod
+    def _key(name, labels):
+        return (name, tuple(sorted(labels.items())) if labels else ())
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram()
+            hist.observe(seconds)
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def record_error(self, where, exc):
+        """Catat error yang sebelumnya ditelan `except` tanpa jejak"""
+        self.inc('errors_total', where=where, type=type(exc).__name__)
+        with self._lock:
+            self.errors.append({
+                'time': time.time(),
+                'where': where,
+                'type': type(exc).__name__,
+                'message': str(exc)[:500],
+            })
+
+    @contextmanager
+    def span(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.errors.clear()
+
+    #==========================================================
+    # EKSPOR
+    #==========================================================
+    def snapshot(self):
+        with self._lock:
+            spans = [{
+                'name': name, 'labels': dict(labels), 'count': h.count, 'total_s': h.total,
+                'mean_s': h.total / h.count if h.count else 0.0,
+                'p50_s': h.quantile(0.5), 'p95_s': h.quantile(0.95), 'max_s': h.max,
+                'buckets': dict(zip([str(b) for b in h.buckets] + ['+Inf'], h.counts)),
+            } for (name, labels), h in self.histograms.items()]
+            counters = [{'name': name, 'labels': dict(labels), 'value': v} for (name, labels), v in self.counters.items()]
+            errors = list(self.errors)
+        return {'spans': spans, 'counters': counters, 'errors': errors}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix='spk'):
+        """Format teks eksposisi Prometheus"""
+        def fmt_labels(labels, extra=None):
+            items = list(labels) + (extra or [])
+            if not items:
+                return ''
+            return '{' + ','.join(f'{k}="{str(v)}"' for k, v in items) + '}'
+
+        lines = []
+        declared = set()
+
+        def declare(metric, kind):
+            # Satu baris TYPE per metrik, walau label-nya berbeda
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} {kind}")
+
+        with self._lock:
+            for (name, labels), h in sorted(self.histograms.items()):
+                metric = f"{prefix}_{name.replace('.', '_')}_seconds"
+                declare(metric, 'histogram')
+                cumulative = 0
+                for bound, c in zip([str(b) for b in h.buckets] + ['+Inf'], h.counts):
+                    cumulative += c
+                    lines.append(f"{metric}_bucket{fmt_labels(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{metric}_sum{fmt_labels(labels)} {h.total}")
+                lines.append(f"{metric}_count{fmt_labels(labels)} {h.count}")
+            for (name, labels), v in sorted(self.counters.items()):
+                metric = f"{prefix}_{name.replace('.', '_')}"
+                declare(metric, 'counter')
+                lines.append(f"{metric}{fmt_labels(labels)} {v}")
+        return '\n'.join(lines) + '\n'
+
+
+# Registry bersama untuk seluruh proses
+METRICS = Metrics()
+
+
+def timed(name):
+    """Decorator: catat durasi fungsi sebagai span `name`"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with METRICS.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,49 +1,470 @@
+import hashlib
+
+import numpy as np
 import pandas as pd
+from metrics_layer import timed
+
+#==========================================================
+# KRITERIA SAW (semua bertipe benefit)
+#==========================================================
+# (kolom data, key bobot, kolom hasil normalisasi)
+CRITERIA = [
+    ('view_count', 'views', 'norm_views'),
+    ('like_count', 'likes', 'norm_likes'),
+    ('comment_count', 'comments', 'norm_comments'),
+    ('engagement_rate', 'er', 'norm_er'),
+]
+DATA_COLS = [c[0] for c in CRITERIA]
+WEIGHT_KEYS = [c[1] for c in CRITERIA]
+NORM_COLS = [c[2] for c in CRITERIA]
+
+# Kriteria opsional: laju views/hari dari SnapshotStore.velocity (lihat snapshot_layer)
+GROWTH_CRITERION = ('views_per_day', 'growth', 'norm_growth')
+
+
+#==========================================================
+# ENGINE NUMPY (tanpa loop per baris)
+#==========================================================
+def engagement_rate(views, likes, comments):
+    """ER = (Likes + Comments) / Views * 100, bernilai 0 jika Views = 0"""
+    views = np.asarray(views, dtype=np.float64)
+    interactions = np.asarray(likes, dtype=np.float64) + np.asarray(comments, dtype=np.float64)
+    er = np.zeros_like(views)
+    np.divide(interactions, views, out=er, where=views > 0)
+    er *= 100
+    return er
+
+
+def decision_matrix(df, criteria=CRITERIA):
+    """Matriks keputusan X (n x m, float64, C-contiguous) dari kolom kriteria"""
+    X = np.empty((len(df), len(criteria)), dtype=np.float64)
+    for j, (col, _, _) in enumerate(criteria):
+        X[:, j] = df[col].to_numpy(dtype=np.float64)
+    return X
+
+
+def normalize_matrix(X):
+    """Rij = Xij / Max(Xj) untuk semua kolom sekaligus (kolom dengan max 0 -> 0)"""
+    maxima = X.max(axis=0) if len(X) else np.zeros(X.shape[1])
+    R = np.zeros_like(X)
+    np.divide(X, maxima, out=R, where=maxima > 0)
+    return R
+
+
+def sample_weights(k, base=None, concentration=50.0, seed=None, keys=WEIGHT_KEYS):
+    """
+    Sampel K vektor bobot (K x m) dari distribusi Dirichlet.
+    base=None -> Dirichlet(1,...,1) (seragam); selain itu terpusat di sekitar base.
+    """
+    rng = np.random.default_rng(seed)
+    if base is None:
+        alpha = np.ones(len(keys))
+    else:
+        alpha = np.array([base.get(k, 0.0) for k in keys], dtype=np.float64) * concentration
+        alpha = np.maximum(alpha, 1e-3)
+    return rng.dirichlet(alpha, size=k)
+
+
+def _count_inversions(seq):
+    """
+    Jumlah inversi tiap baris seq (K x n, permutasi 0..n-1) dengan merge sort
+    bottom-up yang divektorisasi untuk semua baris sekaligus: O(K n log^2 n).
+    """
+    k, n = seq.shape
+    size = 1 << max(n - 1, 0).bit_length()
+    # Padding nilai besar & naik di akhir -> tidak menambah inversi
+    arr = np.empty((k, size), dtype=np.int64)
+    arr[:, :n] = seq
+    arr[:, n:] = np.arange(n, size)
+    inversions = np.zeros(k, dtype=np.int64)
+
+    width = 1
+    while width < size:
+        blocks = arr.reshape(k, -1, 2 * width)
+        n_blocks = blocks.shape[1]
+        # Offset per blok agar satu searchsorted global cukup untuk semua blok
+        offset = (np.arange(k * n_blocks, dtype=np.int64) * size).reshape(k, n_blocks, 1)
+        left = (blocks[:, :, :width] + offset).ravel()
+        right = blocks[:, :, width:] + offset
+        pos = np.searchsorted(left, right.ravel(), side='right').reshape(right.shape)
+        pos -= (np.arange(k * n_blocks, dtype=np.int64) * width).reshape(k, n_blocks, 1)
+        # Elemen kiri yang lebih besar dari tiap elemen kanan
+        inversions += (width - pos).sum(axis=(1, 2))
+        arr = np.sort(blocks, axis=-1).reshape(k, size)
+        width *= 2
+    return inversions
+
+
+def kendall_tau(base_scores, scores):
+    """
+    Kendall tau (tau-a) antara ranking dasar dan ranking tiap skenario.
+    base_scores: (n,), scores: (n, K) -> array (K,)
+    """
+    n = len(base_scores)
+    if n < 2:
+        return np.ones(scores.shape[1])
+    base_order = np.argsort(-base_scores, kind='stable')
+    ranks = _ranks(scores)
+    # Ranking skenario dibaca dalam urutan ranking dasar -> inversi = pasangan diskordan
+    seq = (ranks[base_order].T - 1)
+    discordant = _count_inversions(np.ascontiguousarray(seq))
+    pairs = n * (n - 1) / 2
+    return 1 - 2 * discordant / pairs
+
+
+def top_k_indices(scores, k, offset=0):
+    """
+    Posisi baris peringkat offset+1 .. offset+k tanpa sort penuh.
+    argpartition O(n) lalu hanya kandidat teratas yang diurutkan.
+    Seri (skor sama) diurutkan berdasarkan posisi baris, konsisten dengan sort stabil.
+    """
+    n = len(scores)
+    end = min(offset + k, n)
+    if offset >= end:
+        return np.empty(0, dtype=np.intp)
+    if end == n:
+        return np.argsort(-scores, kind='stable')[offset:end]
+    threshold = scores[np.argpartition(-scores, end - 1)[end - 1]]
+    # Semua kandidat >= ambang ikut, agar seri di batas tetap deterministik
+    candidates = np.flatnonzero(scores >= threshold)
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order][offset:end]
+
+
+def _ranks(scores):
+    """Rank 1..n per kolom (skor tertinggi = 1)"""
+    n = scores.shape[0]
+    order = np.argsort(-scores, axis=0, kind='stable')
+    ranks = np.empty(scores.shape, dtype=np.int64)
+    np.put_along_axis(ranks, order, np.arange(1, n + 1)[:, None], axis=0)
+    return ranks
+
 
 class SAWModel:
-    def __init__(self, weights):
+    def __init__(self, weights, criteria=CRITERIA):
         """
-        weights: Dictionary {'views': float, 'likes': float, 'comments': float, 'er': float}
+        weights : Dictionary {'views': float, 'likes': float, 'comments': float, 'er': float}
+        criteria: daftar (kolom data, key bobot, kolom normalisasi); key tanpa bobot dianggap 0
         """
         self.weights = weights
+        self.criteria = list(criteria)
+
+    @property
+    def weight_vector(self):
+        return np.array([self.weights.get(key, 0.0) for _, key, _ in self.criteria], dtype=np.float64)
 
+    def score_matrix(self, R):
+        """V = R . w (satu perkalian matriks-vektor)"""
+        return R @ self.weight_vector
+
+    @timed('saw.engagement_rate')
     def calculate_engagement_rate(self, df):
         """Menghitung Engagement Rate (ER)"""
         # Rumus: (Likes + Comments) / Views * 100
         # Hindari pembagian 0
-        df['engagement_rate'] = df.apply(
-            lambda x: ((x['like_count'] + x['comment_count']) / x['view_count'] * 100) 
-            if x['view_count'] > 0 else 0, axis=1
-        )
+        df['engagement_rate'] = engagement_rate(df['view_count'], df['like_count'], df['comment_count'])
         return df
 
+    @timed('saw.normalize')
     def normalize_data(self, df):
         """Normalisasi Matriks (Metode Benefit)"""
-        # Copy dataframe agar data asli aman
-        df_norm = df.copy()
-        
-        # Mencari nilai Max tiap kriteria
-        max_views = df['view_count'].max()
-        max_likes = df['like_count'].max()
-        max_comments = df['comment_count'].max()
-        max_er = df['engagement_rate'].max()
-        
         # Rumus Normalisasi: Rij = Xij / Max(Xj)
-        df_norm['norm_views'] = df['view_count'] / max_views if max_views > 0 else 0
-        df_norm['norm_likes'] = df['like_count'] / max_likes if max_likes > 0 else 0
-        df_norm['norm_comments'] = df['comment_count'] / max_comments if max_comments > 0 else 0
-        df_norm['norm_er'] = df['engagement_rate'] / max_er if max_er > 0 else 0
-        
-        return df_norm
-
-    def calculate_preference(self, df_norm):
-        """Menghitung Nilai Preferensi (V)"""
+        R = normalize_matrix(decision_matrix(df, self.criteria))
+        # assign -> DataFrame baru, data asli tetap aman
+        return df.assign(**{c[2]: R[:, j] for j, c in enumerate(self.criteria)})
+
+    @timed('saw.preference')
+    def calculate_preference(self, df_norm, top_k=None):
+        """
+        Menghitung Nilai Preferensi (V)
+        top_k: jika diisi, hanya k video teratas yang dikembalikan (tanpa sort penuh)
+        """
         # V = W1*R1 + W2*R2 + ...
-        df_norm['preference_score'] = (
-            (self.weights['views'] * df_norm['norm_views']) +
-            (self.weights['likes'] * df_norm['norm_likes']) +
-            (self.weights['comments'] * df_norm['norm_comments']) +
-            (self.weights['er'] * df_norm['norm_er'])
-        )
+        R = df_norm[[c[2] for c in self.criteria]].to_numpy(dtype=np.float64)
+        df_norm['preference_score'] = self.score_matrix(R)
 
+        if top_k is not None:
+            idx = top_k_indices(df_norm['preference_score'].to_numpy(), top_k)
+            return df_norm.take(idx).reset_index(drop=True)
         return df_norm.sort_values(by='preference_score', ascending=False).reset_index(drop=True)
+
+
+class ScoringSession:
+    """
+    Hasil satu kali analisis: data video + matriks ternormalisasi R.
+    Perubahan bobot cukup menghitung ulang V = R . w dan urutan ranking,
+    tanpa request API dan tanpa normalisasi ulang.
+    criteria: CRITERIA (default) atau CRITERIA + [GROWTH_CRITERION] jika df punya kolom views_per_day
+    """
+    @timed('saw.session_init')
+    def __init__(self, df, criteria=CRITERIA):
+        self.criteria = list(criteria)
+        self.weight_keys = [c[1] for c in self.criteria]
+        model = SAWModel(None, self.criteria)
+        self.df = model.calculate_engagement_rate(df)
+        self.R = normalize_matrix(decision_matrix(self.df, self.criteria))
+        self.df_norm = self.df.assign(**{c[2]: self.R[:, j] for j, c in enumerate(self.criteria)})
+        self._last_weights = None
+        self._last_result = None
+        self._scores_key = None
+        self._scores = None
+        self._ranks = None
+        self._dataset_key = None
+
+    def _weights_key(self, weights):
+        return tuple(float(weights.get(k, 0.0)) for k in self.weight_keys)
+
+    @property
+    def dataset_key(self):
+        """Sidik jari dataset (ID, judul, nilai kriteria), dihitung sekali per sesi"""
+        if self._dataset_key is None:
+            cols = [c for c in ['video_id', 'title'] + [c[0] for c in self.criteria] if c in self.df.columns]
+            hashed = pd.util.hash_pandas_object(self.df[cols], index=False).to_numpy()
+            self._dataset_key = hashlib.sha256(hashed.tobytes()).hexdigest()[:16]
+        return self._dataset_key
+
+    def cache_key(self, weights):
+        """Key cache untuk hasil turunan (mis. file ekspor): versi dataset + bobot"""
+        return (self.dataset_key, self._weights_key(weights))
+
+    def scores(self, weights):
+        """Vektor V untuk bobot tertentu (disimpan untuk bobot terakhir)"""
+        key = self._weights_key(weights)
+        if key != self._scores_key:
+            self._scores = SAWModel(weights, self.criteria).score_matrix(self.R)
+            self._scores_key, self._ranks = key, None
+        return self._scores
+
+    #==========================================================
+    # RANKING PARSIAL (TOP-K) & RANK LAZY
+    #==========================================================
+    @timed('saw.top')
+    def top(self, weights, k=10, offset=0):
+        """
+        Video peringkat offset+1 .. offset+k (halaman "k berikutnya" via offset).
+        Hanya baris yang ditampilkan yang disalin dari DataFrame.
+        """
+        scores = self.scores(weights)
+        idx = top_k_indices(scores, k, offset)
+        page = self.df_norm.take(idx).reset_index(drop=True)
+        page['preference_score'] = scores[idx]
+        page['Rank'] = np.arange(offset + 1, offset + len(idx) + 1)
+        return page
+
+    def rank_of(self, weights, positions):
+        """Rank (1 = terbaik) untuk posisi baris tertentu, dihitung saat diminta"""
+        scores = self.scores(weights)
+        positions = np.atleast_1d(positions)
+        if self._ranks is not None:
+            return self._ranks[positions]
+        s = scores[positions][:, None]
+        # Rank = jumlah skor lebih tinggi + seri di posisi lebih awal + 1
+        higher = (scores[None, :] > s).sum(axis=1)
+        ties_before = ((scores[None, :] == s) & (np.arange(len(scores))[None, :] < positions[:, None])).sum(axis=1)
+        return higher + ties_before + 1
+
+    def ranks(self, weights):
+        """Rank seluruh video (sort penuh, dihitung sekali per bobot)"""
+        self.scores(weights)
+        if self._ranks is None:
+            self._ranks = _ranks(self._scores[:, None])[:, 0]
+        return self._ranks
+
+    @timed('saw.rank')
+    def rank(self, weights):
+        """DataFrame terurut berdasarkan preference_score + kolom Rank"""
+        key = self._weights_key(weights)
+        if key == self._last_weights:
+            return self._last_result
+
+        scores = self.scores(weights)
+        order = np.argsort(-scores, kind='stable')
+        ranked = self.df_norm.take(order).reset_index(drop=True)
+        ranked['preference_score'] = scores[order]
+        ranked['Rank'] = np.arange(1, len(ranked) + 1)
+
+        self._last_weights, self._last_result = key, ranked
+        return ranked
+
+    #==========================================================
+    # ANALISIS SENSITIVITAS BOBOT (BANYAK SKENARIO SEKALIGUS)
+    #==========================================================
+    def score_matrix(self, W):
+        """Skor n x K untuk K skenario bobot (W: K x m) dalam satu perkalian matriks"""
+        return self.R @ np.asarray(W, dtype=np.float64).T
+
+    @timed('saw.sensitivity')
+    def sensitivity(self, W, base_weights, top_k=5, chunk_size=256):
+        """
+        Stabilitas ranking tiap video terhadap K skenario bobot.
+        Memori dibatasi n x chunk_size dengan memproses W per potongan.
+        Returns: (DataFrame per video, array Kendall tau per skenario vs bobot dasar)
+        """
+        W = np.asarray(W, dtype=np.float64)
+        n, k = len(self.R), len(W)
+        rank_sum = np.zeros(n)
+        rank_sq = np.zeros(n)
+        top_hits = np.zeros(n)
+        taus = np.empty(k)
+        base_scores = self.scores(base_weights)
+
+        for start in range(0, k, chunk_size):
+            S = self.score_matrix(W[start:start + chunk_size])
+            ranks = _ranks(S)
+            rank_sum += ranks.sum(axis=1)
+            rank_sq += (ranks.astype(np.float64) ** 2).sum(axis=1)
+            top_hits += (ranks <= top_k).sum(axis=1)
+            taus[start:start + S.shape[1]] = kendall_tau(base_scores, S)
+
+        rank_mean = rank_sum / k
+        stats = pd.DataFrame({
+            'base_rank': _ranks(base_scores[:, None])[:, 0],
+            'rank_mean': rank_mean,
+            'rank_var': np.maximum(rank_sq / k - rank_mean ** 2, 0),
+            f'top{top_k}_frac': top_hits / k,
+        }, index=self.df.index)
+        if 'title' in self.df.columns:
+            stats.insert(0, 'title', self.df['title'])
+        return stats.sort_values('base_rank'), taus
+
+
+#==========================================================
+# SAW GABUNGAN LINTAS CHANNEL
+#==========================================================
+# Kolom identitas video yang ikut ke hasil ranking gabungan
+POOLED_META_COLS = ['video_id', 'title', 'published_at']
+NORMALIZATIONS = ('global', 'channel')
+QUANTILES = {'min': 0.0, 'q1': 0.25, 'median': 0.5, 'q3': 0.75, 'max': 1.0}
+
+
+class PooledSession:
+    """
+    SAW gabungan: video channel utama & semua kompetitor dalam satu matriks keputusan.
+    - X (n_total x m) dialokasikan sekali lalu diisi per irisan channel (tanpa salinan concat);
+      baris channel k = offsets[k]:offsets[k+1], kode channel tiap baris di `codes`
+    - Normalisasi 'global' (max seluruh video) atau 'channel' (max per channel),
+      dihitung sekali per mode; perubahan bobot cukup V = R . w
+    frames: list (channel_id, DataFrame video); channel tanpa video / duplikat dilewati
+    labels: dict {channel_id: nama channel} untuk tampilan
+    """
+    @timed('saw.pooled_init')
+    def __init__(self, frames, criteria=CRITERIA, labels=None):
+        unique = {}
+        for channel_id, df in frames:
+            if df is not None and len(df) and channel_id not in unique:
+                unique[channel_id] = df
+        self.criteria = list(criteria)
+        self.weight_keys = [c[1] for c in self.criteria]
+        self.channel_ids = list(unique)
+        self.labels = [(labels or {}).get(cid, cid) for cid in self.channel_ids]
+        self.frames = list(unique.values())
+        sizes = np.array([len(df) for df in self.frames], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)])
+        self.codes = np.repeat(np.arange(len(self.frames), dtype=np.int32), sizes)
+
+        self.X = np.empty((int(self.offsets[-1]), len(self.criteria)), dtype=np.float64)
+        for k, df in enumerate(self.frames):
+            rows = self.X[self.offsets[k]:self.offsets[k + 1]]  # view: diisi langsung ke X
+            for j, (col, _, _) in enumerate(self.criteria):
+                if col == 'engagement_rate' and col not in df.columns:
+                    rows[:, j] = engagement_rate(df['view_count'], df['like_count'], df['comment_count'])
+                else:
+                    rows[:, j] = df[col].to_numpy(dtype=np.float64)
+        self._R = {}
+        self._scores_key = None
+        self._scores = None
+
+    def __len__(self):
+        return len(self.X)
+
+    def normalized(self, normalization='global'):
+        """Matriks R untuk mode normalisasi (disimpan per mode)"""
+        if normalization not in NORMALIZATIONS:
+            raise ValueError(f"Normalisasi tidak dikenal: {normalization} (pilih {', '.join(NORMALIZATIONS)})")
+        R = self._R.get(normalization)
+        if R is None:
+            if normalization == 'global' or not len(self.X):
+                R = normalize_matrix(self.X)
+            else:
+                # Max per channel dalam satu panggilan (irisan channel berurutan di X)
+                maxima = np.maximum.reduceat(self.X, self.offsets[:-1], axis=0)
+                R = np.zeros_like(self.X)
+                for k, channel_max in enumerate(maxima):
+                    start, end = self.offsets[k], self.offsets[k + 1]
+                    np.divide(self.X[start:end], channel_max, out=R[start:end], where=channel_max > 0)
+            self._R[normalization] = R
+        return R
+
+    def scores(self, weights, normalization='global'):
+        """Vektor V seluruh video gabungan (disimpan untuk bobot & mode terakhir)"""
+        key = (normalization, tuple(float(weights.get(k, 0.0)) for k in self.weight_keys))
+        if key != self._scores_key:
+            self._scores = SAWModel(weights, self.criteria).score_matrix(self.normalized(normalization))
+            self._scores_key = key
+        return self._scores
+
+    @timed('saw.pooled_rank')
+    def rank(self, weights, normalization='global', k=None):
+        """
+        Ranking lintas channel (k=None: semua video, selain itu hanya k teratas tanpa sort penuh).
+        Hanya baris yang tampil yang diambil dari DataFrame per channel.
+        """
+        scores = self.scores(weights, normalization)
+        idx = np.argsort(-scores, kind='stable') if k is None else top_k_indices(scores, k)
+        codes = self.codes[idx]
+        local = idx - self.offsets[codes]
+
+        parts = []
+        for code in np.unique(codes):
+            pos = np.flatnonzero(codes == code)
+            df = self.frames[code]
+            part = df.iloc[local[pos]][[c for c in POOLED_META_COLS if c in df.columns]]
+            part.index = pos
+            parts.append(part)
+        ranked = pd.concat(parts).sort_index() if parts else pd.DataFrame(columns=POOLED_META_COLS)
+        ranked.insert(0, 'channel_title', np.asarray(self.labels, dtype=object)[codes])
+        ranked.insert(0, 'channel_id', np.asarray(self.channel_ids, dtype=object)[codes])
+        for j, (col, _, _) in enumerate(self.criteria):
+            values = self.X[idx, j]
+            ranked[col] = values.astype(np.int64) if col.endswith('_count') else values
+        ranked['preference_score'] = scores[idx]
+        ranked['Rank'] = np.arange(1, len(idx) + 1)
+        return ranked.reset_index(drop=True)
+
+    @timed('saw.pooled_distribution')
+    def distribution(self, weights, normalization='global', top_k=10):
+        """
+        Distribusi skor per channel: jumlah video, mean, std, min/q1/median/q3/max,
+        dan jumlah video channel di top_k ranking gabungan.
+        Dihitung untuk semua channel sekaligus (reduceat & indeks kuantil per irisan terurut).
+        """
+        scores = self.scores(weights, normalization)
+        columns = ['channel_id', 'channel_title', 'videos', 'mean', 'std', *QUANTILES, f'top{top_k}', f'top{top_k}_share']
+        if not len(scores):
+            return pd.DataFrame(columns=columns)
+        starts = self.offsets[:-1]
+        sizes = np.diff(self.offsets)
+        # Skor diurutkan di dalam irisan masing-masing channel
+        ordered = scores[np.lexsort((scores, self.codes))]
+
+        mean = np.add.reduceat(scores, starts) / sizes
+        sq = np.add.reduceat(scores ** 2, starts) / sizes
+        std = np.sqrt(np.maximum(sq - mean ** 2, 0) * sizes / np.maximum(sizes - 1, 1))
+        stats = {'mean': mean, 'std': std}
+        for name, q in QUANTILES.items():
+            # Interpolasi linear (sama dengan np.percentile default)
+            pos = q * (sizes - 1)
+            lower = np.floor(pos).astype(np.int64)
+            upper = np.minimum(lower + 1, sizes - 1)
+            frac = pos - lower
+            stats[name] = ordered[starts + lower] * (1 - frac) + ordered[starts + upper] * frac
+
+        top = np.bincount(self.codes[top_k_indices(scores, top_k)], minlength=len(sizes))
+        return pd.DataFrame({
+            'channel_id': self.channel_ids,
+            'channel_title': self.labels,
+            'videos': sizes,
+            **stats,
+            f'top{top_k}': top,
+            f'top{top_k}_share': top / max(min(top_k, len(scores)), 1),
+        }, columns=columns)
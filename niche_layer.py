@@ -0,0 +1,101 @@
+import pandas as pd
+
+#==========================================================
+# ATURAN KLASIFIKASI (urutan = prioritas)
+#==========================================================
+GEO_RULES = (
+    ('(Jepang)', ('j-pop', 'jpop', 'japanese', 'japan', 'anime')),
+    ('(Korea)', ('k-pop', 'kpop', 'korea', 'drakor')),
+    ('(Indonesia)', ('indonesia', 'indo', 'jakarta')),
+)
+
+# Kata kunci di URL topicCategories (case-sensitive, sesuai URL Wikipedia)
+TOPIC_RULES = (
+    ('Technology', 'Teknologi'), ('Gaming', 'Gaming'),
+    ('Lifestyle', 'Vlog & Lifestyle'), ('Entertainment', 'Hiburan'),
+    ('Music', 'Musik'), ('Sport', 'Olahraga'), ('Food', 'Kuliner'),
+)
+
+# Fallback jika tidak ada topicCategories yang cocok
+KEYWORD_RULES = (
+    ('Gaming', ('game', 'play', 'esport')),
+    ('Teknologi', ('gadget', 'review', 'tech')),
+    ('Musik', ('song', 'music', 'cover')),
+    ('Vlog & Lifestyle', ('vlog', 'daily', 'travel')),
+    ('Kuliner', ('resep', 'masak', 'kuliner', 'food')),
+)
+
+
+class NicheClassifier:
+    """
+    Deteksi Niche + Geografi dengan aturan yang disiapkan sekali.
+    - Kata kunci dicek dengan pencarian substring bawaan (C), berhenti di grup pertama yang cocok
+    - Label per URL topicCategories di-cache (jumlah URL unik di YouTube sangat sedikit)
+    Label identik dengan implementasi lama (`any(x in text ...)`).
+    """
+    def __init__(self, geo_rules=GEO_RULES, topic_rules=TOPIC_RULES, keyword_rules=KEYWORD_RULES):
+        self.geo_rules = tuple(geo_rules)
+        self.topic_rules = tuple(topic_rules)
+        self.keyword_rules = tuple(keyword_rules)
+        self._topic_cache = {}
+
+    @staticmethod
+    def _first_group(text, rules, default):
+        contains = text.__contains__
+        for label, words in rules:
+            if any(map(contains, words)):
+                return label
+        return default
+
+    def _topic_label(self, url):
+        label = self._topic_cache.get(url, False)
+        if label is False:
+            label = next((lbl for key, lbl in self.topic_rules if key in url), None)
+            self._topic_cache[url] = label
+        return label
+
+    def classify_text(self, text, topics=()):
+        text = text.lower()
+
+        # 1. Geografi
+        geo_tag = self._first_group(text, self.geo_rules, "")
+
+        # 2. Topik: URL pertama yang cocok
+        base_niche = None
+        for url in topics:
+            base_niche = self._topic_label(url)
+            if base_niche:
+                break
+
+        # 3. Fallback kata kunci di judul + deskripsi
+        if base_niche is None:
+            base_niche = self._first_group(text, self.keyword_rules, "Umum")
+
+        return f"{base_niche} {geo_tag}".strip()
+
+    def classify(self, channel_item):
+        """Klasifikasi satu item channels().list"""
+        topics = channel_item.get('topicDetails', {}).get('topicCategories', [])
+        text = channel_item['snippet']['title'] + " " + channel_item['snippet']['description']
+        return self.classify_text(text, topics)
+
+    def classify_many(self, channel_items):
+        """Klasifikasi banyak item channels().list sekaligus"""
+        classify = self.classify
+        return [classify(item) for item in channel_items]
+
+    def classify_frame(self, df, title_col='title', description_col='description', topics_col='topics'):
+        """Klasifikasi seluruh DataFrame channel; kolom topik opsional (list URL per baris)"""
+        # Lowercase seluruh kolom teks sekaligus (vektor pandas)
+        texts = (df[title_col].fillna('').astype(str) + " " + df[description_col].fillna('').astype(str)).str.lower()
+        topics = df[topics_col].to_numpy() if topics_col in df.columns else [()] * len(df)
+        classify_text = self.classify_text
+        labels = [
+            classify_text(text, t if isinstance(t, (list, tuple)) else ())
+            for text, t in zip(texts.to_numpy(), topics)
+        ]
+        return pd.Series(labels, index=df.index, name='niche_detected')
+
+
+# Instance bersama (aturan disiapkan sekali saat modul di-import)
+NICHE_CLASSIFIER = NicheClassifier()
@@ -0,0 +1,191 @@
+import hashlib
+import math
+import os
+import sqlite3
+from contextlib import closing
+import threading
+import time
+import datetime
+from zoneinfo import ZoneInfo
+
+#==========================================================
+# KONSTANTA KUOTA YOUTUBE DATA API v3
+#==========================================================
+# Biaya kuota per pemanggilan endpoint
+QUOTA_COSTS = {'search': 100, 'channels': 1, 'playlistItems': 1, 'videos': 1}
+# Kuota default per project per hari (reset tengah malam waktu Pasifik)
+DAILY_LIMIT = 10000
+RESET_TZ = ZoneInfo('America/Los_Angeles')
+
+
+class QuotaExceeded(Exception):
+    """Request ditolak karena anggaran kuota harian tidak cukup"""
+    pass
+
+
+class TokenBucket:
+    """Rate limiter token bucket (aman dipakai banyak thread)"""
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)                       # token per detik
+        self.capacity = float(capacity or max(rate, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1, timeout=None):
+        """Tunggu sampai token tersedia. Returns False jika timeout habis."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = (tokens - self.tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class QuotaLedger:
+    """
+    Pencatatan pemakaian kuota harian di SQLite.
+    Dibagi antar proses/user yang memakai API key yang sama, dan tetap ada setelah restart.
+    """
+    def __init__(self, path=".cache/quota.sqlite", api_key=None):
+        self.path = path
+        self.key_id = self.key_fingerprint(api_key)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS usage ("
+                " key_id TEXT, day TEXT, units INTEGER, PRIMARY KEY (key_id, day))"
+            )
+
+    @staticmethod
+    def key_fingerprint(api_key):
+        # API key tidak pernah disimpan mentah
+        return hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+
+    @staticmethod
+    def today():
+        return datetime.datetime.now(RESET_TZ).strftime('%Y-%m-%d')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10, isolation_level=None)
+
+    def used(self):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT units FROM usage WHERE key_id = ? AND day = ?", (self.key_id, self.today())
+            ).fetchone()
+        return row[0] if row else 0
+
+    def reserve(self, units, budget):
+        """Tambah pemakaian secara atomik jika masih muat dalam budget"""
+        with closing(self._connect()) as conn:
+            # BEGIN IMMEDIATE -> kunci tulis, aman untuk banyak proses
+            conn.execute("BEGIN IMMEDIATE")
+            day = self.today()
+            row = conn.execute(
+                "SELECT units FROM usage WHERE key_id = ? AND day = ?", (self.key_id, day)
+            ).fetchone()
+            used = row[0] if row else 0
+            if used + units > budget:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO usage (key_id, day, units) VALUES (?, ?, ?)",
+                (self.key_id, day, used + units)
+            )
+            conn.execute("COMMIT")
+            return True
+
+    def mark_exhausted(self, budget):
+        """Dipanggil saat API membalas 403 quotaExceeded"""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO usage (key_id, day, units) VALUES (?, ?, ?)",
+                (self.key_id, self.today(), budget)
+            )
+
+
+class QuotaManager:
+    """
+    Anggaran kuota harian + rate limit per detik (opsional) + estimasi biaya analisis.
+    rate_per_sec=None: tanpa batas per detik (default); anggaran harian tetap berlaku.
+    """
+    def __init__(self, api_key=None, daily_budget=DAILY_LIMIT, rate_per_sec=None,
+                 path=".cache/quota.sqlite", low_threshold=500):
+        self.daily_budget = daily_budget
+        self.low_threshold = low_threshold
+        self.ledger = QuotaLedger(path, api_key)
+        self.bucket = TokenBucket(rate_per_sec) if rate_per_sec else None
+
+    def set_key(self, api_key):
+        self.ledger.key_id = QuotaLedger.key_fingerprint(api_key)
+
+    @property
+    def used_today(self):
+        return self.ledger.used()
+
+    @property
+    def remaining(self):
+        return max(self.daily_budget - self.ledger.used(), 0)
+
+    def is_short(self, units=0):
+        """True jika sisa kuota (setelah `units`) masuk zona hemat"""
+        return self.remaining - units < self.low_threshold
+
+    def acquire(self, endpoint, timeout=30):
+        """Rate limit + potong budget sebelum request dikirim"""
+        cost = QUOTA_COSTS.get(endpoint, 1)
+        if self.bucket is not None and not self.bucket.acquire(timeout=timeout):
+            raise QuotaExceeded(f"Rate limit: {endpoint} menunggu terlalu lama")
+        if not self.ledger.reserve(cost, self.daily_budget):
+            raise QuotaExceeded(f"Sisa kuota harian tidak cukup untuk {endpoint} ({cost} unit)")
+        return cost
+
+    #==========================================================
+    # ESTIMASI BIAYA (PRE-FLIGHT)
+    #==========================================================
+    @staticmethod
+    def estimate_plan(video_counts, max_videos=50, searches=0):
+        """
+        Estimasi unit kuota untuk satu rencana analisis.
+        video_counts : jumlah video per channel (channel utama + kompetitor)
+        max_videos   : batas video per channel (None = seluruh katalog)
+        """
+        n_channels = len(video_counts)
+        channels = math.ceil(n_channels / 50)
+        pages = 0
+        for total in video_counts:
+            n = total if max_videos is None else min(total, max_videos)
+            # 1 playlistItems + 1 videos per halaman 50 video (minimal 1 halaman)
+            pages += max(math.ceil(n / 50), 1)
+        return {
+            'search': searches * QUOTA_COSTS['search'],
+            'channels': channels * QUOTA_COSTS['channels'],
+            'playlistItems': pages * QUOTA_COSTS['playlistItems'],
+            'videos': pages * QUOTA_COSTS['videos'],
+            'total': searches * QUOTA_COSTS['search'] + channels + 2 * pages,
+        }
+
+    def fit_max_videos(self, video_counts, max_videos=50):
+        """
+        Turunkan batas video per channel sampai estimasi muat di sisa kuota.
+        Returns 0 jika satu halaman (50 video) per channel pun tidak muat.
+        """
+        remaining = self.remaining
+        while self.estimate_plan(video_counts, max_videos)['total'] > remaining:
+            if max_videos is None:
+                max_videos = max(video_counts or [50])
+            if max_videos <= 50:
+                return 0
+            max_videos = max((max_videos // 2) // 50 * 50, 50)
+        return max_videos
@@ -0,0 +1,230 @@
+import datetime
+import os
+import re
+import threading
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Skema kolumnar ringkas: video_id di-dictionary-encode saat dibaca, waktu per detik
+SNAPSHOT_SCHEMA = pa.schema([
+    ('video_id', pa.string()),
+    ('snapshot_time', pa.timestamp('s', tz='UTC')),
+    ('view_count', pa.uint64()),
+    ('like_count', pa.uint32()),
+    ('comment_count', pa.uint32()),
+])
+COUNT_COLS = ['view_count', 'like_count', 'comment_count']
+
+
+class SnapshotStore:
+    """
+    Penyimpanan time-series statistik video (append-only, Parquet).
+    Layout partisi: <root>/channel=<id>/date=<YYYY-MM-DD>/part-<waktu>-<uuid>.parquet
+    Setiap append menulis file baru (tanpa menulis ulang data lama); partisi tanggal
+    yang sudah lewat digabung menjadi satu file saat append berikutnya (compact).
+    Pembacaan memakai memory-map dan hanya membuka partisi channel/tanggal yang diminta.
+    """
+    def __init__(self, root=".cache/snapshots"):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def _safe(value):
+        return re.sub(r"[^A-Za-z0-9_-]", "_", value)
+
+    def _partition_dir(self, channel_id, date):
+        return os.path.join(self.root, f"channel={self._safe(channel_id)}", f"date={date.isoformat()}")
+
+    #==========================================================
+    # TULIS
+    #==========================================================
+    def append(self, channel_id, df, snapshot_time=None):
+        """
+        Simpan snapshot (video_id, view_count, like_count, comment_count) dari DataFrame fetch_videos.
+        Partisi channel ini dengan tanggal sebelum snapshot_time yang masih terdiri dari
+        beberapa file ikut di-compact (tidak akan bertambah lagi).
+        Returns: path file yang ditulis (None jika df kosong)
+        """
+        if df is None or df.empty:
+            return None
+        snapshot_time = pd.Timestamp(snapshot_time or datetime.datetime.now(datetime.timezone.utc))
+        if snapshot_time.tzinfo is None:
+            snapshot_time = snapshot_time.tz_localize('UTC')
+        snapshot_time = snapshot_time.tz_convert('UTC').floor('s')
+
+        counts = {col: np.clip(df[col].to_numpy(dtype=np.int64), 0, None) for col in COUNT_COLS}
+        table = pa.table({
+            'video_id': pa.array(df['video_id'].astype(str).to_numpy(), pa.string()),
+            'snapshot_time': pa.array(np.full(len(df), snapshot_time.value // 10 ** 9, dtype=np.int64),
+                                      pa.timestamp('s', tz='UTC')),
+            'view_count': pa.array(counts['view_count'].astype(np.uint64)),
+            'like_count': pa.array(np.minimum(counts['like_count'], 2 ** 32 - 1).astype(np.uint32)),
+            'comment_count': pa.array(np.minimum(counts['comment_count'], 2 ** 32 - 1).astype(np.uint32)),
+        }, schema=SNAPSHOT_SCHEMA)
+
+        directory = self._partition_dir(channel_id, snapshot_time.date())
+        name = f"part-{snapshot_time.strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+        path = os.path.join(directory, name)
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            # Tulis ke file sementara lalu rename agar pembaca tidak melihat file setengah jadi
+            pq.write_table(table, path + '.tmp', compression='zstd')
+            os.replace(path + '.tmp', path)
+        self.compact_before(channel_id, snapshot_time.date())
+        return path
+
+    #==========================================================
+    # BACA
+    #==========================================================
+    def channels(self):
+        return sorted(name.split('=', 1)[1] for name in os.listdir(self.root) if name.startswith('channel='))
+
+    def _files(self, channel_ids=None, since=None, until=None):
+        """File Parquet di partisi yang lolos filter channel & tanggal (pruning lewat nama folder)"""
+        channel_ids = self.channels() if channel_ids is None else [self._safe(c) for c in channel_ids]
+        since_date = since.date().isoformat() if since is not None else None
+        until_date = until.date().isoformat() if until is not None else None
+        for channel_id in channel_ids:
+            channel_dir = os.path.join(self.root, f"channel={channel_id}")
+            if not os.path.isdir(channel_dir):
+                continue
+            for date_dir in sorted(os.listdir(channel_dir)):
+                date = date_dir.split('=', 1)[-1]
+                if (since_date and date < since_date) or (until_date and date > until_date):
+                    continue
+                directory = os.path.join(channel_dir, date_dir)
+                for name in sorted(os.listdir(directory)):
+                    if name.endswith('.parquet'):
+                        yield channel_id, os.path.join(directory, name)
+
+    def read_table(self, channel_ids=None, since=None, until=None, video_ids=None):
+        """pyarrow.Table snapshot (+ kolom channel_id), dibaca dengan memory-map"""
+        since, until = _utc(since), _utc(until)
+        tables = []
+        # Lock: compact tidak boleh menghapus file di antara daftar file dan pembacaannya
+        with self._lock:
+            for channel_id, path in self._files(channel_ids, since, until):
+                table = pq.read_table(path, memory_map=True, read_dictionary=['video_id'])
+                tables.append(table.append_column(
+                    'channel_id', pa.DictionaryArray.from_arrays(pa.array(np.zeros(len(table), dtype=np.int32)),
+                                                                 pa.array([channel_id]))
+                ))
+        if not tables:
+            return pa.table({**{f.name: pa.array([], f.type) for f in SNAPSHOT_SCHEMA},
+                             'channel_id': pa.array([], pa.dictionary(pa.int32(), pa.string()))})
+        table = pa.concat_tables(tables, promote_options='permissive').unify_dictionaries()
+
+        ts = table['snapshot_time']
+        conditions = []
+        if since is not None:
+            conditions.append(pc.greater_equal(ts, pa.scalar(since.to_pydatetime(), ts.type)))
+        if until is not None:
+            conditions.append(pc.less_equal(ts, pa.scalar(until.to_pydatetime(), ts.type)))
+        if video_ids is not None:
+            ids = pa.array([str(v) for v in video_ids], pa.string())
+            conditions.append(pc.is_in(table['video_id'].cast(pa.string()), value_set=ids))
+        mask = None
+        for cond in conditions:
+            mask = cond if mask is None else pc.and_(mask, cond)
+        return table.filter(mask) if mask is not None else table
+
+    def read(self, channel_ids=None, since=None, until=None, video_ids=None):
+        """DataFrame snapshot; video_id & channel_id sebagai kategori, hitungan tetap unsigned"""
+        return self.read_table(channel_ids, since, until, video_ids).to_pandas()
+
+    #==========================================================
+    # QUERY PERTUMBUHAN
+    #==========================================================
+    def velocity(self, channel_ids=None, window_days=7, now=None, video_ids=None):
+        """
+        Laju pertumbuhan per video dari snapshot tertua & terbaru dalam jendela waktu.
+        Returns: DataFrame (index video_id) dengan kolom
+            first_time, last_time, elapsed_days, view_delta, views_per_day, likes_per_day, comments_per_day
+        Video dengan satu snapshot saja memiliki laju NaN.
+        """
+        now = _utc(now) if now is not None else pd.Timestamp.now(tz='UTC')
+        df = self.read(channel_ids, since=now - pd.Timedelta(days=window_days), until=now, video_ids=video_ids)
+        columns = ['first_time', 'last_time', 'elapsed_days', 'view_delta',
+                   'views_per_day', 'likes_per_day', 'comments_per_day']
+        if df.empty:
+            return pd.DataFrame(columns=columns, index=pd.Index([], name='video_id'))
+
+        df['video_id'] = df['video_id'].astype(str)
+        df = df.sort_values(['video_id', 'snapshot_time'], kind='stable')
+        grouped = df.groupby('video_id', sort=False)
+        first, last = grouped.head(1).set_index('video_id'), grouped.tail(1).set_index('video_id')
+
+        elapsed = (last['snapshot_time'] - first['snapshot_time']).dt.total_seconds().to_numpy() / 86400
+        result = pd.DataFrame({
+            'first_time': first['snapshot_time'],
+            'last_time': last['snapshot_time'],
+            'elapsed_days': elapsed,
+        }, index=first.index)
+        valid = elapsed > 0
+        for col, out in (('view_count', 'views_per_day'), ('like_count', 'likes_per_day'),
+                         ('comment_count', 'comments_per_day')):
+            # Hitungan bisa turun (spam dihapus) -> selisih dihitung sebagai bilangan bertanda
+            delta = last[col].to_numpy(dtype=np.int64) - first[col].to_numpy(dtype=np.int64)
+            if col == 'view_count':
+                result['view_delta'] = delta
+            rate = np.full(len(delta), np.nan)
+            np.divide(delta, elapsed, out=rate, where=valid)
+            result[out] = rate
+        return result[columns]
+
+    def views_per_day(self, channel_id, df, window_days=7, now=None):
+        """Kolom kriteria pertumbuhan untuk df (urutan sama); 0 jika riwayat snapshot belum cukup"""
+        velocity = self.velocity([channel_id], window_days=window_days, now=now, video_ids=df['video_id'])
+        rate = df['video_id'].map(velocity['views_per_day']).astype(float)
+        return rate.fillna(0).clip(lower=0).to_numpy()
+
+    #==========================================================
+    # PERAWATAN
+    #==========================================================
+    def compact(self, channel_id, date):
+        """Gabungkan file-file kecil satu partisi (channel, tanggal) menjadi satu file"""
+        directory = self._partition_dir(channel_id, pd.Timestamp(date).date())
+        with self._lock:
+            paths = sorted(os.path.join(directory, n) for n in os.listdir(directory) if n.endswith('.parquet'))
+            if len(paths) < 2:
+                return paths[0] if paths else None
+            table = pa.concat_tables([pq.read_table(p, memory_map=True, schema=SNAPSHOT_SCHEMA) for p in paths])
+            table = table.sort_by([('snapshot_time', 'ascending'), ('video_id', 'ascending')])
+            target = os.path.join(directory, f"part-compact-{uuid.uuid4().hex[:8]}.parquet")
+            pq.write_table(table, target + '.tmp', compression='zstd')
+            os.replace(target + '.tmp', target)
+            for p in paths:
+                os.remove(p)
+        return target
+
+    def compact_before(self, channel_id, date):
+        """
+        Compact semua partisi channel dengan tanggal < date yang berisi lebih dari satu file.
+        Returns: jumlah partisi yang digabung
+        """
+        channel_dir = os.path.join(self.root, f"channel={self._safe(channel_id)}")
+        if not os.path.isdir(channel_dir):
+            return 0
+        cutoff = f"date={pd.Timestamp(date).date().isoformat()}"
+        compacted = 0
+        for date_dir in sorted(os.listdir(channel_dir)):
+            if date_dir >= cutoff:
+                continue
+            directory = os.path.join(channel_dir, date_dir)
+            if sum(n.endswith('.parquet') for n in os.listdir(directory)) > 1:
+                self.compact(channel_id, date_dir.split('=', 1)[1])
+                compacted += 1
+        return compacted
+
+
+def _utc(ts):
+    if ts is None:
+        return None
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
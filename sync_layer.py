@@ -0,0 +1,58 @@
+import json
+import os
+import re
+import threading
+
+import pandas as pd
+
+
+class ChannelStore:
+    """
+    Dataset video per channel yang disimpan di disk untuk sinkronisasi inkremental.
+    Per playlist uploads: <id>.pkl (DataFrame hasil fetch_videos) + <id>.json (metadata):
+        last_video_id : upload terbaru yang sudah tersimpan
+        synced_at     : waktu sinkronisasi terakhir (ISO, UTC)
+        depth         : batas video saat dataset dibuat (None = seluruh katalog)
+    """
+    def __init__(self, root=".cache/channels"):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, playlist_id, ext):
+        # ID YouTube aman sebagai nama file, tetap disaring untuk jaga-jaga
+        return os.path.join(self.root, re.sub(r"[^A-Za-z0-9_-]", "_", playlist_id) + ext)
+
+    def load(self, playlist_id):
+        """Returns: (DataFrame, meta) atau (None, None) jika belum pernah disimpan / rusak"""
+        try:
+            with open(self._path(playlist_id, '.json')) as f:
+                meta = json.load(f)
+            df = pd.read_pickle(self._path(playlist_id, '.pkl'))
+        except (OSError, ValueError, EOFError):
+            return None, None
+        return df, meta
+
+    def save(self, playlist_id, df, meta):
+        # Tulis ke file sementara lalu rename (atomik) agar pembacaan paralel tidak melihat file setengah jadi
+        with self._lock:
+            for ext, write in (('.pkl', lambda p: df.to_pickle(p)),
+                               ('.json', lambda p: _write_json(p, meta))):
+                path = self._path(playlist_id, ext)
+                write(path + '.tmp')
+                os.replace(path + '.tmp', path)
+
+    def clear(self, playlist_id=None):
+        names = os.listdir(self.root) if playlist_id is None else [
+            os.path.basename(self._path(playlist_id, ext)) for ext in ('.pkl', '.json')
+        ]
+        for name in names:
+            try:
+                os.remove(os.path.join(self.root, name))
+            except OSError:
+                pass
+
+
+def _write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f)
@@ -0,0 +1,34 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Modul aplikasi ada di root repo (bukan paket)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_layer import COUNT_DTYPES, DAY_DTYPE  # noqa: E402
+
+
+def make_videos(n, seed=0, prefix='v', views_scale=10 ** 6):
+    """DataFrame video sintetis dengan kolom & dtype seperti DataManager._build_video_frame"""
+    rng = np.random.default_rng(seed)
+    published = pd.Series(pd.date_range('2024-01-01', periods=n, freq='37min', tz='Asia/Jakarta'))
+    df = pd.DataFrame({
+        'video_id': [f'{prefix}{i}' for i in range(n)],
+        'title': [f'judul {i % 7} video {i}' for i in range(n)],
+        'published_at': published,
+        'view_count': rng.integers(0, views_scale, n).astype(COUNT_DTYPES['view_count']),
+        'like_count': rng.integers(0, 10 ** 4, n).astype(COUNT_DTYPES['like_count']),
+        'comment_count': rng.integers(0, 10 ** 3, n).astype(COUNT_DTYPES['comment_count']),
+        'views_per_day': rng.random(n) * 100,
+    })
+    df['day_name'] = pd.Categorical.from_codes(published.dt.dayofweek, dtype=DAY_DTYPE)
+    df['hour'] = published.dt.hour.astype(np.int8)
+    return df
+
+
+@pytest.fixture
+def videos():
+    return make_videos(3000)
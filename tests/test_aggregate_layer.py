@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from aggregate_layer import AggregateCube
+from model_layer import CRITERIA, GROWTH_CRITERION, ScoringSession
+
+CRITERIA_5 = CRITERIA + [GROWTH_CRITERION]
+WEIGHTS = {'views': 0.3, 'likes': 0.2, 'comments': 0.2, 'er': 0.2, 'growth': 0.1}
+
+
+@pytest.fixture
+def session(videos):
+    return ScoringSession(videos, CRITERIA_5)
+
+
+def test_heatmap_matches_pivot_table(session):
+    cube = AggregateCube.from_frame(session.df, CRITERIA_5)
+    df = session.df.assign(preference_score=session.scores(WEIGHTS))
+    for metric in ['view_count', 'engagement_rate', 'preference_score']:
+        expected = df.pivot_table(index='day_name', columns='hour', values=metric, aggfunc='mean',
+                                  observed=False).reindex(columns=range(24)).fillna(0)
+        np.testing.assert_allclose(cube.heatmap(metric, WEIGHTS).to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+
+def test_day_means_corr_and_describe_match_pandas(session):
+    cube = AggregateCube.from_frame(session.df, CRITERIA_5)
+    df = session.df
+    expected_days = df.groupby('day_name', observed=False)['view_count'].mean()
+    np.testing.assert_allclose(cube.day_means('view_count').to_numpy(), expected_days.to_numpy(), rtol=1e-12)
+    assert cube.corr('view_count', 'engagement_rate') == pytest.approx(df['view_count'].corr(df['engagement_rate']))
+
+    cols = ['view_count', 'like_count', 'engagement_rate']
+    expected = df[cols].astype(float).describe().loc[['count', 'mean', 'std', 'min', 'max']]
+    np.testing.assert_allclose(cube.describe(cols).to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+
+def test_add_in_parts_equals_single_build(session):
+    df = session.df
+    whole = AggregateCube.from_frame(df, CRITERIA_5)
+    parts = AggregateCube.from_frame(df.iloc[:1000], CRITERIA_5).add(df.iloc[1000:])
+    np.testing.assert_allclose(parts.heatmap('preference_score', WEIGHTS), whole.heatmap('preference_score', WEIGHTS))
+    np.testing.assert_allclose(parts.describe(), whole.describe())
@@ -0,0 +1,44 @@
+import os
+
+from streamlit.testing.v1 import AppTest
+
+from youtube_stub import SyntheticCatalog, running_stub
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app5.py')
+
+
+def click(at, label):
+    next(b for b in at.sidebar.button if b.label == label).click()
+    return at.run()
+
+
+def main_card(at):
+    return next(m.value for m in at.markdown if 'CHANNEL UTAMA' in m.value)
+
+
+def test_positioning_card_follows_analysed_channel(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # store & cache default di .cache/ direktori kerja
+    with running_stub(n_channels=4, videos_per_channel=60) as (url, _):
+        monkeypatch.setenv('YT_API_BASE_URL', url)
+        at = AppTest.from_file(APP, default_timeout=60).run()
+        at.sidebar.text_input[0].input('stub')
+        at.sidebar.text_input[1].input('game')
+        at = click(at, "🔍 Cari Utama")
+        select = at.sidebar.selectbox(key='main_select')
+        assert len(select.options) >= 2
+        at = click(at, "🚀 Analisis Channel")
+        assert not at.exception
+
+        analysed = at.session_state['analysis']['main_info']
+        subs = int(analysed['statistics']['subscriberCount'])
+        assert f"{subs:,}" in main_card(at)
+
+        # Ganti pilihan tanpa klik Analisis: hasil (termasuk kartu positioning) tetap milik channel yang dianalisis
+        other = next(o for o in select.options if o != select.value)
+        at.sidebar.selectbox(key='main_select').select(other).run()
+        assert at.session_state['analysis']['main_info']['id'] == analysed['id']
+        other_subs = next(int(SyntheticCatalog(4, 60).channel_item(i)['statistics']['subscriberCount'])
+                          for i in range(4) if SyntheticCatalog(4, 60).channel_item(i)['snippet']['title'] == other)
+        assert other_subs != subs
+        assert f"{subs:,}" in main_card(at)
+        assert f"{other_subs:,}" not in main_card(at)
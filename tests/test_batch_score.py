@@ -0,0 +1,43 @@
+from batch_score import Checkpoint, batch_timeout, run
+from cache_layer import MemoryCache
+from data_layer import DataManager
+from quota_layer import QuotaManager
+from sync_layer import ChannelStore
+from youtube_stub import SyntheticCatalog, running_stub
+
+WEIGHTS = {'views': 0.3, 'likes': 0.25, 'comments': 0.2, 'er': 0.25}
+
+
+def make_dm(root, url):
+    dm = DataManager('key', cache=MemoryCache(), quota=QuotaManager('key', path=str(root / 'quota.sqlite')),
+                     base_url=url, store=ChannelStore(str(root / 'channels')))
+    dm.update_key('key')
+    return dm
+
+
+def test_batch_timeout_scales_with_planned_pages():
+    # 1 channel + 2 x ceil(n/50) halaman per channel
+    assert batch_timeout([50, 50], 50, workers=2, request_timeout=10) == 3 * 10
+    assert batch_timeout([1000, 50], None, workers=4, request_timeout=10) == 41 * 10
+    assert batch_timeout([1000] * 8, None, workers=4, request_timeout=1) == 2 * 41
+
+
+def test_truncated_fetch_is_not_checkpointed(tmp_path):
+    with running_stub(n_channels=2, videos_per_channel=300) as (url, server):
+        ids = [SyntheticCatalog.channel_id(i) for i in range(2)]
+        checkpoint = Checkpoint(str(tmp_path / 'ckpt'), {'test': 1})
+
+        # Kuota stub habis di tengah pagination -> tidak ada channel yang dianggap selesai
+        server.state.daily_quota = 8
+        completed, _ = run(make_dm(tmp_path / 'a', url), ids, WEIGHTS, checkpoint, limit=None,
+                           processes=0, log=lambda *a: None)
+        assert completed == 0 and checkpoint.done() == set()
+
+        server.state.daily_quota = None
+        dm = make_dm(tmp_path / 'b', url)
+        completed, _ = run(dm, ids, WEIGHTS, checkpoint, limit=None, processes=0, log=lambda *a: None)
+        assert completed == 2 and checkpoint.done() == set(ids)
+        result = checkpoint.merge(ids)
+        for cid in ids:
+            expected = int(dm.get_channel_info(cid)['statistics']['videoCount'])
+            assert (result['channel_id'] == cid).sum() == expected
@@ -0,0 +1,53 @@
+import cache_layer
+from cache_layer import MemoryCache, ResponseCache
+
+PARAMS = {'part': 'statistics', 'id': 'abc'}
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_endpoint_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_layer.time, 'time', clock)
+    cache = MemoryCache(ttls={'videos': 60})
+    cache.set('videos', PARAMS, {'items': [1]})
+
+    clock.now += 59
+    assert cache.get('videos', PARAMS) == {'items': [1]}
+    clock.now += 2
+    assert cache.get('videos', PARAMS) is None
+    # Mode hemat kuota tetap boleh memakai entri kedaluwarsa
+    assert cache.get('videos', PARAMS, allow_stale=True) == {'items': [1]}
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_key_ignores_param_order_and_separates_namespaces():
+    assert ResponseCache.make_key('videos', {'a': 1, 'b': 2}) == ResponseCache.make_key('videos', {'b': 2, 'a': 1})
+    cache = MemoryCache()
+    cache.set('search', PARAMS, {'items': ['stub']}, namespace='http://127.0.0.1:8765/')
+    assert cache.get('search', PARAMS) is None
+    assert cache.get('search', PARAMS, namespace='http://127.0.0.1:8765/') == {'items': ['stub']}
+
+
+def test_eviction_drops_least_recently_accessed(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_layer.time, 'time', clock)
+    cache = MemoryCache(max_entries=2)
+    for i in range(2):
+        clock.now += 1
+        cache.set('videos', {'id': i}, {'i': i})
+    clock.now += 1
+    assert cache.get('videos', {'id': 0}) == {'i': 0}  # id 1 kini paling lama tidak diakses
+    clock.now += 1
+    cache.set('videos', {'id': 2}, {'i': 2})
+
+    assert len(cache) == 2
+    assert cache.get('videos', {'id': 1}) is None
+    assert cache.get('videos', {'id': 0}) == {'i': 0}
+    assert cache.get('videos', {'id': 2}) == {'i': 2}
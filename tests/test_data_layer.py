@@ -0,0 +1,142 @@
+import time
+
+import pandas as pd
+import pytest
+
+from cache_layer import MemoryCache
+from data_layer import DataManager, IncompleteFetch
+from quota_layer import QuotaManager
+from snapshot_layer import SnapshotStore
+from sync_layer import ChannelStore
+from youtube_stub import SyntheticCatalog, running_stub
+
+
+@pytest.fixture
+def stub():
+    with running_stub(n_channels=2, videos_per_channel=120) as (url, server):
+        yield url, server
+
+
+def make_dm(tmp_path, url, **kwargs):
+    dm = DataManager('key', cache=MemoryCache(), quota=QuotaManager('key', path=str(tmp_path / 'quota.sqlite')),
+                     base_url=url, snapshots=SnapshotStore(str(tmp_path / 'snapshots')), **kwargs)
+    dm.update_key('key')
+    return dm
+
+
+def snapshot_times(dm, channel_id):
+    return dm.snapshots.read([channel_id])['snapshot_time'].value_counts().sort_index()
+
+
+@pytest.mark.parametrize('with_store', [False, True])
+def test_cached_stats_are_not_recorded_as_snapshots(tmp_path, stub, with_store):
+    url, server = stub
+    store = ChannelStore(str(tmp_path / 'channels')) if with_store else None
+    dm = make_dm(tmp_path, url, store=store)
+    channel_id = SyntheticCatalog.channel_id(0)
+
+    (info, df), = dm.fetch_channels([channel_id], limit=100)
+    assert not df.empty
+    first = snapshot_times(dm, channel_id)
+    assert first.tolist() == [len(df)]
+
+    # Respons videos masih dalam TTL cache -> tidak ada request baru, tidak ada snapshot baru
+    requests = server.state.requests
+    dm.fetch_channels([channel_id], limit=100)
+    assert snapshot_times(dm, channel_id).equals(first)
+    if not with_store:
+        assert server.state.requests == requests
+
+
+def test_live_refetch_is_recorded(tmp_path, stub):
+    url, _ = stub
+    dm = make_dm(tmp_path, url)
+    channel_id = SyntheticCatalog.channel_id(1)
+    (_, fetched), = dm.fetch_channels([channel_id], limit=50)
+    dm.cache.clear()
+    dm.fetch_channels([channel_id], limit=50)
+    df = dm.snapshots.read([channel_id])
+    assert len(df) == 2 * len(fetched)
+    assert df.groupby('video_id', observed=True).size().eq(2).all()
+    assert pd.api.types.is_datetime64_any_dtype(df['snapshot_time'])
+
+
+@pytest.fixture
+def big_stub():
+    with running_stub(n_channels=1, videos_per_channel=300) as (url, server):
+        yield url, server
+
+
+def test_fetch_videos_strict_reports_truncated_catalog(tmp_path, big_stub):
+    url, server = big_stub
+    dm = make_dm(tmp_path, url)
+    info = dm.get_channel_info(SyntheticCatalog.channel_id(0))
+    playlist = info['contentDetails']['relatedPlaylists']['uploads']
+    total = int(info['statistics']['videoCount'])
+    assert total > 150
+    server.state.daily_quota = 6  # kuota stub habis sebelum halaman terakhir
+
+    # Best-effort (UI): hasil terpotong tanpa error
+    assert len(dm.fetch_videos(playlist, limit=None)) == 100
+
+    # 403 quotaExceeded menandai ledger habis -> DataManager baru dengan ledger sendiri
+    server.state.quota_used.clear()
+    dm = make_dm(tmp_path / 'strict', url)
+    with pytest.raises(IncompleteFetch) as exc:
+        dm.fetch_videos(playlist, limit=None, strict=True)
+    assert 0 < len(exc.value.partial) < total
+    assert exc.value.__cause__ is not None
+
+    server.state.daily_quota = None
+    dm = make_dm(tmp_path / 'lifted', url)
+    assert len(dm.fetch_videos(playlist, limit=None, strict=True)) == total
+
+
+def test_sync_does_not_store_truncated_full_fetch(tmp_path, big_stub):
+    url, server = big_stub
+    store = ChannelStore(str(tmp_path / 'channels'))
+    dm = make_dm(tmp_path, url, store=store)
+    info = dm.get_channel_info(SyntheticCatalog.channel_id(0))
+    playlist = info['contentDetails']['relatedPlaylists']['uploads']
+    total = int(info['statistics']['videoCount'])
+
+    server.state.daily_quota = 6
+    partial = dm.sync_videos(playlist, limit=None)
+    assert 0 < len(partial) < total
+    assert store.load(playlist) == (None, None)
+
+    server.state.daily_quota = None
+    dm = make_dm(tmp_path / 'lifted', url, store=store)
+    assert len(dm.sync_videos(playlist, limit=None)) == total
+    df, meta = store.load(playlist)
+    assert len(df) == total and meta['depth'] is None
+
+
+def test_sync_with_small_limit_keeps_full_store_contiguous(tmp_path, big_stub):
+    url, _ = big_stub
+    store = ChannelStore(str(tmp_path / 'channels'))
+    dm = make_dm(tmp_path, url, store=store)
+    info = dm.get_channel_info(SyntheticCatalog.channel_id(0))
+    playlist = info['contentDetails']['relatedPlaylists']['uploads']
+    full = dm.sync_videos(playlist, limit=None)
+
+    # 60 upload terbaru dianggap belum tersimpan (upload baru sejak sinkronisasi terakhir)
+    df, meta = store.load(playlist)
+    store.save(playlist, df.iloc[60:].reset_index(drop=True), dict(meta, last_video_id=df['video_id'].iloc[60]))
+
+    recent = dm.sync_videos(playlist, limit=50)
+    assert recent['video_id'].tolist() == full['video_id'].head(50).tolist()
+    df, meta = store.load(playlist)
+    assert df['video_id'].tolist() == full['video_id'].tolist() and meta['depth'] is None
+    assert dm.sync_videos(playlist, limit=None)['video_id'].tolist() == full['video_id'].tolist()
+
+
+def test_fetch_channels_has_no_stage_deadline_by_default(tmp_path):
+    # Setiap request jauh di bawah request_timeout, tetapi total tahap jauh di atas 4 x request_timeout
+    with running_stub(n_channels=3, videos_per_channel=300, latency=0.03) as (url, _):
+        dm = make_dm(tmp_path, url, request_timeout=0.15, max_workers=1)
+        ids = [SyntheticCatalog.channel_id(i) for i in range(3)]
+        start = time.perf_counter()
+        results = dm.fetch_channels(ids, limit=None)
+        assert time.perf_counter() - start > 4 * dm.request_timeout
+        assert all(result is not None and not result[1].empty for result in results)
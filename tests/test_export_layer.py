@@ -0,0 +1,52 @@
+import io
+import threading
+
+import pandas as pd
+
+from export_layer import ExportCache
+
+
+def frame(i=0):
+    return pd.DataFrame({'video_id': [f'v{i}', 'w'], 'view_count': [i, 2]})
+
+
+def test_read_builds_once_and_reuses_file(tmp_path):
+    cache = ExportCache(str(tmp_path), max_files=5)
+    calls = []
+
+    def frame_fn():
+        calls.append(1)
+        return frame()
+
+    first = cache.read(('k', 1), 'parquet', frame_fn)
+    second = cache.read(('k', 1), 'parquet', frame_fn)
+    assert first == second and len(calls) == 1
+    pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(first)), frame())
+
+
+def test_prune_keeps_max_files(tmp_path):
+    cache = ExportCache(str(tmp_path), max_files=3)
+    for i in range(6):
+        cache.read(('k', i), 'csv.gz', lambda i=i: frame(i))
+    assert len(list(tmp_path.iterdir())) == 3
+
+
+def test_concurrent_reads_survive_pruning(tmp_path):
+    cache = ExportCache(str(tmp_path), max_files=1)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(20):
+                key = ('k', (n + i) % 4)
+                data = cache.read(key, 'csv.gz', lambda: frame(key[1]))
+                assert data
+        except Exception as exc:  # pragma: no cover - dilaporkan lewat assert di bawah
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
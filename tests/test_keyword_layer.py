@@ -0,0 +1,21 @@
+import numpy as np
+
+from keyword_layer import KeywordIndex
+
+
+def test_bigrams_only_join_adjacent_words():
+    index = KeywordIndex(['Masak Nasi Goreng di Rumah', 'Nasi Goreng Spesial!', 'Rumah di Desa'])
+    bigrams = set(index.terms[index.is_bigram])
+    assert bigrams == {'masak nasi', 'nasi goreng', 'goreng spesial'}
+    assert 'goreng rumah' not in bigrams and 'rumah desa' not in bigrams
+    np.testing.assert_array_equal(index.lookup('nasi goreng'), [0, 1])
+
+
+def test_stats_average_metric_per_term():
+    index = KeywordIndex(['Resep Nasi Goreng', 'Resep Sambal', 'Nasi Goreng Kampung'])
+    views = np.array([100.0, 300.0, 500.0])
+    stats = index.stats({'Avg Views': views}, min_freq=2, bigrams=True).set_index('Keyword')
+    assert stats.loc['resep', 'Avg Views'] == 200
+    assert stats.loc['nasi goreng', 'Avg Views'] == 300
+    assert stats.loc['nasi goreng', 'Freq'] == 2
+    assert 'sambal' not in stats.index
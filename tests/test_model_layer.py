@@ -0,0 +1,109 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_videos
+from model_layer import (CRITERIA, GROWTH_CRITERION, PooledSession, ScoringSession, _count_inversions,
+                         decision_matrix, engagement_rate, kendall_tau, normalize_matrix, top_k_indices)
+
+WEIGHTS = {'views': 0.3, 'likes': 0.2, 'comments': 0.2, 'er': 0.2, 'growth': 0.1}
+GROWTH_CRITERIA = CRITERIA + [GROWTH_CRITERION]
+
+
+def brute_inversions(row):
+    return sum(1 for i, j in itertools.combinations(range(len(row)), 2) if row[i] > row[j])
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 7, 8, 33])
+def test_count_inversions_matches_brute_force(n):
+    rng = np.random.default_rng(n)
+    seq = np.array([rng.permutation(n) for _ in range(20)])
+    expected = [brute_inversions(row) for row in seq]
+    assert _count_inversions(seq).tolist() == expected
+
+
+def test_kendall_tau_matches_pairwise_definition():
+    rng = np.random.default_rng(1)
+    base = rng.random(40)
+    scores = rng.random((40, 5))
+    scores[:, 0] = base  # skenario identik -> tau = 1
+    taus = kendall_tau(base, scores)
+    for k in range(scores.shape[1]):
+        pairs = list(itertools.combinations(range(40), 2))
+        concordant = sum(np.sign(base[i] - base[j]) == np.sign(scores[i, k] - scores[j, k]) for i, j in pairs)
+        assert taus[k] == pytest.approx((2 * concordant - len(pairs)) / len(pairs))
+    assert taus[0] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize('k,offset', [(1, 0), (10, 0), (10, 25), (50, 190), (300, 0)])
+def test_top_k_indices_matches_stable_argsort(k, offset):
+    rng = np.random.default_rng(2)
+    scores = rng.integers(0, 20, 200).astype(float)  # banyak seri
+    expected = np.argsort(-scores, kind='stable')[offset:offset + k]
+    np.testing.assert_array_equal(top_k_indices(scores, k, offset), expected)
+
+
+def test_scoring_session_rank_matches_reference(videos):
+    session = ScoringSession(videos.copy(), GROWTH_CRITERIA)
+    ranked = session.rank(WEIGHTS)
+    X = decision_matrix(session.df, GROWTH_CRITERIA)
+    w = np.array([WEIGHTS[key] for _, key, _ in GROWTH_CRITERIA])
+    expected = normalize_matrix(X) @ w
+    np.testing.assert_allclose(ranked['preference_score'].to_numpy(), np.sort(expected)[::-1])
+    assert ranked['Rank'].tolist() == list(range(1, len(videos) + 1))
+
+
+@pytest.fixture
+def pooled_frames():
+    sizes = [400, 1, 250, 900]
+    return [(f'C{i}', make_videos(n, seed=i, prefix=f'c{i}v', views_scale=10 ** (4 + i))) for i, n in enumerate(sizes)]
+
+
+def pooled_reference(frames, normalization):
+    """Skor acuan lewat concat + groupby pandas"""
+    df = pd.concat([f.assign(channel_id=cid) for cid, f in frames], ignore_index=True)
+    df['engagement_rate'] = engagement_rate(df['view_count'], df['like_count'], df['comment_count'])
+    cols = [c[0] for c in GROWTH_CRITERIA]
+    if normalization == 'global':
+        maxima = df[cols].max()
+    else:
+        maxima = df.groupby('channel_id', sort=False)[cols].transform('max')
+    R = (df[cols].astype(float) / maxima).fillna(0)
+    df['score'] = R.to_numpy() @ np.array([WEIGHTS[key] for _, key, _ in GROWTH_CRITERIA])
+    return df
+
+
+@pytest.mark.parametrize('normalization', ['global', 'channel'])
+def test_pooled_scores_and_distribution_match_groupby(pooled_frames, normalization):
+    pooled = PooledSession(pooled_frames, GROWTH_CRITERIA)
+    ref = pooled_reference(pooled_frames, normalization)
+    np.testing.assert_allclose(pooled.scores(WEIGHTS, normalization), ref['score'].to_numpy(), atol=1e-12)
+
+    dist = pooled.distribution(WEIGHTS, normalization, top_k=50).set_index('channel_id')
+    grouped = ref.groupby('channel_id', sort=False)['score']
+    np.testing.assert_array_equal(dist['videos'], grouped.size())
+    np.testing.assert_allclose(dist['mean'], grouped.mean(), atol=1e-12)
+    np.testing.assert_allclose(dist['std'].to_numpy()[[0, 2, 3]], grouped.std().to_numpy()[[0, 2, 3]], atol=1e-9)
+    for name, q in [('min', 0), ('q1', 0.25), ('median', 0.5), ('q3', 0.75), ('max', 1)]:
+        np.testing.assert_allclose(dist[name], grouped.quantile(q), atol=1e-12)
+
+    top = ref.sort_values('score', ascending=False, kind='stable').head(50)
+    expected_top = top['channel_id'].value_counts().reindex(dist.index, fill_value=0)
+    np.testing.assert_array_equal(dist['top50'], expected_top)
+
+
+def test_pooled_rank_is_cross_channel_ordering(pooled_frames):
+    pooled = PooledSession(pooled_frames, GROWTH_CRITERIA, labels={'C0': 'Utama'})
+    ref = pooled_reference(pooled_frames, 'global').sort_values('score', ascending=False, kind='stable')
+    top = pooled.rank(WEIGHTS, k=30)
+    assert top['video_id'].tolist() == ref['video_id'].head(30).tolist()
+    assert top['channel_id'].tolist() == ref['channel_id'].head(30).tolist()
+    assert set(top.loc[top['channel_id'] == 'C0', 'channel_title']) <= {'Utama'}
+    assert len(pooled.rank(WEIGHTS)) == len(ref)
+
+
+def test_pooled_rejects_unknown_normalization(pooled_frames):
+    with pytest.raises(ValueError):
+        PooledSession(pooled_frames, GROWTH_CRITERIA).normalized('zscore')
@@ -0,0 +1,47 @@
+import pytest
+
+from quota_layer import QuotaExceeded, QuotaLedger, QuotaManager
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return QuotaLedger(str(tmp_path / 'quota.sqlite'), api_key='key-a')
+
+
+def test_reserve_accumulates_until_budget(ledger):
+    assert ledger.reserve(60, budget=100)
+    assert ledger.reserve(40, budget=100)
+    assert not ledger.reserve(1, budget=100)
+    assert ledger.used() == 100
+
+
+def test_usage_is_shared_per_key_across_instances(ledger, tmp_path):
+    ledger.reserve(30, budget=100)
+    same_key = QuotaLedger(ledger.path, api_key='key-a')
+    other_key = QuotaLedger(ledger.path, api_key='key-b')
+    assert same_key.used() == 30
+    assert other_key.used() == 0
+
+
+def test_usage_resets_on_new_pacific_day(ledger, monkeypatch):
+    monkeypatch.setattr(QuotaLedger, 'today', staticmethod(lambda: '2026-01-01'))
+    ledger.reserve(100, budget=100)
+    assert not ledger.reserve(1, budget=100)
+    monkeypatch.setattr(QuotaLedger, 'today', staticmethod(lambda: '2026-01-02'))
+    assert ledger.used() == 0
+    assert ledger.reserve(1, budget=100)
+
+
+def test_mark_exhausted_blocks_further_requests(tmp_path):
+    quota = QuotaManager('key', daily_budget=50, path=str(tmp_path / 'q.sqlite'))
+    quota.acquire('videos')
+    quota.ledger.mark_exhausted(quota.daily_budget)
+    assert quota.remaining == 0
+    with pytest.raises(QuotaExceeded):
+        quota.acquire('videos')
+
+
+def test_fit_max_videos_returns_zero_when_nothing_fits(tmp_path):
+    quota = QuotaManager('key', daily_budget=10, path=str(tmp_path / 'q.sqlite'))
+    assert quota.fit_max_videos([500, 500], 200) == 100
+    assert quota.fit_max_videos([500, 500, 500, 500, 500], 50) == 0
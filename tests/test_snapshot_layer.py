@@ -0,0 +1,38 @@
+import os
+
+import pandas as pd
+
+from snapshot_layer import SnapshotStore
+
+
+def stats(views):
+    return pd.DataFrame({
+        'video_id': ['a', 'b'],
+        'view_count': [views, views * 2],
+        'like_count': [1, 2],
+        'comment_count': [0, 1],
+    })
+
+
+def partition_files(store, channel_id='UC1'):
+    channel_dir = os.path.join(store.root, f'channel={channel_id}')
+    return {d: sorted(os.listdir(os.path.join(channel_dir, d))) for d in sorted(os.listdir(channel_dir))}
+
+
+def test_append_compacts_past_partitions_only(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    for hour in (1, 5, 9):
+        store.append('UC1', stats(100 * hour), pd.Timestamp(f'2026-03-01 0{hour}:00', tz='UTC'))
+    assert len(partition_files(store)['date=2026-03-01']) == 3
+
+    store.append('UC1', stats(2000), pd.Timestamp('2026-03-02 01:00', tz='UTC'))
+    store.append('UC1', stats(2400), pd.Timestamp('2026-03-02 05:00', tz='UTC'))
+    files = partition_files(store)
+    assert len(files['date=2026-03-01']) == 1 and files['date=2026-03-01'][0].startswith('part-compact-')
+    assert len(files['date=2026-03-02']) == 2  # hari berjalan belum di-compact
+
+    df = store.read(['UC1'])
+    assert len(df) == 10
+    velocity = store.velocity(['UC1'], window_days=7, now=pd.Timestamp('2026-03-02 06:00', tz='UTC'))
+    assert velocity.loc['a', 'view_delta'] == 2300
+    assert velocity.loc['a', 'views_per_day'] == 2300 / (28 / 24)
@@ -0,0 +1,27 @@
+from streamlit.testing.v1 import AppTest
+
+from metrics_layer import METRICS
+
+
+def pooled_ranking_app():
+    # Dijalankan AppTest di proses yang sama: sys.path pytest (root repo + tests/) berlaku
+    from conftest import make_videos
+    from model_layer import CRITERIA, PooledSession, engagement_rate
+    from ui_layer import UserInterface
+
+    frames = []
+    for i, n in enumerate([120, 80]):
+        df = make_videos(n, seed=i, prefix=f'c{i}v')
+        df['engagement_rate'] = engagement_rate(df['view_count'], df['like_count'], df['comment_count'])
+        frames.append((f'C{i}', df))
+    weights = {'views': 0.3, 'likes': 0.25, 'comments': 0.2, 'er': 0.25}
+    UserInterface().render_pooled_ranking(PooledSession(frames, CRITERIA, labels={'C0': 'Utama'}), weights)
+
+
+def test_render_pooled_ranking_is_timed():
+    METRICS.reset()
+    at = AppTest.from_function(pooled_ranking_app).run()
+    assert not at.exception
+    assert at.dataframe
+    spans = {s['name']: s for s in METRICS.snapshot()['spans']}
+    assert spans['ui.pooled_ranking']['count'] == 1
@@ -1,10 +1,24 @@
 import streamlit as st
-import plotly.express as px
+import numpy as np
 import pandas as pd
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-import io
-import re
+from data_layer import DISCOVERY_QUOTA_BUDGET, DISCOVERY_TIME_BUDGET
+from model_layer import sample_weights
+from keyword_layer import KeywordIndex
+from metrics_layer import METRICS, timed
+from export_layer import EXPORT_FORMATS, ExportCache
+
+# Kolom tabel ranking -> label tampilan
+TABLE_COLUMNS = {
+    'title': 'Judul', 'published_at': 'Waktu (WIB)', 'view_count': 'Views', 'like_count': 'Likes',
+    'comment_count': 'Komen', 'engagement_rate': 'ER (%)', 'preference_score': 'Skor V', 'Rank': 'Rank',
+}
+PAGE_SIZES = [25, 50, 100, 250, 500]
+
+
+@st.cache_resource
+def export_cache():
+    """Satu ExportCache per proses server: dipakai bersama semua sesi & rerun (lock per file ikut bersama)"""
+    return ExportCache()
 
 class UserInterface:
     def __init__(self):
@@ -15,7 +29,10 @@ class UserInterface:
         .video-title { font-size: 16px; font-weight: bold; color: #000; line-height: 1.4; word-wrap: break-word; }
         </style>
         """, unsafe_allow_html=True)
+        # File ekspor dibuat saat tombol download diklik, lalu di-cache per dataset + bobot + filter
+        self.exports = export_cache()
 
+    @timed('ui.sidebar')
     def render_sidebar(self, data_manager):
         st.sidebar.header("⚙️ Konfigurasi Sistem")
         
@@ -60,30 +77,8 @@ class UserInterface:
             with col2:
                 st.caption(f"**{target['title']}**")
             
-            # DETEKSI NICHE & KATEGORISASI
-            if api_key:
-                with st.spinner("Menganalisis channel..."):
-                    info = data_manager.get_channel_info(selected_channel_id)
-                    if info:
-                        # Niche Detection
-                        main_niche = info.get('niche_detected', 'Umum')
-                        st.session_state['detected_niche'] = main_niche
-                        
-                        # Kategorisasi Channel
-                        main_category_info = data_manager.categorize_channel(info)
-                        st.session_state['main_category'] = main_category_info
-                        
-                        # Display Badge
-                        st.sidebar.markdown(
-                            f"<div style='background-color:{main_category_info['color']}20; "
-                            f"padding:8px; border-radius:8px; border:1px solid {main_category_info['color']}; "
-                            f"text-align:center; margin:5px 0;'>"
-                            f"<strong style='color:{main_category_info['color']}'>{main_category_info['category']}</strong><br>"
-                            f"<small>{main_category_info['subs']:,} subscribers</small>"
-                            f"</div>",
-                            unsafe_allow_html=True
-                        )
-                        st.sidebar.success(f"🏷️ Niche: **{main_niche}**")
+            # Slot badge diisi setelah info semua channel diambil sekaligus
+            main_slot = st.sidebar.container()
 
         st.sidebar.divider()
 
@@ -91,6 +86,7 @@ class UserInterface:
         st.sidebar.markdown("### 3. Channel Kompetitor")
         selected_competitors = []
         competitor_categories = []
+        comp_slots = []
 
         for i in range(1, 3):  # Loop untuk 2 kompetitor
             st.sidebar.caption(f"**Kompetitor {i} (Opsional)**")
@@ -127,50 +123,131 @@ class UserInterface:
                 with col2:
                     st.caption(f"**{target['title']}**")
                 
-                # KATEGORISASI KOMPETITOR
-                if api_key:
-                    with st.spinner(f"Menganalisis kompetitor {i}..."):
-                        comp_info = data_manager.get_channel_info(comp_id)
-                        if comp_info:
-                            comp_cat = data_manager.categorize_channel(comp_info)
-                            competitor_categories.append(comp_cat)
-                            
-                            # Display Badge
-                            st.sidebar.markdown(
-                                f"<div style='background-color:{comp_cat['color']}20; "
-                                f"padding:8px; border-radius:8px; border:1px solid {comp_cat['color']}; "
-                                f"text-align:center; margin:5px 0;'>"
-                                f"<strong style='color:{comp_cat['color']}'>{comp_cat['category']}</strong><br>"
-                                f"<small>{comp_cat['subs']:,} subscribers</small>"
-                                f"</div>",
-                                unsafe_allow_html=True
-                            )
+                comp_slots.append((comp_id, st.sidebar.container()))
             
             if i < 2:
                 st.sidebar.divider()
 
+        # DETEKSI NICHE & KATEGORISASI (1 request channels().list untuk semua channel)
+        infos = {}
+        if api_key and (selected_channel_id or comp_slots):
+            with st.spinner("Menganalisis channel..."):
+                infos = data_manager.get_channels_info([selected_channel_id] + [cid for cid, _ in comp_slots])
+
+            info = infos.get(selected_channel_id)
+            if info:
+                # Niche Detection
+                main_niche = info.get('niche_detected', 'Umum')
+                st.session_state['detected_niche'] = main_niche
+                
+                # Kategorisasi Channel
+                main_category_info = data_manager.categorize_channel(info)
+                st.session_state['main_category'] = main_category_info
+                
+                # Display Badge
+                main_slot.markdown(self._category_badge(main_category_info), unsafe_allow_html=True)
+                main_slot.success(f"🏷️ Niche: **{main_niche}**")
+
+            for comp_id, slot in comp_slots:
+                comp_info = infos.get(comp_id)
+                if comp_info:
+                    comp_cat = data_manager.categorize_channel(comp_info)
+                    competitor_categories.append(comp_cat)
+                    slot.markdown(self._category_badge(comp_cat), unsafe_allow_html=True)
+
+            # KOMPETITOR OTOMATIS dari niche channel utama (info kandidat sudah lengkap)
+            if info:
+                for comp_id, comp_info, comp_cat in self._render_auto_competitors(data_manager, info):
+                    if comp_id not in selected_competitors:
+                        selected_competitors.append(comp_id)
+                        competitor_categories.append(comp_cat)
+                        infos[comp_id] = comp_info
+
         # Simpan ke session state
         st.session_state['competitor_categories'] = competitor_categories
         st.sidebar.divider()
         
-        # 4. BOBOT
+        # 4. CAKUPAN DATA
+        st.sidebar.markdown("### 4. Cakupan Video")
+        depth = st.sidebar.selectbox(
+            "Jumlah video yang dianalisis", ["50 terbaru", "200 terbaru", "500 terbaru", "Semua"],
+            help="'Semua' menelusuri seluruh playlist upload (biaya 2 unit kuota per 50 video)."
+        )
+        st.session_state['max_videos'] = None if depth == "Semua" else int(depth.split()[0])
+        st.sidebar.divider()
+
+        # 5. BOBOT
         st.sidebar.header("⚖️ Bobot SAW")
         w_v = st.sidebar.slider("Views (C1)", 0.0, 1.0, 0.30)
         w_l = st.sidebar.slider("Likes (C2)", 0.0, 1.0, 0.25)
         w_c = st.sidebar.slider("Comments (C3)", 0.0, 1.0, 0.20)
         w_e = st.sidebar.slider("Engagement Rate (C4)", 0.0, 1.0, 0.25)
+        w_g = st.sidebar.slider("Pertumbuhan Views/Hari (C5)", 0.0, 1.0, 0.0,
+                                help="Dari snapshot statistik 7 hari terakhir; butuh minimal 2 kali analisis.")
         
-        if round(w_v+w_l+w_c+w_e, 2) != 1.0: 
+        if round(w_v+w_l+w_c+w_e+w_g, 2) != 1.0: 
             st.sidebar.error("⚠️ Total Bobot harus 1.0")
         else: 
             st.sidebar.success("✅ Bobot Valid")
         
         st.sidebar.divider()
+
+        # Estimasi biaya sebelum analisis dijalankan (pre-flight)
+        plan_counts = [int(infos[cid]['statistics'].get('videoCount', 0))
+                       for cid in [selected_channel_id] + selected_competitors if cid in infos]
+        st.session_state['plan_video_counts'] = plan_counts
+        if plan_counts:
+            plan = data_manager.quota.estimate_plan(plan_counts, st.session_state['max_videos'])
+            st.sidebar.caption(f"Estimasi Biaya Analisis: **{plan['total']}** units")
+
+        quota = data_manager.quota
         st.sidebar.caption(f"Estimasi Kuota: **{data_manager.used_quota}** units")
-        st.sidebar.progress(min(data_manager.used_quota/10000, 1.0))
+        st.sidebar.caption(f"Kuota Hari Ini (per API key): **{quota.used_today:,}** / {quota.daily_budget:,} units")
+        st.sidebar.progress(min(quota.used_today/quota.daily_budget, 1.0))
+        if quota.is_short():
+            st.sidebar.warning("⚠️ Kuota menipis: data cache dipakai lebih dulu & pencarian dibatasi.")
+        st.sidebar.caption(f"Cache: **{data_manager.cache_hits}** hit / **{data_manager.cache_misses}** miss")
+
+        return api_key, selected_channel_id, selected_competitors, {'views': w_v, 'likes': w_l, 'comments': w_c, 'er': w_e, 'growth': w_g}
+
+    def _render_auto_competitors(self, data_manager, main_info):
+        """Expander penemuan kompetitor; returns list (channel_id, info, kategori) yang dipilih"""
+        with st.sidebar.expander("🤖 Kompetitor Otomatis (dari Niche)"):
+            st.caption(f"Niche: **{main_info.get('niche_detected', 'Umum')}** · maks. "
+                       f"{DISCOVERY_QUOTA_BUDGET} unit kuota & {DISCOVERY_TIME_BUDGET:.0f} detik per pencarian")
+            size = st.number_input("Jumlah kompetitor", 1, 10, 3, key="auto_comp_size")
+            if st.button("🔎 Temukan Kompetitor", key="btn_auto_comp"):
+                with st.spinner("Mencari channel dengan niche & ukuran serupa..."):
+                    shortlist, report = data_manager.discover_competitors(main_info, size=int(size))
+                st.session_state['auto_comp'] = (main_info['id'], shortlist, report)
 
-        return api_key, selected_channel_id, selected_competitors, {'views': w_v, 'likes': w_l, 'comments': w_c, 'er': w_e}
+            found = st.session_state.get('auto_comp')
+            if not found or found[0] != main_info['id']:
+                return []
+            _, shortlist, report = found
+            st.caption(f"{report['matched']} dari {report['candidates']} kandidat selevel · "
+                       f"{report['quota_used']} unit · {report['elapsed']:.1f} s")
+            if report['stopped']:
+                st.warning("Pencarian dihentikan: anggaran " + ("kuota" if report['stopped'] == 'quota' else "waktu") + " habis.")
+            if not shortlist:
+                st.info("Belum ada kompetitor dengan ukuran serupa.")
+                return []
+            labels = {c['channel_id']: f"{c['title']} · {c['category']['subs']:,} subs" for c in shortlist}
+            picked = st.multiselect("Pakai sebagai kompetitor:", list(labels), default=list(labels),
+                                    format_func=labels.get, key="auto_comp_pick")
+            return [(c['channel_id'], c['info'], c['category']) for c in shortlist if c['channel_id'] in picked]
 
+    def _category_badge(self, cat):
+        return (
+            f"<div style='background-color:{cat['color']}20; "
+            f"padding:8px; border-radius:8px; border:1px solid {cat['color']}; "
+            f"text-align:center; margin:5px 0;'>"
+            f"<strong style='color:{cat['color']}'>{cat['category']}</strong><br>"
+            f"<small>{cat['subs']:,} subscribers</small>"
+            f"</div>"
+        )
+
+    @timed('ui.overview')
     def render_overview(self, channel_info, df):
         st.markdown("### 📊 Overview Channel")
         niche = channel_info.get('niche_detected', 'Umum')
@@ -192,6 +269,7 @@ class UserInterface:
         c4.metric("Rata-rata ER", f"{df['engagement_rate'].mean():.2f}%")
         st.divider()
 
+    @timed('ui.category_comparison')
     def render_category_comparison(self, main_cat, comp_cats):
         st.markdown("### 🎯 Analisis Positioning & Strategi")
         
@@ -297,9 +375,11 @@ class UserInterface:
         df_benchmark = pd.DataFrame(benchmark_data)
         st.dataframe(df_benchmark, use_container_width=True, hide_index=True)
 
+    @timed('ui.comparison')
     def render_comparison(self, main_info, main_df, comp_data_list):
         if not comp_data_list: 
             return
+        import plotly.express as px  # lazy: hanya saat grafik dirender
         st.markdown("### ⚔️ Analisis Komparasi")
         
         comp_summary = [{
@@ -327,52 +407,139 @@ class UserInterface:
             st.plotly_chart(px.bar(df_comp, x="Nama Channel", y="Avg ER (%)", color="Status", title="Perbandingan Engagement"), use_container_width=True)
         st.divider()
 
-    def render_ranking_table(self, df_result):
+    @timed('ui.pooled_ranking')
+    def render_pooled_ranking(self, pooled, weights):
+        """Ranking SAW gabungan channel utama + kompetitor (PooledSession) & distribusi skor per channel"""
+        import plotly.graph_objects as go  # lazy: hanya saat grafik dirender
+        st.markdown("### 🌐 Ranking Gabungan Lintas Channel")
+        c1, c2 = st.columns([2, 1])
+        modes = {'global': "Global (max semua channel)", 'channel': "Per channel (max masing-masing)"}
+        mode = c1.radio("Normalisasi:", list(modes), format_func=modes.get, horizontal=True, key="pooled_norm",
+                        help="Global: video dibandingkan langsung antar channel. Per channel: skor relatif terhadap video terbaik channelnya sendiri.")
+        top_k = int(c2.number_input("Top-k:", 5, 200, 20, step=5, key="pooled_top_k"))
+
+        dist = pooled.distribution(weights, mode, top_k=top_k)
+        # Box plot dari kuantil yang sudah dihitung -> ukuran grafik tidak bergantung jumlah video
+        fig = go.Figure(go.Box(x=dist['channel_title'], q1=dist['q1'], median=dist['median'], q3=dist['q3'],
+                               lowerfence=dist['min'], upperfence=dist['max'], mean=dist['mean'], name="Skor V"))
+        fig.update_layout(title="Distribusi Skor SAW per Channel", yaxis_title="Skor V")
+        st.plotly_chart(fig, use_container_width=True)
+
+        share = f'top{top_k}_share'
+        st.dataframe(dist.drop(columns=['channel_id']).rename(columns={
+            'channel_title': 'Channel', 'videos': 'Video', f'top{top_k}': f'Di Top-{top_k}', share: f'% Top-{top_k}',
+        }).style.format({'mean': "{:.4f}", 'std': "{:.4f}", 'min': "{:.4f}", 'q1': "{:.4f}", 'median': "{:.4f}",
+                         'q3': "{:.4f}", 'max': "{:.4f}", f'% Top-{top_k}': "{:.0%}"}), hide_index=True)
+
+        ranked = pooled.rank(weights, mode, k=top_k)
+        cols = ['Rank', 'channel_title', 'title', 'view_count', 'engagement_rate', 'preference_score']
+        st.dataframe(ranked[[c for c in cols if c in ranked.columns]].rename(columns={
+            'channel_title': 'Channel', 'title': 'Judul', 'view_count': 'Views',
+            'engagement_rate': 'ER (%)', 'preference_score': 'Skor V',
+        }), hide_index=True)
+        st.divider()
+
+    @timed('ui.ranking_table')
+    def render_ranking_table(self, df_result, export_key=None):
+        """
+        Tabel ranking berhalaman: filter & urutan dihitung di server sebagai mask/indeks
+        di atas kolom df_result (tanpa menyalin frame), lalu hanya baris halaman aktif
+        yang diberi style & dikirim ke browser.
+        export_key: versi dataset + bobot (ScoringSession.cache_key) untuk cache file ekspor
+        """
         st.markdown("### 🏆 Hasil Pemeringkatan (SAW)")
+        views = df_result['view_count'].to_numpy()
+        mask = np.ones(len(df_result), dtype=bool)
         with st.expander("🔍 Filter Data"):
             c1, c2 = st.columns(2)
             if 'published_at' in df_result.columns:
-                df_result['year'] = df_result['published_at'].dt.year
-                years = sorted(df_result['year'].unique(), reverse=True)
-                sel_year = c1.selectbox("Tahun:", ["Semua"] + list(years))
+                years = df_result['published_at'].dt.year.to_numpy()
+                sel_year = c1.selectbox("Tahun:", ["Semua"] + sorted(np.unique(years).tolist(), reverse=True))
             else: 
                 sel_year = "Semua"
-            min_v = int(df_result['view_count'].min())
-            max_v = int(df_result['view_count'].max())
+            min_v = int(views.min()) if len(views) else 0
+            max_v = int(views.max()) if len(views) else 0
             sel_min_v = c2.slider("Min Views:", min_v, max_v, min_v)
+        if sel_year != "Semua":
+            mask &= years == sel_year
+        mask &= views >= sel_min_v
+
+        cols = [c for c in TABLE_COLUMNS if c in df_result.columns]
+        c1, c2, c3 = st.columns([2, 1, 1])
+        sort_col = c1.selectbox("Urutkan berdasarkan:", cols, index=cols.index('Rank') if 'Rank' in cols else 0,
+                                format_func=TABLE_COLUMNS.get, key="rank_sort_col")
+        descending = c2.toggle("Menurun", value=False, key="rank_sort_desc")
+        page_size = c3.selectbox("Baris/halaman:", PAGE_SIZES, index=1, key="rank_page_size")
+
+        # Urutan baris terfilter sebagai array posisi (stable -> seri tetap urut Rank)
+        positions = np.flatnonzero(mask)
+        sort_values = df_result[sort_col]
+        if isinstance(sort_values.dtype, pd.DatetimeTZDtype):
+            sort_values = sort_values.to_numpy(dtype='datetime64[ns]')
+        else:
+            sort_values = sort_values.to_numpy()
+        if descending:
+            # Dibalik dua kali agar nilai seri tetap dalam urutan Rank
+            rev = positions[::-1]
+            order = rev[np.argsort(sort_values[rev], kind='stable')][::-1]
+        else:
+            order = positions[np.argsort(sort_values[positions], kind='stable')]
 
-        df_disp = df_result.copy()
-        if sel_year != "Semua": 
-            df_disp = df_disp[df_disp['year'] == sel_year]
-        df_disp = df_disp[df_disp['view_count'] >= sel_min_v]
+        total = len(order)
+        n_pages = max(-(-total // page_size), 1)
+        # Tanpa key: halaman kembali ke 1 saat jumlah halaman berubah (filter/ukuran halaman)
+        page = st.number_input(f"Halaman (dari {n_pages}):", min_value=1, max_value=n_pages, value=1, step=1)
+        page_rows = order[(page - 1) * page_size:page * page_size]
+        st.caption(f"Menampilkan **{len(page_rows)}** dari **{total}** video (halaman {page}/{n_pages}).")
 
-        st.caption(f"Menampilkan **{len(df_disp)}** video.")
         with st.expander("🧮 Detail Perhitungan (Normalisasi)"):
-            norm_cols = ['title', 'norm_views', 'norm_likes', 'norm_comments', 'norm_er']
-            if all(c in df_disp.columns for c in norm_cols):
-                df_n = df_disp[norm_cols].copy()
-                df_n.columns = ['Judul', 'R1 (Views)', 'R2 (Likes)', 'R3 (Komen)', 'R4 (ER)']
+            norm_cols = {'title': 'Judul', 'norm_views': 'R1 (Views)', 'norm_likes': 'R2 (Likes)',
+                         'norm_comments': 'R3 (Komen)', 'norm_er': 'R4 (ER)', 'norm_growth': 'R5 (Growth)'}
+            norm_cols = {c: label for c, label in norm_cols.items() if c in df_result.columns}
+            if len(norm_cols) > 1:
+                df_n = df_result.iloc[page_rows][list(norm_cols)].rename(columns=norm_cols)
                 st.dataframe(df_n.style.format("{:.4f}", subset=df_n.columns[1:]))
 
-        cols = ['title', 'published_at', 'view_count', 'like_count', 'comment_count', 'engagement_rate', 'preference_score', 'Rank']
-        df_show = df_disp[cols].copy()
-        df_show.columns = ['Judul', 'Waktu (WIB)', 'Views', 'Likes', 'Komen', 'ER (%)', 'Skor V', 'Rank']
-        st.dataframe(df_show.style.highlight_max(axis=0, subset=['Skor V'], color='#90ee90'))
+        df_show = df_result.iloc[page_rows][cols].rename(columns=TABLE_COLUMNS)
+        # Sorot skor tertinggi dari seluruh hasil terfilter, bukan hanya halaman ini
+        scores = df_result['preference_score'].to_numpy()
+        best = scores[positions].max() if total else np.nan
+        st.dataframe(df_show.style.apply(
+            lambda s: np.where(s.to_numpy() == best, 'background-color: #90ee90', ''), subset=['Skor V']
+        ))
         
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            temp = df_disp.copy()
-            if 'published_at' in temp.columns: 
-                temp['published_at'] = temp['published_at'].dt.tz_localize(None)
-            temp.to_excel(writer, index=False)
-        st.download_button("💾 Download Excel", output.getvalue(), "saw_result.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-
-    def render_analytics(self, df):
+        c1, c2 = st.columns([1, 2])
+        fmt = c1.selectbox("Format", list(EXPORT_FORMATS), format_func=lambda k: EXPORT_FORMATS[k][0],
+                           key="export_fmt", label_visibility="collapsed")
+        label, ext, mime = EXPORT_FORMATS[fmt]
+
+        def build_export():
+            # Dipanggil saat tombol diklik; file yang sama (dataset, bobot, filter, urutan) tidak dibuat ulang
+            key = export_key if export_key is not None else pd.util.hash_pandas_object(df_result, index=False).sum()
+            return self.exports.read((key, sel_year, sel_min_v, sort_col, descending), fmt,
+                                     lambda: df_result.iloc[order])
+        c2.download_button(f"💾 Download {label} ({total} baris)", build_export, f"saw_result.{ext}", mime)
+
+    @timed('ui.analytics')
+    def render_analytics(self, df, top_df=None, keyword_index=None, keyword_values=None, cube=None, weights=None):
+        """
+        top_df         : video teratas hasil ranking parsial (default: 5 baris pertama df)
+        keyword_index  : KeywordIndex milik dataset (dibuat dari df jika tidak ada)
+        keyword_values : dict/DataFrame metrik per video dengan urutan sama seperti index
+        cube           : AggregateCube milik dataset (dibuat dari df jika tidak ada)
+        weights        : bobot SAW untuk skor rata-rata per hari/jam dari cube
+        """
+        import plotly.express as px  # lazy: hanya saat grafik dirender
         st.markdown("### 📈 Dashboard Analitik & Strategi")
+        if top_df is None:
+            top_df = df.head(5)
+        if cube is None:
+            from aggregate_layer import AggregateCube
+            cube = AggregateCube.from_frame(df)
         
         # --- Bagian Atas: Video Terbaik ---
-        if not df.empty:
-            best = df.iloc[0]
+        if not top_df.empty:
+            best = top_df.iloc[0]
             m1, m2, m3 = st.columns(3)
             with m1:
                 st.markdown(f"<div class='video-card'><div class='video-label'>Video Terbaik (Rank 1)</div><div class='video-title'>{best['title']}</div></div>", unsafe_allow_html=True)
@@ -383,27 +550,37 @@ class UserInterface:
 
         t1, t2, t3, t4, t5 = st.tabs(["Peta Strategi", "Top 5", "Korelasi", "🔥 Power Keywords", "Statistik"])
         
-        days_indo = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
-        
+        # Semua tab (kecuali Top 5 & keyword) dibaca dari cube hari x jam, bukan dari data per video
         # TAB 1: Waktu Upload
         with t1:
             st.markdown("#### Analisis Waktu Upload")
+            metric_labels = {'view_count': "Views", 'engagement_rate': "ER (%)"}
+            if weights is not None:
+                metric_labels['preference_score'] = "Skor SAW"
+            metric = st.radio("Metrik:", list(metric_labels), format_func=metric_labels.get,
+                              horizontal=True, key="time_metric")
+            label = metric_labels[metric]
             c1, c2 = st.columns(2)
             with c1:
-                df_hari = df.groupby('day_name')['view_count'].mean().reindex(days_indo).reset_index()
-                st.plotly_chart(px.line(df_hari, x='day_name', y='view_count', markers=True, title="Rata-rata Views per Hari"), use_container_width=True)
+                df_hari = cube.day_means(metric, weights).reset_index()
+                st.plotly_chart(px.line(df_hari, x='day_name', y=metric, markers=True, labels={metric: label},
+                                        title=f"Rata-rata {label} per Hari"), use_container_width=True)
             with c2:
-                hmap = df.pivot_table(index='day_name', columns='hour', values='view_count', aggfunc='mean').fillna(0).reindex(days_indo)
+                hmap = cube.heatmap(metric, weights)
                 st.plotly_chart(px.imshow(hmap, labels=dict(x="Jam", y="Hari"), color_continuous_scale='RdYlGn', title="Heatmap Waktu Emas"), use_container_width=True)
 
         # TAB 2: Top 5 Video
         with t2:
-            st.plotly_chart(px.bar(df.head(5), x='preference_score', y='title', orientation='h', title="Top 5 Video (Skor SAW Tertinggi)"), use_container_width=True)
+            st.plotly_chart(px.bar(top_df.head(5), x='preference_score', y='title', orientation='h', title="Top 5 Video (Skor SAW Tertinggi)"), use_container_width=True)
             
         # TAB 3: Korelasi
         with t3:
-            corr = df['view_count'].corr(df['engagement_rate'])
-            st.plotly_chart(px.scatter(df, x='view_count', y='engagement_rate', size='preference_score', title=f"Korelasi Views vs ER: {corr:.2f}"), use_container_width=True)
+            corr = cube.corr('view_count', 'engagement_rate')
+            # Satu titik per slot upload (hari x jam): rata-rata views vs ER, ukuran = jumlah video
+            df_cells = cube.cell_frame()
+            st.plotly_chart(px.scatter(df_cells, x='view_count', y='engagement_rate', size='count',
+                                       hover_data=['day_name', 'hour'], title=f"Korelasi Views vs ER: {corr:.2f}"), use_container_width=True)
+            st.caption("Koefisien dihitung dari seluruh video; titik grafik = rata-rata per hari & jam upload.")
             if corr > 0.5: msg = "Positif Kuat: Semakin banyak views, interaksi juga makin ramai."
             elif corr < -0.5: msg = "Negatif: Views tinggi tapi penonton pasif (jarang like/komen)."
             else: msg = "Acak: Tidak ada pola jelas antara views dan interaksi."
@@ -414,37 +591,22 @@ class UserInterface:
             st.markdown("#### Kata Kunci Paling 'Menjual'")
             st.caption("Analisis rata-rata views berdasarkan kata yang muncul di judul.")
             
-            # 1. Stopwords sederhana (Kata hubung yang tidak bermakna)
-            stopwords = ['di', 'dan', 'ke', 'dari', 'yang', 'ini', 'itu', 'aku', 'saya', 'kamu', 'kita', 'video', 'vlog', 'hari', 'bikin', 'cara', 'with', 'the', 'in', 'on', 'of', 'for', 'to', 'a', 'is', 'eps', 'part', 'full', 'review', 'indonesia', '2024', '2025', '2026', 'episode']
-            
-            # 2. Proses Tokenisasi & Hitung Views
-            keyword_stats = {}
-            
-            for index, row in df.iterrows():
-                # Bersihkan judul: huruf kecil, hapus simbol
-                clean_title = re.sub(r"[^a-zA-Z0-9\s]", "", str(row['title'])).lower()
-                words = clean_title.split()
-                
-                views = row['view_count']
-                
-                for word in words:
-                    if word not in stopwords and len(word) > 2: # Filter kata pendek
-                        if word not in keyword_stats:
-                            keyword_stats[word] = {'total_views': 0, 'count': 0}
-                        keyword_stats[word]['total_views'] += views
-                        keyword_stats[word]['count'] += 1
-            
-            # 3. Hitung Rata-rata
-            final_keywords = []
-            for word, data in keyword_stats.items():
-                if data['count'] >= 2: # Hanya kata yang muncul minimal 2 kali agar valid
-                    avg_view = data['total_views'] / data['count']
-                    final_keywords.append({'Keyword': word, 'Avg Views': avg_view, 'Freq': data['count']})
-            
-            # 4. Buat DataFrame & Visualisasi
-            if final_keywords:
-                df_kw = pd.DataFrame(final_keywords)
-                df_kw = df_kw.sort_values(by='Avg Views', ascending=False).head(10) # Ambil Top 10
+            # 1. Statistik per kata dari inverted index (dibangun sekali per dataset)
+            use_bigram = st.checkbox("Sertakan frasa 2 kata", key="kw_bigram")
+            if keyword_index is None:
+                keyword_index = KeywordIndex.from_frame(df)
+                kw_values = df
+            else:
+                kw_values = keyword_values
+            df_kw = keyword_index.stats({
+                'Avg Views': kw_values['view_count'],
+                'Avg ER (%)': kw_values['engagement_rate'],
+                'Avg Skor': kw_values['preference_score'],
+            }, min_freq=2, bigrams=use_bigram) # Hanya kata yang muncul minimal 2 kali agar valid
+
+            # 2. Visualisasi
+            if not df_kw.empty:
+                df_kw = df_kw.nlargest(10, 'Avg Views') # Ambil Top 10
                 
                 # Bar Chart
                 fig_kw = px.bar(
@@ -454,6 +616,7 @@ class UserInterface:
                     orientation='h',
                     color='Avg Views',
                     text='Avg Views',
+                    hover_data=['Freq', 'Avg ER (%)', 'Avg Skor'],
                     title="Top 10 Kata Kunci dengan Performa Views Terbaik",
                     color_continuous_scale='Viridis'
                 )
@@ -466,5 +629,69 @@ class UserInterface:
 
         # TAB 5: Statistik Dasar
         with t5:
-            desc = df[['view_count', 'like_count', 'engagement_rate']].describe()
+            desc = cube.describe(['view_count', 'like_count', 'engagement_rate'])
             st.dataframe(desc.style.format("{:.2f}"))
+
+    @timed('ui.sensitivity')
+    def render_sensitivity(self, session, weights):
+        st.markdown("### 🎲 Uji Sensitivitas Bobot")
+        with st.expander("Seberapa stabil ranking jika bobot sedikit diubah?"):
+            c1, c2, c3 = st.columns(3)
+            n_scen = c1.number_input("Jumlah skenario", 100, 20000, 1000, step=100)
+            conc = c2.slider("Konsentrasi (makin besar = makin dekat bobot saat ini)", 5, 500, 50)
+            top_k = c3.number_input("Top-k", 1, 50, 5)
+
+            if st.button("▶️ Jalankan Uji Sensitivitas"):
+                with st.spinner("Menghitung skenario..."):
+                    W = sample_weights(int(n_scen), weights, concentration=conc, seed=42, keys=session.weight_keys)
+                    stats, taus = session.sensitivity(W, weights, top_k=int(top_k))
+
+                m1, m2, m3 = st.columns(3)
+                m1.metric("Kendall τ rata-rata", f"{taus.mean():.3f}")
+                m2.metric("Kendall τ terburuk", f"{taus.min():.3f}")
+                m3.metric(f"Rank 1 tetap Top-{int(top_k)}", f"{stats[f'top{int(top_k)}_frac'].iloc[0]:.0%}")
+
+                st.dataframe(stats.head(20).style.format({
+                    'rank_mean': "{:.2f}", 'rank_var': "{:.2f}", f'top{int(top_k)}_frac': "{:.0%}"
+                }), hide_index=True)
+                st.caption("τ mendekati 1 berarti urutan video hampir tidak berubah pada bobot alternatif.")
+
+    #==========================================================
+    # PANEL PERFORMA (OPSIONAL)
+    #==========================================================
+    def render_performance(self):
+        """Latensi per tahap/endpoint, counter, dan error yang tercatat di METRICS"""
+        st.sidebar.divider()
+        if not st.sidebar.checkbox("📊 Panel Performa", key="perf_panel"):
+            return
+        snap = METRICS.snapshot()
+
+        with st.sidebar.expander("⏱️ Latensi per Tahap", expanded=True):
+            if snap['spans']:
+                df_spans = pd.DataFrame([{
+                    'Tahap': s['name'] + ''.join(f" [{v}]" for v in s['labels'].values()),
+                    'N': s['count'],
+                    'Rata2 (ms)': s['mean_s'] * 1000,
+                    'p95 (ms)': s['p95_s'] * 1000,
+                    'Total (s)': s['total_s'],
+                } for s in snap['spans']]).sort_values('Total (s)', ascending=False)
+                st.dataframe(df_spans.style.format({
+                    'Rata2 (ms)': "{:.1f}", 'p95 (ms)': "{:.1f}", 'Total (s)': "{:.3f}"
+                }), hide_index=True)
+            else:
+                st.caption("Belum ada data.")
+
+        with st.sidebar.expander("🔢 Counter"):
+            for c in snap['counters']:
+                labels = ', '.join(f"{k}={v}" for k, v in c['labels'].items())
+                st.caption(f"`{c['name']}` {labels}: **{c['value']:,}**")
+
+        with st.sidebar.expander(f"⚠️ Error Tercatat ({len(snap['errors'])})"):
+            for err in reversed(snap['errors'][-20:]):
+                st.caption(f"**{err['where']}** · {err['type']}: {err['message']}")
+
+        c1, c2 = st.sidebar.columns(2)
+        c1.download_button("JSON", METRICS.to_json, "metrics.json", "application/json")
+        c2.download_button("Prometheus", METRICS.to_prometheus, "metrics.prom", "text/plain")
+        if st.sidebar.button("🔄 Reset Metrik"):
+            METRICS.reset()
@@ -0,0 +1,292 @@
+"""
+Server lokal pengganti YouTube Data API v3 (offline) untuk load-test & benchmark.
+
+Endpoint yang didukung (sama seperti yang dipakai DataManager):
+    /youtube/v3/search, /youtube/v3/channels, /youtube/v3/playlistItems, /youtube/v3/videos
+
+Data channel & video dibuat sintetis dan deterministik (seed), tanpa disimpan
+di memori, sehingga katalog besar tetap ringan. Latensi, error 5xx, dan respons
+403 quotaExceeded bisa diinjeksi.
+
+Jalankan:
+    python youtube_stub.py --port 8765 --channels 50 --videos 2000 --latency 0.05
+Lalu arahkan aplikasi ke stub:
+    YT_API_BASE_URL=http://127.0.0.1:8765/ streamlit run app5.py
+"""
+import argparse
+import datetime
+import json
+import random
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from quota_layer import QUOTA_COSTS
+
+TITLE_WORDS = ['main', 'game', 'review', 'gadget', 'resep', 'masak', 'vlog', 'daily', 'cover', 'lagu',
+               'tutorial', 'seru', 'horor', 'minecraft', 'unboxing', 'jakarta', 'anime', 'kpop', 'travel',
+               'challenge', 'terbaru', 'prank', 'musik', 'review', 'hp', 'murah', 'lucu', 'reaksi']
+TOPICS = ['https://en.wikipedia.org/wiki/Video_game_culture', 'https://en.wikipedia.org/wiki/Technology',
+          'https://en.wikipedia.org/wiki/Lifestyle_(sociology)', 'https://en.wikipedia.org/wiki/Entertainment',
+          'https://en.wikipedia.org/wiki/Music', 'https://en.wikipedia.org/wiki/Food']
+EPOCH = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class SyntheticCatalog:
+    """Katalog channel & video sintetis; setiap item dihitung ulang dari seed saat diminta"""
+    def __init__(self, n_channels=20, videos_per_channel=500, seed=0):
+        self.n_channels = n_channels
+        self.videos_per_channel = videos_per_channel
+        self.seed = seed
+
+    def _rng(self, *key):
+        return random.Random(zlib.crc32(repr((self.seed,) + key).encode()))
+
+    #==========================================================
+    # ID
+    #==========================================================
+    @staticmethod
+    def channel_id(i):
+        return f"UCstub{i:018d}"
+
+    @staticmethod
+    def video_id(i, j):
+        return f"{i:04d}{j:07d}"
+
+    def _parse_channel(self, cid):
+        if len(cid) == 24 and cid[:2] in ('UC', 'UU') and cid[2:6] == 'stub' and cid[6:].isdigit():
+            i = int(cid[6:])
+            if i < self.n_channels:
+                return i
+        return None
+
+    def _parse_video(self, vid):
+        if len(vid) == 11 and vid.isdigit():
+            i, j = int(vid[:4]), int(vid[4:])
+            if i < self.n_channels and j < self._n_videos(i):
+                return i, j
+        return None
+
+    def _n_videos(self, i):
+        # Ukuran katalog bervariasi antar channel (50% - 100% dari videos_per_channel)
+        return max(int(self.videos_per_channel * self._rng('size', i).uniform(0.5, 1.0)), 1)
+
+    #==========================================================
+    # ITEM (format mengikuti respons YouTube Data API v3)
+    #==========================================================
+    def channel_item(self, i):
+        rng = self._rng('channel', i)
+        title = ' '.join(rng.choices(TITLE_WORDS, k=2)).title() + f" {i}"
+        subs = int(10 ** rng.uniform(3, 7))
+        n_videos = self._n_videos(i)
+        cid = self.channel_id(i)
+        return {
+            'kind': 'youtube#channel',
+            'id': cid,
+            'snippet': {
+                'title': title,
+                'description': ' '.join(rng.choices(TITLE_WORDS, k=20)),
+                'publishedAt': '2015-01-01T00:00:00Z',
+                'thumbnails': {'default': {'url': ''}, 'high': {'url': ''}},
+            },
+            'contentDetails': {'relatedPlaylists': {'uploads': 'UU' + cid[2:]}},
+            'statistics': {
+                'subscriberCount': str(subs),
+                'videoCount': str(n_videos),
+                'viewCount': str(subs * rng.randint(20, 200)),
+            },
+            'topicDetails': {'topicCategories': rng.sample(TOPICS, rng.randint(0, 2))},
+        }
+
+    def published_at(self, i, j):
+        # j = 0 adalah video terbaru (urutan playlist uploads)
+        hours = j * 30 + self._rng('pub', i, j).randint(0, 20)
+        return (EPOCH - datetime.timedelta(hours=hours)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    def video_item(self, i, j):
+        rng = self._rng('video', i, j)
+        views = int(10 ** rng.uniform(2, 6.5))
+        return {
+            'kind': 'youtube#video',
+            'id': self.video_id(i, j),
+            'snippet': {
+                'title': ' '.join(rng.choices(TITLE_WORDS, k=rng.randint(3, 8))),
+                'publishedAt': self.published_at(i, j),
+                'channelId': self.channel_id(i),
+            },
+            'statistics': {
+                'viewCount': str(views),
+                'likeCount': str(int(views * rng.uniform(0, 0.08))),
+                'commentCount': str(int(views * rng.uniform(0, 0.01))),
+            },
+            'contentDetails': {'duration': f"PT{rng.randint(1, 40)}M{rng.randint(0, 59)}S"},
+        }
+
+    #==========================================================
+    # ENDPOINT
+    #==========================================================
+    def search(self, q='', maxResults=5, **_):
+        words = q.lower().split()
+        results = []
+        for i in range(self.n_channels):
+            item = self.channel_item(i)
+            text = (item['snippet']['title'] + ' ' + item['snippet']['description']).lower()
+            if not words or any(w in text for w in words):
+                results.append({
+                    'kind': 'youtube#searchResult',
+                    'id': {'kind': 'youtube#channel', 'channelId': item['id']},
+                    'snippet': dict(item['snippet'], channelId=item['id']),
+                })
+            if len(results) >= int(maxResults):
+                break
+        return {'kind': 'youtube#searchListResponse', 'items': results}
+
+    def channels(self, id='', **_):
+        items = [self.channel_item(i) for i in map(self._parse_channel, id.split(',')) if i is not None]
+        return {'kind': 'youtube#channelListResponse', 'items': items}
+
+    def playlist_items(self, playlistId='', maxResults=5, pageToken=None, **_):
+        i = self._parse_channel(playlistId)
+        if i is None:
+            return None
+        start = int(pageToken or 0)
+        end = min(start + min(int(maxResults), 50), self._n_videos(i))
+        items = [{
+            'kind': 'youtube#playlistItem',
+            'snippet': {'publishedAt': self.published_at(i, j)},
+            'contentDetails': {'videoId': self.video_id(i, j), 'videoPublishedAt': self.published_at(i, j)},
+        } for j in range(start, end)]
+        response = {'kind': 'youtube#playlistItemListResponse', 'items': items,
+                    'pageInfo': {'totalResults': self._n_videos(i), 'resultsPerPage': len(items)}}
+        if end < self._n_videos(i):
+            response['nextPageToken'] = str(end)
+        return response
+
+    def videos(self, id='', **_):
+        ids = [v for v in map(self._parse_video, id.split(',')[:50]) if v is not None]
+        return {'kind': 'youtube#videoListResponse', 'items': [self.video_item(i, j) for i, j in ids]}
+
+
+class StubState:
+    """Konfigurasi injeksi gangguan + pencatatan kuota per API key"""
+    def __init__(self, catalog, latency=0.0, jitter=0.0, error_rate=0.0, daily_quota=None, seed=0):
+        self.catalog = catalog
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.daily_quota = daily_quota
+        self.quota_used = {}
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+
+def _error_body(code, reason, message):
+    return {'error': {'code': code, 'message': message,
+                      'errors': [{'message': message, 'domain': 'youtube.quota' if code == 403 else 'global',
+                                  'reason': reason}]}}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # keep-alive
+    disable_nagle_algorithm = True  # header & body dikirim terpisah -> hindari delay ACK
+    routes = {'search': 'search', 'channels': 'channels', 'playlistItems': 'playlist_items', 'videos': 'videos'}
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, body):
+        payload = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        state = self.server.state
+        url = urlparse(self.path)
+        endpoint = url.path.rstrip('/').rsplit('/', 1)[-1]
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if not url.path.startswith('/youtube/v3/') or endpoint not in self.routes:
+            return self._send(404, _error_body(404, 'notFound', 'Endpoint tidak dikenal'))
+
+        with state._lock:
+            state.requests += 1
+            delay = max(state.latency + state._rng.uniform(-state.jitter, state.jitter), 0)
+            fail = state._rng.random() < state.error_rate
+            key = params.get('key', '')
+            cost = QUOTA_COSTS.get(endpoint, 1)
+            over_quota = state.daily_quota is not None and state.quota_used.get(key, 0) + cost > state.daily_quota
+            if not over_quota and not fail:
+                state.quota_used[key] = state.quota_used.get(key, 0) + cost
+
+        if delay:
+            time.sleep(delay)
+        if over_quota:
+            return self._send(403, _error_body(403, 'quotaExceeded', 'The request cannot be completed because you have exceeded your quota.'))
+        if fail:
+            return self._send(503, _error_body(503, 'backendError', 'Backend Error (injected)'))
+
+        body = getattr(state.catalog, self.routes[endpoint])(**params)
+        if body is None:
+            return self._send(404, _error_body(404, 'playlistNotFound', 'Playlist tidak ditemukan'))
+        self._send(200, body)
+
+
+def make_server(host='127.0.0.1', port=0, n_channels=20, videos_per_channel=500, latency=0.0,
+                jitter=0.0, error_rate=0.0, daily_quota=None, seed=0):
+    catalog = SyntheticCatalog(n_channels, videos_per_channel, seed)
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.state = StubState(catalog, latency, jitter, error_rate, daily_quota, seed)
+    return server
+
+
+@contextmanager
+def running_stub(**kwargs):
+    """
+    Jalankan stub di thread latar untuk benchmark/skrip.
+    Yields: (base_url, server) -> DataManager(api_key, base_url=base_url)
+    """
+    server = make_server(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        yield f"http://{host}:{port}/", server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--channels', type=int, default=20, help="jumlah channel sintetis")
+    parser.add_argument('--videos', type=int, default=500, help="maks. video per channel")
+    parser.add_argument('--latency', type=float, default=0.0, help="latensi per request (detik)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="variasi latensi +/- (detik)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="peluang respons 503 (0-1)")
+    parser.add_argument('--quota', type=int, default=None, help="kuota harian per API key (default: tanpa batas)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.channels, args.videos, args.latency,
+                         args.jitter, args.error_rate, args.quota, args.seed)
+    print(f"YouTube API stub berjalan di http://{args.host}:{args.port}/ (Ctrl+C untuk berhenti)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()